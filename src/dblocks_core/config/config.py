@@ -232,6 +232,7 @@ def _copy_defaults(config_dict: dict):
         "username",
         "password",
         "connection_parameters",
+        "pool",
     ]
 
     for env_name, env_config in config_dict["environments"].items():
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import atexit
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
 from typing import Any
 
 import loguru
@@ -15,7 +17,8 @@ from dblocks_core.config.config import (
 from dblocks_core.config.config import load_config as __load_config
 from dblocks_core.config.config import logger
 from dblocks_core.dbi import tera_dbi
-from dblocks_core.dbi.contract import AbstractDBI
+from dblocks_core.dbi.async_adapter import AsyncDBIAdapter
+from dblocks_core.dbi.contract import AbstractDBI, AsyncAbstractDBI
 from dblocks_core.model import config_model
 
 TERADATA_DIALECT = "teradatasql"
@@ -27,14 +30,15 @@ class InitState:
     config: config_model.Config
     logger: loguru.Logger
     dbi: AbstractDBI
+    async_dbi: AsyncAbstractDBI
 
 
 def init(
     environment: str,
     *,
     dialect: str = TERADATA_DIALECT,
-    pool_size: int = 1,
-    max_overflow: int = 1,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
     poolclass: Any = sa.pool.QueuePool,
     echo: bool = False,
 ) -> InitState:
@@ -46,12 +50,15 @@ def init(
         - first, load the configuration from dblocks.toml and/or env variables
         - then, get the environment definition from the configuration
         - then, prepare sqlalchemy engine, and register engine.dispose() via atexit.
+        - then, prepare the database interface, and its async counterpart, that
+          can be awaited in the notebook (await state.async_dbi.get_databases()).
 
     Args:
         environment (str): name of the environment that the engine is associated with
         poolclass (Any, optional): defaults to sa.pool.QueuePool.
-        pool_size (int, optional): defaults to 1.
-        max_overflow (int, optional): defaults to 1.
+        pool_size (int, optional): defaults to pool.size of the environment. Also
+            limits the number of requests in flight of the async database interface.
+        max_overflow (int, optional): defaults to pool.max_overflow of the environment.
 
     Raises:
         exceptions.MiteConfigError: if connect string is not provided
@@ -61,6 +68,7 @@ def init(
         config (config_model.Config): the configuration
         logger (loguru.Logger): the logger
         dbi (AbstractDBI): the database interface
+        async_dbi (AsyncAbstractDBI): the async database interface
     """
     cfg = __load_config()
     engine = create_engine(
@@ -72,23 +80,61 @@ def init(
         echo=echo,
         max_overflow=max_overflow,
     )
-    ext = dbi_factory(cfg, environment)
+    # the interface uses the same engine, so that the pool is warmed up only once
+    ext = dbi_factory(cfg, environment, engine=engine)
+    concurrency = engine.pool.size() if pool_size is None else pool_size
     return InitState(
         engine=engine,
         config=cfg,
         logger=logger,
         dbi=ext,
+        async_dbi=AsyncDBIAdapter(ext, concurrency=concurrency),
     )
 
 
 def dbi_factory(
     cfg: config_model.Config,
     environment: str,
+    *,
+    pool_size: int | None = None,
+    bulk_metadata: bool = False,
+    extract_stats: bool = True,
+    engine: sa.Engine | None = None,
 ) -> AbstractDBI:
+    """
+    Creates the database interface for the environment.
+
+    Args:
+        cfg (config_model.Config): the configuration
+        environment (str): name of the environment
+        pool_size (int, optional): size of the connection pool, should be at least
+            the number of threads that use the interface concurrently. Defaults to
+            pool.size of the environment.
+        bulk_metadata (bool, optional): read comments for the whole database at
+            once, instead of one query per object. Defaults to False.
+        extract_stats (bool, optional): extract statistics of tables. Defaults to True.
+        engine (sa.Engine, optional): engine to use; by default, a new engine is
+            created (and its pool warmed up, see create_engine). `pool_size` is
+            ignored if the engine is given.
+
+    Returns:
+        AbstractDBI: the database interface
+    """
     env = __get_environment_from_config(cfg, environment)
     if env.platform == config_model.TERADATA:
-        engine = create_engine(cfg, environment, dialect=TERADATA_DIALECT)
-        return tera_dbi.TeraDBI(engine, cfg=cfg)
+        if engine is None:
+            engine = create_engine(
+                cfg,
+                environment,
+                dialect=TERADATA_DIALECT,
+                pool_size=pool_size,
+            )
+        return tera_dbi.TeraDBI(
+            engine,
+            cfg=cfg,
+            bulk_metadata=bulk_metadata,
+            extract_stats=extract_stats,
+        )
 
     raise NotImplementedError
 
@@ -98,18 +144,22 @@ def create_engine(
     environment: str,
     *,
     dialect: str = TERADATA_DIALECT,
-    pool_size: int = 1,
-    max_overflow: int = 1,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
     poolclass: Any = sa.pool.QueuePool,
     echo: bool = False,
 ) -> sa.Engine:
     """Creates an engine, and registers engine.dispose() via atexit.
 
+    Pool settings are taken from the environment (pool.*), explicit arguments
+    take precedence. If pool.warm_up is set, the connections are opened before
+    the engine is returned (see warm_up_pool).
+
     Args:
         connect_string (str | sa.URL): connect string
         poolclass (Any, optional): defaults to sa.pool.QueuePool.
-        pool_size (int, optional): defaults to 1.
-        max_overflow (int, optional): defaults to 1.
+        pool_size (int, optional): defaults to pool.size of the environment.
+        max_overflow (int, optional): defaults to pool.max_overflow of the environment.
 
     Raises:
         exceptions.MiteConfigError: if connect string is not provided
@@ -118,12 +168,17 @@ def create_engine(
         sa.Engine: database engine
     """
     secret = __get_environment_from_config(cfg, environment)
-    logger.debug(f"create engine: {dialect=}")
+    pool = secret.pool
+    pool_size = pool.size if pool_size is None else pool_size
+    max_overflow = pool.max_overflow if max_overflow is None else max_overflow
+    logger.debug(f"create engine: {dialect=}, {pool_size=}, {max_overflow=}, {pool=}")
     connect_string = create_connect_string(secret, dialect)
     engine = sa.create_engine(
         connect_string,
         pool_size=pool_size,
         max_overflow=max_overflow,
+        pool_recycle=pool.recycle,
+        pool_pre_ping=pool.pre_ping,
         poolclass=poolclass,
         echo=echo,
     )
@@ -133,9 +188,50 @@ def create_engine(
         engine.dispose()
 
     atexit.register(_dispose)
+
+    if (connections := min(pool.warm_up, pool_size)) > 0:
+        warm_up_pool(engine, connections)
     return engine
 
 
+def warm_up_pool(engine: sa.Engine, connections: int):
+    """
+    Opens connections of the pool concurrently, and returns them to the pool.
+
+    Logon to the database can take seconds; this way, it is paid once, and in
+    parallel, instead of serially on first use by each worker.
+
+    Args:
+        engine (sa.Engine): the engine
+        connections (int): number of connections to open, should not exceed
+            size of the pool (connections above the size are not kept)
+    """
+    if connections <= 0:
+        return
+    logger.info(f"warming up the connection pool: {connections} connections")
+    started = perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=connections,
+        thread_name_prefix="dbe-warm-up",
+    ) as executor:
+        futures = [executor.submit(engine.connect) for _ in range(connections)]
+
+    # all connections are checked out at the same time, so that each of them
+    # is a new session; now, return them to the pool
+    opened, errors = [], []
+    for future in futures:
+        try:
+            opened.append(future.result())
+        except Exception as err:
+            errors.append(err)
+    for con in opened:
+        con.close()
+    if errors:
+        with tera_dbi.translate_error():
+            raise errors[0]
+    logger.info(f"pool is ready in {perf_counter() - started:.1f}s")
+
+
 def create_connect_string(
     secret: config_model.EnvironParameters,
     dialect: str,
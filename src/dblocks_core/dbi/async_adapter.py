@@ -0,0 +1,91 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+
+from dblocks_core.config.config import logger
+from dblocks_core.dbi.contract import AbstractDBI, AsyncAbstractDBI
+from dblocks_core.model import meta_model
+
+
+class AsyncDBIAdapter(AsyncAbstractDBI):
+    """
+    Exposes a (blocking) AbstractDBI as AsyncAbstractDBI.
+
+    Each call is executed in a thread pool of `concurrency` threads, which limits
+    the number of database requests in flight. The connection pool of the
+    underlying engine should be at least as big as `concurrency`, otherwise the
+    threads wait for a free connection.
+    """
+
+    def __init__(self, dbi: AbstractDBI, *, concurrency: int = 8):
+        self.dbi = dbi
+        self.concurrency = concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency,
+            thread_name_prefix="dbe-async-dbi",
+        )
+
+    async def _run(self, fn: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(fn, *args, **kwargs),
+        )
+
+    async def get_described_object(
+        self,
+        object: meta_model.IdentifiedObject,
+    ) -> meta_model.DescribedObject | None:
+        return await self._run(self.dbi.get_described_object, object)
+
+    async def get_described_objects(
+        self,
+        objects: list[meta_model.IdentifiedObject],
+    ) -> list[meta_model.DescribedObject | None]:
+        def _describe():
+            return list(self.dbi.get_described_objects(objects))
+
+        return await self._run(_describe)
+
+    async def get_object_list(
+        self,
+        database_name: str,
+        *,
+        limit_to_type: str | None = None,
+    ) -> list[meta_model.IdentifiedObject]:
+        return await self._run(
+            self.dbi.get_object_list,
+            database_name,
+            limit_to_type=limit_to_type,
+        )
+
+    async def get_object_list_many(
+        self,
+        database_names: Iterable[str],
+        *,
+        limit_to_type: str | None = None,
+    ) -> list[meta_model.IdentifiedObject]:
+        def _list():
+            return list(
+                self.dbi.get_object_list_many(
+                    list(database_names),
+                    limit_to_type=limit_to_type,
+                )
+            )
+
+        return await self._run(_list)
+
+    async def get_databases(self) -> list[meta_model.DescribedDatabase]:
+        return await self._run(self.dbi.get_databases)
+
+    async def test_connection(self):
+        return await self._run(self.dbi.test_connection)
+
+    def dispose(self):
+        """
+        Waits for calls in flight, then disposes of the underlying interface.
+        """
+        logger.debug("dispose of the async adapter")
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self.dbi.dispose()
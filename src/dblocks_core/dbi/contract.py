@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, Sequence
 
+from dblocks_core import exc
 from dblocks_core.model import meta_model
 
+# max number of DDL statements requested from the database in one request
+DDL_BATCH_SIZE = 16
+
 
 class AbstractDBI(ABC):
 
@@ -12,6 +17,20 @@ class AbstractDBI(ABC):
     ) -> meta_model.DescribedObject | None:
         """Returns full definition of the object in database. None if the object does not exist."""
 
+    def get_described_objects(
+        self,
+        objects: Iterable[meta_model.IdentifiedObject],
+    ) -> Iterator[meta_model.DescribedObject | None]:
+        """
+        Returns full definition of each object, in the same order as the input.
+
+        The default implementation calls get_described_object for each object,
+        implementations should override it if the platform can describe
+        many objects at once.
+        """
+        for object in objects:
+            yield self.get_described_object(object)
+
     @abstractmethod
     def get_object_list(
         self,
@@ -22,6 +41,25 @@ class AbstractDBI(ABC):
         """Returns list of objects in a database."""
         ...
 
+    def get_object_list_many(
+        self,
+        database_names: Iterable[str],
+        *,
+        limit_to_type: str | None = None,
+    ) -> Iterator[meta_model.IdentifiedObject]:
+        """
+        Returns objects of all databases given, grouped by database.
+
+        The default implementation calls get_object_list for each database,
+        implementations should override it if the platform can list
+        objects of many databases at once.
+        """
+        for database_name in database_names:
+            yield from self.get_object_list(
+                database_name,
+                limit_to_type=limit_to_type,
+            )
+
     @abstractmethod
     def delete_database(self, database_name: str):
         """Drops all objects from a database. The operation is not recursive."""
@@ -79,6 +117,32 @@ class AbstractDBI(ABC):
         """
         ...
 
+    def get_object_ddl_many(
+        self,
+        objects: Sequence[meta_model.IdentifiedObject],
+        *,
+        batch_size: int = DDL_BATCH_SIZE,
+    ) -> list[str | None]:
+        """
+        Returns definition of each object (DDL script), in the same order as the input.
+        None if the object does not exist, or is not accessible.
+
+        The default implementation calls get_object_ddl for each object,
+        implementations should override it if the platform can send
+        `batch_size` statements in one request.
+        """
+        ddls: list[str | None] = []
+        for obj in objects:
+            try:
+                ddls.append(
+                    self.get_object_ddl(
+                        obj.database_name, obj.object_name, obj.object_type
+                    )
+                )
+            except (exc.DBObjectDoesNotExist, exc.DBAccessRightsError):
+                ddls.append(None)
+        return ddls
+
     @abstractmethod
     def get_object_comment(
         self,
@@ -145,7 +209,7 @@ class AbstractDBI(ABC):
         ...
 
     @abstractmethod
-    def deploy_statements(self, statements: list[str]):
+    def deploy_statements(self, statements: Iterable[str]):
         """
         Executes the statement given
 
@@ -183,3 +247,59 @@ class AbstractDBI(ABC):
             str: The full definition of the object.
         """
         ...
+
+
+class AsyncAbstractDBI(ABC):
+    """
+    Asynchronous counterpart of AbstractDBI, limited to metadata extraction.
+    """
+
+    @abstractmethod
+    async def get_described_object(
+        self,
+        object: meta_model.IdentifiedObject,
+    ) -> meta_model.DescribedObject | None:
+        """Returns full definition of the object in database. None if the object does not exist."""
+        ...
+
+    @abstractmethod
+    async def get_described_objects(
+        self,
+        objects: list[meta_model.IdentifiedObject],
+    ) -> list[meta_model.DescribedObject | None]:
+        """Returns full definitions of the objects, in the same order (see
+        AbstractDBI.get_described_objects)."""
+        ...
+
+    @abstractmethod
+    async def get_object_list(
+        self,
+        database_name: str,
+        *,
+        limit_to_type: str | None = None,
+    ) -> list[meta_model.IdentifiedObject]:
+        """Returns list of objects in a database."""
+        ...
+
+    @abstractmethod
+    async def get_object_list_many(
+        self,
+        database_names: Iterable[str],
+        *,
+        limit_to_type: str | None = None,
+    ) -> list[meta_model.IdentifiedObject]:
+        """Returns objects of all databases given, grouped by database."""
+        ...
+
+    @abstractmethod
+    async def get_databases(self) -> list[meta_model.DescribedDatabase]:
+        """Returns information about databases existing in the platform."""
+        ...
+
+    @abstractmethod
+    async def test_connection(self): ...
+
+    @abstractmethod
+    def dispose(self):
+        """Releases all resources held by the interface."""
+        ...
@@ -1,6 +1,12 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Generic, Iterable, Iterator, Sequence, TypeVar
 
 import sqlalchemy as sa
+from attrs import define, field
 
 try:
     import teradatasql
@@ -54,10 +60,27 @@ STATEMENT_ERRORS = (
     ERR_CODE_SYNTAX_ERROR,
 )
 
+# errors of a SHOW statement that mean we can not get DDL of the object
+MISSING_OBJECT_ERRORS = (
+    ERR_CODE_DOES_NOT_EXIST,
+    ERR_CODE_DB_DOES_NOT_EXIST,
+    ERR_CODE_NO_ACCESS,
+)
+
 # prefixes of error descriptions we know and handle
 ERR_DSC_HOSTNAME_LOOKUP_FAILED = "Hostname lookup failed"
 ERR_DSC_FAILED_TO_CONNECT = "Failed to connect to"
 
+# max number of databases in one IN-list when listing objects of many databases
+_OBJECT_LIST_CHUNK_SIZE = 200
+
+# how many databases are kept in the comment index (bulk metadata mode);
+# extraction processes objects database by database, so a few are enough
+_COMMENT_INDEX_SIZE = 4
+
+# how many databases are kept in the index of tables with statistics
+_STATS_INDEX_SIZE = 4
+
 _DBKIND_TO_TYPE = {
     "D": meta_model.DATABASE,
     "U": meta_model.USER,
@@ -278,14 +301,181 @@ def get_error_code_from_exception(
     return ""
 
 
+def _table_kind_scope(limit_to_type: str | None = None) -> str:
+    """
+    Returns list of dbc.tablesV.tableKind values usable in an IN-list.
+
+    Args:
+        limit_to_type (str | None): if given, only tables are in scope.
+    """
+    if limit_to_type is None:
+        scope = ", ".join([f"'{kind}'" for kind in _TABLEKIND_TO_TYPE.keys()])
+    else:
+        scope = ", ".join(
+            [
+                f"'{kind}'"
+                for kind, tp in _TABLEKIND_TO_TYPE.items()
+                if tp == meta_model.TABLE
+            ]
+        )
+    logger.trace(scope)
+    return scope
+
+
+def _show_statement(database_name: str, object_name: str, object_type: str) -> str:
+    """Returns SHOW statement for the object."""
+    return f"""show {object_type} "{database_name}"."{object_name}";"""
+
+
+def _rows_to_ddl(rows) -> str:
+    """Joins rows returned by a SHOW statement to one DDL script."""
+    ddl = "".join([r[0].replace("\r", "\n") for r in rows])
+    return ddl.strip().removesuffix(";") + ";\n"
+
+
+def _row_to_identified_object(row) -> meta_model.IdentifiedObject:
+    """
+    Maps a row from dbc.tablesV to `meta_model.IdentifiedObject`.
+    """
+    return meta_model.IdentifiedObject(
+        database_name=row.database_name.strip(),
+        object_name=row.object_name.strip(),
+        object_type=_TABLEKIND_TO_TYPE[row.object_type.strip()],
+        platform_object_type=row.object_type.strip(),
+        create_datetime=row.create_datetime,
+        last_alter_datetime=row.last_alter_datetime,
+        creator_name=(
+            row.creator_name.strip() if row.creator_name is not None else None
+        ),
+        last_alter_name=(
+            row.last_alter_name.strip() if row.last_alter_name is not None else None
+        ),
+    )
+
+
+@define
+class ConnectionStats:
+    """
+    Counts connections checked out from the pool, and statements executed on them.
+
+    Attributes:
+        checkouts (int): number of connections checked out
+        statements (int): number of statements executed
+    """
+
+    checkouts: int = field(default=0)
+    statements: int = field(default=0)
+    _lock: threading.Lock = field(factory=threading.Lock, repr=False)
+
+    def add(self, *, checkouts: int = 0, statements: int = 0):
+        with self._lock:
+            self.checkouts += checkouts
+            self.statements += statements
+
+    @property
+    def reuse_rate(self) -> float:
+        """Average number of statements executed per checked out connection."""
+        if self.checkouts == 0:
+            return 0.0
+        return self.statements / self.checkouts
+
+    def __str__(self) -> str:
+        return (
+            f"connections: {self.checkouts} checkouts, {self.statements} statements"
+            f" ({self.reuse_rate:.1f} statements per checkout)"
+        )
+
+
+@define
+class DatabaseComments:
+    """
+    Comments of all objects in one database, keyed by uppercase name of the object.
+
+    Attributes:
+        tables (dict[str, str]): comment of the object itself
+        columns (dict[str, list[tuple[str, str]]]): (column name, comment) pairs,
+            ordered by column id
+    """
+
+    tables: dict[str, str] = field(factory=dict)
+    columns: dict[str, list[tuple[str, str]]] = field(factory=dict)
+
+
+_T = TypeVar("_T")
+
+
+class _DatabaseIndex(Generic[_T]):
+    def __init__(self, size: int):
+        """
+        Index of values read for the whole database, keyed by uppercase name
+        of the database; holds only a few most recently used databases.
+
+        Args:
+            size (int): Max number of databases in the index.
+
+        Behavior:
+        - Each database is read once, by the first thread that asks for it;
+          other threads asking for the same database wait for the result.
+        - The lock is not held while the database is read, so threads asking
+          for other databases are not blocked.
+        - If the read fails, the error is raised to all waiting threads,
+          and the database is read again next time.
+        """
+        self.size = size
+        self._entries: OrderedDict[str, Future] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, database_name: str, read: Callable[[], _T]) -> _T:
+        key = database_name.upper()
+        with self._lock:
+            future = self._entries.get(key)
+            owner = future is None
+            if future is None:
+                future = Future()
+                self._entries[key] = future
+                while len(self._entries) > self.size:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+        if not owner:
+            return future.result()
+
+        try:
+            value = read()
+        except BaseException as err:
+            with self._lock:
+                if self._entries.get(key) is future:
+                    del self._entries[key]
+            future.set_exception(err)
+            raise
+        future.set_result(value)
+        return value
+
+
 class TeraDBI(contract.AbstractDBI):
     def __init__(
         self,
         engine: sa.Engine,
         cfg: config_model.Config,
+        *,
+        bulk_metadata: bool = False,
+        extract_stats: bool = True,
     ):
         self.engine = engine
         self.cfg = cfg
+        self.connection_stats = ConnectionStats()
+
+        # bulk metadata mode: comments are read for the whole database at once
+        self.bulk_metadata = bulk_metadata
+        self._comment_index: _DatabaseIndex[DatabaseComments] = _DatabaseIndex(
+            _COMMENT_INDEX_SIZE
+        )
+
+        # statistics are only shown for tables that have some (see _tables_with_stats)
+        self.extract_stats = extract_stats
+        self._stats_index: _DatabaseIndex[frozenset[str] | None] = _DatabaseIndex(
+            _STATS_INDEX_SIZE
+        )
 
         # import plugins
         self.rewrite_plugins: list[plugin_model._PluginInstance] = plugin_instances(
@@ -294,12 +484,12 @@ class TeraDBI(contract.AbstractDBI):
         )
 
     @translate_error()
-    def deploy_statements(self, statements: list[str]):
+    def deploy_statements(self, statements: Iterable[str]):
         """
         Deploys a list of SQL statements to the Teradata database.
 
         Args:
-            statements (list[str]): A list of SQL statements to execute.
+            statements (Iterable[str]): SQL statements to execute, can be a generator.
 
         Behavior:
         - Connects to the database engine.
@@ -345,6 +535,7 @@ class TeraDBI(contract.AbstractDBI):
                 object, including its DDL, comment, and additional details.
 
         Behavior:
+        - Checks out one connection, which is used for all queries about the object.
         - Fetches the DDL for the object using `get_object_ddl`.
         - Retrieves the object's comment using `get_object_comment`.
         - Collects additional details, such as statistics and column information,
@@ -352,27 +543,74 @@ class TeraDBI(contract.AbstractDBI):
         - Combines the gathered information into a `meta_model.DescribedObject` and
         returns it.
         """
+        with self._connection() as con:
+            return self._describe(con, object)
+
+    def get_described_objects(
+        self,
+        objects: Iterable[meta_model.IdentifiedObject],
+    ) -> Iterator[meta_model.DescribedObject | None]:
+        """
+        Describes a batch of objects, using one connection for all of them.
 
+        DDL of the objects is retrieved using multi-statement requests, see
+        `get_object_ddl_many`.
+
+        Args:
+            objects (Iterable[meta_model.IdentifiedObject]): The objects to describe.
+
+        Yields:
+            meta_model.DescribedObject | None: The described object, or None if the
+                object does not exist (see `get_described_object`).
+        """
+        objects = iter(objects)
+        # this is a generator, errors must be translated during the iteration
+        with translate_error(), self._connection() as con:
+            while batch := list(islice(objects, contract.DDL_BATCH_SIZE)):
+                ddls = self._get_object_ddl_many(con, batch)
+                for object, ddl in zip(batch, ddls):
+                    if ddl is None:
+                        yield None
+                        continue
+                    yield self._describe(con, object, ddl=ddl)
+
+    def _describe(
+        self,
+        con: sa.Connection,
+        object: meta_model.IdentifiedObject,
+        *,
+        ddl: str | None = None,
+    ) -> meta_model.DescribedObject | None:
+        """
+        Describes the object using the connection given, see `get_described_object`.
+
+        If the DDL of the object was already retrieved, it can be passed in `ddl`.
+        """
         # show table/view/proc ...
         try:
-            ddl = self.get_object_ddl(
-                database_name=object.database_name,
-                object_name=object.object_name,
-                object_type=object.object_type,
-            )
-            # comment of the object itself
-            comment = self.get_object_comment(
-                database_name=object.database_name,
-                object_identification=object.object_name,
-                object_type=object.object_type,
-            )
+            with translate_error():
+                if ddl is None:
+                    ddl = self._get_object_ddl(
+                        con,
+                        database_name=object.database_name,
+                        object_name=object.object_name,
+                        object_type=object.object_type,
+                    )
+                # comment of the object itself
+                comment = self._get_object_comment(
+                    con,
+                    database_name=object.database_name,
+                    object_identification=object.object_name,
+                    object_type=object.object_type,
+                )
 
-            # show stats + dbc.columnsV (comments)
-            details = self.get_object_details(
-                database_name=object.database_name,
-                object_identification=object.object_name,
-                object_type=object.object_type,
-            )
+                # show stats + dbc.columnsV (comments)
+                details = self._get_object_details(
+                    con,
+                    database_name=object.database_name,
+                    object_identification=object.object_name,
+                    object_type=object.object_type,
+                )
 
             # join it all together
             described_object = meta_model.DescribedObject(
@@ -383,13 +621,31 @@ class TeraDBI(contract.AbstractDBI):
             )
         except exc.DBAccessRightsError as err:
             logger.error(err.message)
+            con.rollback()
             return None
 
         except exc.DBObjectDoesNotExist as err:
             logger.debug(err)
+            con.rollback()
             return None
         return described_object
 
+    @contextmanager
+    def _connection(self):
+        """
+        Checks out a connection from the pool, and counts the checkout.
+        """
+        with self.engine.connect() as con:
+            self.connection_stats.add(checkouts=1)
+            yield con
+
+    def _execute(self, con: sa.Connection, stmt):
+        """
+        Executes the statement on the connection, and counts the statement.
+        """
+        self.connection_stats.add(statements=1)
+        return con.execute(stmt)
+
     @translate_error()
     def delete_database(self, database_name: str):
         """
@@ -739,19 +995,6 @@ class TeraDBI(contract.AbstractDBI):
         - Executes the query using the database engine.
         - Maps the query result to a list of `meta_model.IdentifiedObject`.
         """
-        # get the scope
-        if limit_to_type is None:
-            scope = ", ".join([f"'{kind}'" for kind in _TABLEKIND_TO_TYPE.keys()])
-            logger.trace(scope)
-        else:
-            scope = ", ".join(
-                [
-                    f"'{kind}'"
-                    for kind, tp in _TABLEKIND_TO_TYPE.items()
-                    if tp == meta_model.TABLE
-                ]
-            )
-            logger.trace(scope)
         sql = f"""
         select
             databaseName as database_name,
@@ -763,35 +1006,67 @@ class TeraDBI(contract.AbstractDBI):
             lastAlterName as last_alter_name
         from dbc.tablesV
         where databaseName = :database_name
-        and tableKind in ({scope})
+        and tableKind in ({_table_kind_scope(limit_to_type)})
         order by 1,2
         """
         stmt = sa.text(sql).bindparams(database_name=database_name)
         logger.debug(stmt)
         with self.engine.connect() as con:
             rows = [
-                meta_model.IdentifiedObject(
-                    database_name=row.database_name.strip(),
-                    object_name=row.object_name.strip(),
-                    object_type=_TABLEKIND_TO_TYPE[row.object_type.strip()],
-                    platform_object_type=row.object_type.strip(),
-                    create_datetime=row.create_datetime,
-                    last_alter_datetime=row.last_alter_datetime,
-                    creator_name=(
-                        row.creator_name.strip()
-                        if row.creator_name is not None
-                        else None
-                    ),
-                    last_alter_name=(
-                        row.last_alter_name.strip()
-                        if row.last_alter_name is not None
-                        else None
-                    ),
-                )
+                _row_to_identified_object(row)
                 for row in con.execute(stmt).fetchall()
             ]
         return rows
 
+    def get_object_list_many(
+        self,
+        database_names: Iterable[str],
+        *,
+        limit_to_type: str | None = None,
+    ) -> Iterator[meta_model.IdentifiedObject]:
+        """
+        Retrieves objects of many databases, using one query per chunk of databases.
+
+        Args:
+            database_names (Iterable[str]): Names of the databases.
+            limit_to_type (str, optional): The type of objects to limit the query to.
+                Defaults to None.
+
+        Yields:
+            meta_model.IdentifiedObject: Identified objects, ordered by database
+                name and object name within each chunk.
+
+        Behavior:
+        - Splits the databases into chunks of `_OBJECT_LIST_CHUNK_SIZE` names.
+        - For each chunk, queries `dbc.tablesV` with an IN-list of database names,
+          on one connection, and streams the rows.
+        """
+        database_names = list(database_names)
+        sql = f"""
+        select
+            databaseName as database_name,
+            tableName as object_name,
+            tableKind as object_type,
+            createTimeStamp as create_datetime,
+            lastAlterTimeStamp as last_alter_datetime,
+            creatorName as creator_name,
+            lastAlterName as last_alter_name
+        from dbc.tablesV
+        where databaseName in :database_names
+        and tableKind in ({_table_kind_scope(limit_to_type)})
+        order by 1,2
+        """
+        stmt = sa.text(sql).bindparams(
+            sa.bindparam("database_names", expanding=True)
+        )
+        # this is a generator, errors must be translated during the iteration
+        with translate_error(), self.engine.connect() as con:
+            for i in range(0, len(database_names), _OBJECT_LIST_CHUNK_SIZE):
+                chunk = database_names[i : i + _OBJECT_LIST_CHUNK_SIZE]
+                logger.debug(f"list objects: {len(chunk)} databases, from {chunk[0]}")
+                for row in con.execute(stmt, {"database_names": chunk}):
+                    yield _row_to_identified_object(row)
+
     @translate_error()
     def get_object_ddl(
         self,
@@ -815,7 +1090,7 @@ class TeraDBI(contract.AbstractDBI):
         - Executes the query using the database engine.
         - Returns the DDL statement.
         """
-        with self.engine.connect() as con:
+        with self._connection() as con:
             return self._get_object_ddl(con, database_name, object_name, object_type)
 
     def _get_object_ddl(
@@ -843,14 +1118,121 @@ class TeraDBI(contract.AbstractDBI):
         - Executes the query using the database connection.
         - Returns the DDL statement.
         """
-        sql = f"""show {object_type} "{database_name}"."{object_name}";"""
+        sql = _show_statement(database_name, object_name, object_type)
         logger.debug(sql)
         stmt = sa.text(sql)
-        rows = [r[0].replace("\r", "\n") for r in con.execute(stmt).fetchall()]
-        stmt = "".join(rows)
+        return _rows_to_ddl(self._execute(con, stmt).fetchall())
+
+    @translate_error()
+    def get_object_ddl_many(
+        self,
+        objects: Sequence[meta_model.IdentifiedObject],
+        *,
+        batch_size: int = contract.DDL_BATCH_SIZE,
+    ) -> list[str | None]:
+        """
+        Retrieves DDL statements of many objects, using multi-statement requests.
+
+        Args:
+            objects (Sequence[meta_model.IdentifiedObject]): The objects.
+            batch_size (int, optional): Max number of SHOW statements in one request.
+
+        Returns:
+            list[str | None]: DDL of each object, in the same order as the input;
+                None if the object does not exist or we have no access to it.
+
+        Behavior:
+        - Sends up to `batch_size` SHOW statements in one request, and reads one
+          result set for each of them.
+        - If the request fails because one of the objects was dropped, or we
+          have no access to it, the statements of the batch are sent one by one,
+          so that one bad object does not fail the whole batch.
+        - Any other error (lost connection, etc.) is raised.
+        """
+        with self._connection() as con:
+            return self._get_object_ddl_many(con, objects, batch_size=batch_size)
+
+    def _get_object_ddl_many(
+        self,
+        con: sa.Connection,
+        objects: Sequence[meta_model.IdentifiedObject],
+        *,
+        batch_size: int = contract.DDL_BATCH_SIZE,
+    ) -> list[str | None]:
+        """
+        Retrieves DDL statements of many objects, see `get_object_ddl_many`.
+        """
+        ddls: list[str | None] = []
+        for start in range(0, len(objects), batch_size):
+            batch = objects[start : start + batch_size]
+            if len(batch) == 1:
+                ddls.append(self._get_object_ddl_or_none(con, batch[0]))
+                continue
+            try:
+                ddls.extend(self._show_many(con, batch))
+            except (sa_exc.StatementError, teradatasql.Error) as err:  # type: ignore
+                cause = getattr(err, "orig", err)
+                if get_error_code_from_exception(cause) not in MISSING_OBJECT_ERRORS:
+                    raise
+                logger.debug(f"multi-statement show failed, one by one: {err}")
+                con.rollback()
+                ddls.extend(self._get_object_ddl_or_none(con, obj) for obj in batch)
+        return ddls
+
+    def _show_many(
+        self,
+        con: sa.Connection,
+        objects: Sequence[meta_model.IdentifiedObject],
+    ) -> list[str]:
+        """
+        Sends SHOW statements of all objects in one request, and returns DDL of
+        each object. The request fails as a whole if any of the statements fails.
+        """
+        sql = "\n".join(
+            _show_statement(o.database_name, o.object_name, o.object_type)
+            for o in objects
+        )
+        logger.debug(sql)
+        self.connection_stats.add(statements=1)
 
-        stmt = stmt.strip().removesuffix(";") + ";\n"
-        return stmt
+        # sqlalchemy does not expose more than one result set of a statement,
+        # we have to use the driver's cursor directly
+        cursor = con.connection.dbapi_connection.cursor()  # type: ignore
+        try:
+            cursor.execute(sql)
+            ddls = [_rows_to_ddl(cursor.fetchall())]
+            while cursor.nextset():
+                ddls.append(_rows_to_ddl(cursor.fetchall()))
+        finally:
+            cursor.close()
+
+        if len(ddls) != len(objects):
+            raise exc.DBStatementError(
+                message=f"expected {len(objects)} result sets, got {len(ddls)}",
+                statement=sql,
+            )
+        return ddls
+
+    def _get_object_ddl_or_none(
+        self,
+        con: sa.Connection,
+        obj: meta_model.IdentifiedObject,
+    ) -> str | None:
+        """
+        Retrieves DDL of one object, returns None if the object does not exist
+        or we have no access to it.
+        """
+        try:
+            with translate_error():
+                return self._get_object_ddl(
+                    con, obj.database_name, obj.object_name, obj.object_type
+                )
+        except exc.DBAccessRightsError as err:
+            logger.error(err.message)
+        except exc.DBObjectDoesNotExist as err:
+            logger.debug(err)
+        con.rollback()
+        return None
 
     @translate_error()
     def get_object_comment(
@@ -877,9 +1259,30 @@ class TeraDBI(contract.AbstractDBI):
         - Executes the query using the database engine.
         - Returns the comment, or None if no comment is found.
         """
+        with self._connection() as con:
+            return self._get_object_comment(
+                con,
+                database_name,
+                object_identification,
+                object_type=object_type,
+            )
+
+    def _get_object_comment(
+        self,
+        con: sa.Connection,
+        database_name: str,
+        object_identification: str,
+        *,
+        object_type: str,
+    ) -> str | None:
+        """
+        Retrieves the comment for a database object, using the connection given.
+        See `get_object_comment`.
+        """
         # TODO: předělat tak, aby výjimka byla pro sloupec. rozdvojka tablesV a columnsV.
         if object_type in _CAN_HAVE_COMMENT:
             return self._get_coment_from_tables_v(
+                con,
                 database_name,
                 table_name=object_identification,
                 object_type=object_type,
@@ -912,9 +1315,30 @@ class TeraDBI(contract.AbstractDBI):
         - Retrieves statistics using `_show_stats`.
         - Combines the retrieved details into a `meta_model.ObjectDetails` list.
         """
+        with self._connection() as con:
+            return self._get_object_details(
+                con,
+                database_name,
+                object_identification,
+                object_type=object_type,
+            )
+
+    def _get_object_details(
+        self,
+        con: sa.Connection,
+        database_name: str,
+        object_identification: str,
+        *,
+        object_type: str,
+    ) -> meta_model.ObjectDetails:
+        """
+        Retrieves additional details for a database object, using the connection
+        given. See `get_object_details`.
+        """
         return [
             *(
                 self._column_comments(
+                    con,
                     database_name,
                     object_identification,
                     object_type=object_type,
@@ -922,6 +1346,7 @@ class TeraDBI(contract.AbstractDBI):
             ),
             *(
                 self._show_stats(
+                    con,
                     database_name,
                     object_identification,
                     object_type=object_type,
@@ -931,6 +1356,7 @@ class TeraDBI(contract.AbstractDBI):
 
     def _column_comments(
         self,
+        con: sa.Connection,
         database_name: str,
         object_identification: str,
         *,
@@ -940,6 +1366,7 @@ class TeraDBI(contract.AbstractDBI):
         Retrieves column comments for a database object.
 
         Args:
+            con (sa.Connection): The database connection.
             database_name (str): The name of the database containing the object.
             object_identification (str): The name of the object to retrieve column
                 comments for.
@@ -950,11 +1377,33 @@ class TeraDBI(contract.AbstractDBI):
 
         Behavior:
         - Constructs a SQL query to retrieve column comments from `dbc.columnsV`.
-        - Executes the query using the database engine.
+        - Executes the query using the database connection.
         - Maps the query result to a list of `meta_model.ColumnDescription`.
+        - In bulk metadata mode, the comments are taken from the comment index.
         """
         if object_type not in _CAN_HAVE_COLUMNS:
             return []
+
+        def _quote(comment: str) -> str:
+            return comment.replace("'", "''")
+
+        if self.bulk_metadata:
+            comments = self.get_database_comments(con, database_name)
+            return [
+                meta_model.ColumnDescription(
+                    column_name=column_name,
+                    column_comment=column_comment,
+                    ddl_statement=(
+                        f"COMMENT ON COLUMN {database_name}."
+                        f"{object_identification}.{column_name} "
+                        f"IS '{_quote(column_comment)}';"
+                    ),
+                )
+                for column_name, column_comment in comments.columns.get(
+                    object_identification.upper(), []
+                )
+            ]
+
         sql = """
             select columnName, commentString
             from dbc.columnsV
@@ -970,27 +1419,24 @@ class TeraDBI(contract.AbstractDBI):
         logger.debug(sql)
         logger.debug(f"params: {database_name=}, table_name={object_identification}")
 
-        def _quote(comment: str) -> str:
-            return comment.replace("'", "''")
-
-        with self.engine.connect() as con:
-            comments = [  # pyright: ignore[reportGeneralTypeIssues]
-                meta_model.ColumnDescription(
-                    column_name=row[0].strip(),
-                    column_comment=row[1],
-                    ddl_statement=(
-                        f"COMMENT ON COLUMN {database_name}."
-                        f"{object_identification}.{row[0].strip()} "
-                        f"IS '{_quote(row[1])}';"
-                    ),
-                )
-                for row in con.execute(stmt).fetchall()
-            ]
-            logger.debug(f"{len(comments)=}")
-            return comments
+        comments = [  # pyright: ignore[reportGeneralTypeIssues]
+            meta_model.ColumnDescription(
+                column_name=row[0].strip(),
+                column_comment=row[1],
+                ddl_statement=(
+                    f"COMMENT ON COLUMN {database_name}."
+                    f"{object_identification}.{row[0].strip()} "
+                    f"IS '{_quote(row[1])}';"
+                ),
+            )
+            for row in self._execute(con, stmt).fetchall()
+        ]
+        logger.debug(f"{len(comments)=}")
+        return comments
 
     def _show_stats(
         self,
+        con: sa.Connection,
         database_name: str,
         object_identification: str,
         *,
@@ -1000,6 +1446,7 @@ class TeraDBI(contract.AbstractDBI):
         Retrieves statistics for a database object.
 
         Args:
+            con (sa.Connection): The database connection.
             database_name (str): The name of the database containing the object.
             object_identification (str): The name of the object to retrieve statistics
                 for.
@@ -1010,11 +1457,20 @@ class TeraDBI(contract.AbstractDBI):
 
         Behavior:
         - Constructs a SQL query to retrieve statistics using `SHOW STATS`.
-        - Executes the query using the database engine.
+        - Executes the query using the database connection.
         - Maps the query result to a list of `meta_model.TableStatistic`.
         - Handles specific exceptions silently or logs them without crashing.
+        - Skips tables that have no statistics (see `_tables_with_stats`), and
+          all tables if the statistics are not extracted.
         """
-        if object_type != meta_model.TABLE:
+        if object_type != meta_model.TABLE or not self.extract_stats:
+            return []
+
+        tables_with_stats = self._tables_with_stats(con, database_name)
+        if (
+            tables_with_stats is not None
+            and object_identification.upper() not in tables_with_stats
+        ):
             return []
 
         sql = f"""show stats on "{database_name}"."{object_identification}";"""
@@ -1024,20 +1480,22 @@ class TeraDBI(contract.AbstractDBI):
             with translate_error():
                 all_stats = ""
                 logger.debug(stmt)
-                with self.engine.connect() as con:
-                    rows = [
-                        r[0].replace("\r", "\n") for r in con.execute(stmt).fetchall()
-                    ]
-                    all_stats = "".join(rows)
+                rows = [
+                    r[0].replace("\r", "\n")
+                    for r in self._execute(con, stmt).fetchall()
+                ]
+                all_stats = "".join(rows)
 
         # pass no stats silently
         except exc.DBNoStatsDefined as err:
+            con.rollback()
             return []
 
         # log no access rights but do not crash
         except exc.DBAccessRightsError as err:
             msg = f"{database_name}.{object_identification}: {err.message}"
             logger.error(msg)
+            con.rollback()
             return []
 
         stats = [
@@ -1051,8 +1509,52 @@ class TeraDBI(contract.AbstractDBI):
         logger.debug(f"{len(stats)=}")
         return stats
 
+    def _tables_with_stats(
+        self,
+        con: sa.Connection,
+        database_name: str,
+    ) -> frozenset[str] | None:
+        """
+        Returns names of tables in the database that have statistics defined.
+
+        Args:
+            con (sa.Connection): The database connection.
+            database_name (str): The name of the database.
+
+        Returns:
+            frozenset[str] | None: Upper-case names of the tables, or None if we can
+                not tell (no access to `dbc.statsV`).
+
+        Behavior:
+        - Reads the tables from `dbc.statsV` - one query for the whole database -
+          and stores them in the index (see `_DatabaseIndex`).
+        """
+
+        def _read() -> frozenset[str] | None:
+            sql = """
+                select distinct tableName as table_name
+                from dbc.statsV
+                where databaseName = :database_name
+                """
+            stmt = sa.text(sql).bindparams(database_name=database_name)
+            try:
+                with translate_error():
+                    tables = frozenset(
+                        row.table_name.strip().upper()
+                        for row in self._execute(con, stmt)
+                    )
+            except exc.DBAccessRightsError as err:
+                logger.warning(f"can not list tables with statistics: {err.message}")
+                con.rollback()
+                return None
+            logger.debug(f"{len(tables)} tables with statistics ({database_name})")
+            return tables
+
+        return self._stats_index.get(database_name, _read)
+
     def _get_coment_from_tables_v(
         self,
+        con: sa.Connection,
         database_name: str,
         table_name: str,
         object_type: str,
@@ -1061,6 +1563,7 @@ class TeraDBI(contract.AbstractDBI):
         Retrieves the comment for a database object from `dbc.tablesV`.
 
         Args:
+            con (sa.Connection): The database connection.
             database_name (str): The name of the database containing the object.
             table_name (str): The name of the object to retrieve the comment for.
             object_type (str): The type of the object (e.g., "table").
@@ -1070,9 +1573,21 @@ class TeraDBI(contract.AbstractDBI):
 
         Behavior:
         - Constructs a SQL query to retrieve the comment from `dbc.tablesV`.
-        - Executes the query using the database engine.
+        - Executes the query using the database connection.
         - Returns the comment, or None if no comment is found.
+        - In bulk metadata mode, the comment is taken from the comment index.
         """
+        if self.bulk_metadata:
+            comments = self.get_database_comments(con, database_name)
+            comment = comments.tables.get(table_name.upper())
+            if comment is None:
+                return None
+            comment = comment.replace("'", "''")
+            return (
+                f"""comment on {object_type} "{database_name}"."{table_name}" """
+                f"""is '{comment}';"""
+            )
+
         sql = """
             select commentString as comment_string
             from dbc.tablesV
@@ -1087,16 +1602,91 @@ class TeraDBI(contract.AbstractDBI):
         )
         logger.debug(sql)
         logger.debug(f"{database_name=}, {table_name=}")
-        with self.engine.connect() as con:
-            for row in con.execute(stmt):
-                comment = row.comment_string.replace("'", "''")
-                comment = (
-                    f"""comment on {object_type} "{database_name}"."{table_name}" """
-                    f"""is '{comment}';"""
-                )
-                return comment
+        for row in self._execute(con, stmt):
+            comment = row.comment_string.replace("'", "''")
+            comment = (
+                f"""comment on {object_type} "{database_name}"."{table_name}" """
+                f"""is '{comment}';"""
+            )
+            return comment
         return None
 
+    @translate_error()
+    def get_database_comments(
+        self,
+        con: sa.Connection,
+        database_name: str,
+    ) -> DatabaseComments:
+        """
+        Returns comments of all objects and columns in the database.
+
+        Args:
+            con (sa.Connection): The database connection.
+            database_name (str): The name of the database.
+
+        Returns:
+            DatabaseComments: Table and column comments of the database.
+
+        Behavior:
+        - Returns the comments from the comment index, if the database was
+          already read.
+        - Otherwise, reads all non-null comments from `dbc.tablesV` and
+          `dbc.columnsV` - one query each - and stores them in the index
+          (see `_DatabaseIndex`).
+        """
+        return self._comment_index.get(
+            database_name,
+            lambda: self._read_database_comments(con, database_name),
+        )
+
+    def _read_database_comments(
+        self,
+        con: sa.Connection,
+        database_name: str,
+    ) -> DatabaseComments:
+        """
+        Reads all non-null table and column comments of the database.
+
+        Args:
+            con (sa.Connection): The database connection.
+            database_name (str): The name of the database.
+
+        Returns:
+            DatabaseComments: Table and column comments of the database.
+        """
+        tables_sql = """
+            select tableName as table_name, commentString as comment_string
+            from dbc.tablesV
+            where
+                databaseName = :database_name
+                and commentString is not null
+            """
+        columns_sql = """
+            select
+                tableName as table_name,
+                columnName as column_name,
+                commentString as comment_string
+            from dbc.columnsV
+            where
+                commentString is not null
+                and databaseName = :database_name
+            order by tableName, columnId asc"""
+        logger.debug(f"read comments of the database: {database_name}")
+        comments = DatabaseComments()
+        stmt = sa.text(tables_sql).bindparams(database_name=database_name)
+        for row in self._execute(con, stmt):
+            comments.tables[row.table_name.strip().upper()] = row.comment_string
+
+        stmt = sa.text(columns_sql).bindparams(database_name=database_name)
+        for row in self._execute(con, stmt):
+            comments.columns.setdefault(row.table_name.strip().upper(), []).append(
+                (row.column_name.strip(), row.comment_string)
+            )
+        logger.debug(
+            f"{len(comments.tables)=}, {len(comments.columns)=} ({database_name})"
+        )
+        return comments
+
     @translate_error()
     def get_databases(self) -> list[meta_model.DescribedDatabase]:
         """
@@ -1167,6 +1757,7 @@ class TeraDBI(contract.AbstractDBI):
         - Disposes of the database engine.
         """
         logger.info("dispose of the sql engine")
+        logger.info(str(self.connection_stats))
         self.engine.dispose()
 
     @translate_error()
@@ -6,7 +6,7 @@ from attrs import define, field
 
 from dblocks_core import exc, tagger
 from dblocks_core.config.config import logger
-from dblocks_core.deployer import tokenizer
+from dblocks_core.deployer import tokenizer, validator
 from dblocks_core.model import meta_model
 from dblocks_core.writer import fsystem
 
@@ -33,15 +33,21 @@ class DeploymentFile:
     default_db: str | None
     file: Path = field(converter=Path)
     file_type: str | None = field(validator=None)
+    # number of statements, known if the batch was validated
+    statement_count: int | None = field(default=None)
 
     def statements(
         self,
         *,
         separator=tokenizer.SEMICOLON,
     ) -> Generator[DeploymentStatement, None, None]:
-        txt = self.file.read_text(encoding="utf-8", errors="strict")
-        for statement in tokenizer.tokenize_statements(txt, separator=separator):
-            yield DeploymentStatement(sql=statement.statement)
+        statements = tokenizer.tokenize_file(
+            self.file,
+            separator=separator,
+            bteq=self.file_type == meta_model.GENERIC_BTEQ,
+        )
+        for sql in tokenizer.sql_statements(statements):
+            yield DeploymentStatement(sql=sql)
 
 
 @define
@@ -57,7 +63,33 @@ class DeploymentBatch:
     steps: list[DeploymentStep] = field(factory=list)
 
 
-def create_batch(root_dir: Path, tgr: tagger.Tagger | None = None) -> DeploymentBatch:
+def create_batch(
+    root_dir: Path,
+    tgr: tagger.Tagger | None = None,
+    *,
+    validate: bool = False,
+    workers: int | None = None,
+) -> DeploymentBatch:
+    """
+    Scans the directory, and creates the deployment batch.
+
+    Args:
+        root_dir (Path): Directory with steps of the deployment.
+        tgr (tagger.Tagger | None, optional): Tagger used to expand names
+            of databases. Defaults to None.
+        validate (bool, optional): Tokenize all files (in a process pool),
+            and count their statements; with a tagger, placeholders of unknown
+            tagging variables are reported, too. Defaults to False.
+        workers (int | None, optional): Number of processes used for validation.
+            Defaults to None (number of processors).
+
+    Returns:
+        DeploymentBatch: the batch
+
+    Raises:
+        exc.DDeployerInvalidBatch: if the structure of the batch is invalid,
+            or if validation found parsing errors (all of them are reported)
+    """
     # scan folders in root - each folder is a DeploymentStep
     errs = []
     steps: list[DeploymentStep] = []
@@ -138,4 +170,48 @@ def create_batch(root_dir: Path, tgr: tagger.Tagger | None = None) -> Deployment
                 )
 
     steps = [step for step in steps if len(step.files) > 0]
-    return DeploymentBatch(root_dir=root_dir, steps=steps)
+    batch = DeploymentBatch(root_dir=root_dir, steps=steps)
+    if validate:
+        validate_batch(batch, tgr, workers=workers)
+    return batch
+
+
+def validate_batch(
+    batch: DeploymentBatch,
+    tgr: tagger.Tagger | None = None,
+    *,
+    workers: int | None = None,
+):
+    """
+    Tokenizes all files of the batch, and sets their statement counts.
+
+    Args:
+        batch (DeploymentBatch): the batch
+        tgr (tagger.Tagger | None, optional): If given, statements with
+            placeholders of unknown tagging variables are reported.
+            Defaults to None.
+        workers (int | None, optional): Number of processes. Defaults to None.
+
+    Raises:
+        exc.DDeployerInvalidBatch: if any of the files can not be tokenized,
+            or uses an unknown tagging variable
+    """
+    files = [f for step in batch.steps for f in step.files]
+    # procedures (etc.) are deployed as they are, see cmd_pkg_deployment;
+    # empty scripts are allowed in packages, they deploy nothing
+    report = validator.validate_files(
+        (
+            (f.file, f.file_type not in meta_model.ONE_STATEMENT_TYPES)
+            for f in files
+        ),
+        workers=workers,
+        allow_empty=True,
+        variables=tgr.variables if tgr is not None else None,
+    )
+    if not report.is_valid:
+        msg = "Invalid statements in the batch:\n" + "\n".join(
+            f"- {err}" for err in report.errors
+        )
+        raise exc.DDeployerInvalidBatch(msg)
+    for file, file_report in zip(files, report.files):
+        file.statement_count = file_report.statements
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from time import time
+
+from dblocks_core.config.config import logger
+from dblocks_core.deployer import tokenizer
+
+# default name of the cache file (in the context directory)
+CACHE_FILE_NAME = "statements.sqlite"
+
+# default size limit of the cache, in bytes (of stored statements)
+_MAX_BYTES = 256 * 1024 * 1024
+
+# part of the key, changed when format of the stored statements changes
+# (entries of other formats are never read, and are evicted eventually)
+_FORMAT_VERSION = 2
+
+_SCHEMA = """
+create table if not exists statements (
+    key text primary key,
+    statements text not null,
+    size integer not null,
+    used real not null
+)
+"""
+
+
+class StatementCache:
+    def __init__(self, file: Path, *, max_bytes: int = _MAX_BYTES):
+        """
+        On-disk cache of tokenized scripts, keyed by hash of the script,
+        the separator, and the BTEQ mode of the tokenizer.
+
+        Args:
+            file (Path): The sqlite database (created if it does not exist).
+            max_bytes (int, optional): Size limit of the cache; least recently
+                used scripts are evicted when it is exceeded. Defaults to 256 MiB.
+
+        Behavior:
+        - Each script is stored as a list of statements, their md5 hashes
+          and types; the hashes are verified when the script is read from
+          the cache, a mismatch (or a corrupted entry) is a cache miss.
+        - The cache is only an optimization: if the database can not be used,
+          a warning is logged, and scripts are tokenized as if there was no cache.
+        - Errors of the tokenizer are raised as usual, failed scripts are not cached.
+        """
+        self.file = file
+        self.max_bytes = max_bytes
+        self.hits, self.misses = 0, 0
+        self._con: sqlite3.Connection | None = None
+        self._size = 0
+        try:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            self._con = sqlite3.connect(file, isolation_level=None)
+            # this is a cache, durability is not needed
+            self._con.execute("pragma journal_mode=wal")
+            self._con.execute("pragma synchronous=off")
+            self._con.execute(_SCHEMA)
+            (size,) = self._con.execute(
+                "select coalesce(sum(size), 0) from statements"
+            ).fetchone()
+            self._size = size
+        except sqlite3.Error as err:
+            logger.warning(f"statement cache is disabled, {file.as_posix()}: {err}")
+            self.close()
+
+    def tokenize_statements(
+        self,
+        text: str,
+        *,
+        separator=tokenizer.SEMICOLON,
+        bteq: bool = False,
+    ) -> list[tokenizer.Statement]:
+        """
+        Tokenizes the script, or returns its statements from the cache.
+
+        Args:
+            text (str): The script.
+            separator (str, optional): The separator of statements.
+            bteq (bool, optional): Recognize BTEQ commands. Defaults to False.
+
+        Returns:
+            list[tokenizer.Statement]: The statements.
+
+        Raises:
+            exc.DParsingError: See `tokenizer.tokenize_statements`.
+        """
+        if self._con is None:
+            return list(
+                tokenizer.tokenize_statements(text, separator=separator, bteq=bteq)
+            )
+
+        digest = hashlib.sha256(text.encode("utf-8", errors="surrogatepass"))
+        key = f"v{_FORMAT_VERSION}:{digest.hexdigest()}:{separator}"
+        if bteq:
+            key = f"{key}:bteq"
+        statements = self._get(key)
+        if statements is not None:
+            self.hits += 1
+            return statements
+
+        self.misses += 1
+        statements = list(
+            tokenizer.tokenize_statements(text, separator=separator, bteq=bteq)
+        )
+        self._put(key, statements)
+        return statements
+
+    def close(self):
+        """Closes the cache, it can not be used afterwards."""
+        if self._con is not None:
+            logger.debug(f"statement cache: {self.hits=}, {self.misses=}")
+            self._con.close()
+            self._con = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get(self, key: str) -> list[tokenizer.Statement] | None:
+        try:
+            row = self._con.execute(  # type: ignore
+                "select statements from statements where key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._con.execute(  # type: ignore
+                "update statements set used = ? where key = ?", (time(), key)
+            )
+            statements = []
+            for statement, md5, stmt_type in json.loads(row[0]):
+                if hashlib.md5(statement.encode()).hexdigest() != md5:
+                    raise ValueError(f"md5 mismatch: {md5}")
+                statements.append(
+                    tokenizer.Statement(
+                        type=tokenizer.StatementType(stmt_type), statement=statement
+                    )
+                )
+        except sqlite3.Error as err:
+            logger.warning(f"statement cache failed: {err}")
+            return None
+        except (ValueError, TypeError, AttributeError) as err:
+            # corrupted entry (invalid json, unexpected format, ...)
+            logger.warning(f"statement cache: invalid entry {key}: {err}")
+            return None
+        return statements
+
+    def _put(self, key: str, statements: list[tokenizer.Statement]):
+        value = json.dumps(
+            [
+                [
+                    s.statement,
+                    hashlib.md5(s.statement.encode()).hexdigest(),
+                    s.type.value,
+                ]
+                for s in statements
+            ]
+        )
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        try:
+            # the key can exist, if the entry was invalid
+            row = self._con.execute(  # type: ignore
+                "select size from statements where key = ?", (key,)
+            ).fetchone()
+            self._con.execute(  # type: ignore
+                "insert or replace into statements values (?, ?, ?, ?)",
+                (key, value, size, time()),
+            )
+            self._size += size - (row[0] if row else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+        except sqlite3.Error as err:
+            logger.warning(f"statement cache failed: {err}")
+
+    def _evict(self):
+        """Deletes least recently used scripts, until the cache fits the limit."""
+        rows = self._con.execute(  # type: ignore
+            "select key, size from statements order by used"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._size <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._size -= size
+        self._con.executemany(  # type: ignore
+            "delete from statements where key = ?", evicted
+        )
+        logger.debug(f"statement cache: evicted {len(evicted)} scripts")
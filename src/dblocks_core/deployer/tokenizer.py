@@ -1,5 +1,8 @@
+import functools
+import re
 from enum import Enum
-from typing import Generator
+from pathlib import Path
+from typing import Callable, Generator, Iterable, Iterator
 
 from dblocks_core import exc
 from dblocks_core.config.config import logger
@@ -14,6 +17,48 @@ RBRACKET = ")"
 MINUS = "-"
 QUOTE = '"'
 
+# number of characters read at once by read_chunks
+_CHUNK_SIZE = 1024 * 1024
+
+# files larger than this (in bytes) are tokenized while their statements are used
+STREAMING_THRESHOLD = 16 * 1024 * 1024
+
+# BTEQ commands that end the script
+_BTEQ_END_COMMANDS = {"QUIT", "EXIT"}
+
+# BTEQ commands that only affect the logon of BTEQ, or print a message;
+# they are skipped by the deployment, which has its own session
+_BTEQ_SESSION_COMMANDS = {"LOGON", "LOGOFF", "LOGMECH", "LOGDATA", "SESSIONS", "REMARK"}
+
+# options of .SET that only change formatting of the output of BTEQ
+_BTEQ_FORMAT_OPTIONS = {
+    "ECHOREQ",
+    "FOLDLINE",
+    "FORMAT",
+    "HEADING",
+    "FOOTING",
+    "NULL",
+    "PAGELENGTH",
+    "QUIET",
+    "RETLIMIT",
+    "SEPARATOR",
+    "SIDETITLES",
+    "TIMEMSG",
+    "TITLEDASHES",
+    "WIDTH",
+}
+
+# name (and first argument) of a BTEQ command
+_BTEQ_COMMAND = re.compile(r"\.\s*(\w*)\s*(\w*)")
+
+# .IF ERRORCODE <> 0 THEN .QUIT - the deployment stops on any error,
+# so the condition never holds, and the command can be skipped
+_BTEQ_QUIT_ON_ERROR = re.compile(
+    r"\.\s*IF\s+ERROR(?:CODE|LEVEL)\s*(?:<>|\^=|!=|>|NE\b|GT\b)\s*0\s+"
+    r"THEN\s+\.\s*(?:QUIT|EXIT)\b[^.]*",
+    re.IGNORECASE,
+)
+
 
 from attrs import field, frozen
 
@@ -34,6 +79,7 @@ def tokenize_statements(
     *,
     separator=SEMICOLON,
     raise_errors: bool = True,
+    bteq: bool = False,
 ) -> Generator[Statement, None, None]:
     """
     Tokenizes SQL statements from a text input, handling comments and string
@@ -52,45 +98,165 @@ def tokenize_statements(
         str: A parsed SQL statement.
 
     Behavior:
-    - Processes the input text character by character, maintaining state for
-    handling string literals and block comments.
+    - See `tokenize_chunks`, the text is processed as one chunk.
+    """
+    yield from tokenize_chunks(
+        (text,),
+        separator=separator,
+        raise_errors=raise_errors,
+        bteq=bteq,
+    )
+
+
+def tokenize_chunks(
+    chunks: Iterable[str],
+    *,
+    separator=SEMICOLON,
+    raise_errors: bool = True,
+    on_error: Callable[[str], None] | None = None,
+    bteq: bool = False,
+) -> Generator[Statement, None, None]:
+    """
+    Tokenizes SQL statements from chunks of text (for example, from `read_chunks`),
+    handling comments and string literals.
+
+    Args:
+        chunks (Iterable[str]): Parts of the input text, in order; statements,
+            comments and strings can span several chunks.
+        separator (str, optional): The character used to separate statements.
+            Defaults to `SEMICOLON`.
+        raise_errors (bool, optional): Raise on errors, otherwise log them.
+            Defaults to True.
+        on_error (Callable[[str], None] | None, optional): If given, it is called
+            with message of each error, instead of raising or logging it.
+        bteq (bool, optional): Recognize BTEQ commands. Defaults to False.
+
+    Raises:
+        exc.DParsingError: Raised for errors such as unterminated comments or
+            strings, or invalid empty statements.
+
+    Yields:
+        str: A parsed SQL statement.
+
+    Behavior:
+    - Scans the input text with a compiled regex, which jumps from one character
+    that can change the state (quotes, comments, brackets, the separator) to the
+    next one; other characters are never visited in Python.
+    - Maintains state for handling string literals and block comments.
     - Identifies the end of a statement using the provided separator, ensuring
     that statements are non-empty.
     - Detects and raises errors for unterminated comments or string literals,
-    enhancing error messages with line numbers.
-    - Yields each valid SQL statement, and processes any remaining text at the end
-    as the final statement.
+    enhancing error messages with line numbers (counted over all chunks).
+    - Yields each statement as soon as its separator was read, and processes any
+    remaining text at the end as the final statement.
+    - Only text of the current statement is kept in memory, the rest of the
+    chunks is read when needed.
+    - In BTEQ mode, a line that starts with a dot (outside of any statement)
+    is a BTEQ command, up to the end of the line; it is yielded as a statement
+    of type `StatementType.BTEQ`. Comments right before the command are dropped.
+    Commands that can not be skipped by the deployment (control flow, error
+    levels, imports, ...) are reported as errors, see `sql_statements`.
     """
 
     # initial state
-    in_string, in_comment, skip_next_n = False, False, 0
+    in_string, in_comment = False, False
     in_identifier, in_single_line_comment = False, False
     bracket_count = 0
-    next_char = ""
-    line_no = 1
+    line_no, line_pos = 1, 0
     prev_stmt_idx, stmt_count = 0, 1
+    scanner = _scanner(separator, bteq)
+    # the buffer (text), and its position in the input
+    text, offset = "", 0
+    chunks = iter(chunks)
+    all_read = False
+
+    def _report(message: str):
+        if on_error is not None:
+            on_error(message)
+            return
+        if raise_errors:
+            raise exc.DParsingError(message)
+        logger.error(message)
+
+    pos = 0
+    while True:
+        if in_single_line_comment:
+            match = _SINGLE_LINE_COMMENT_SCANNER.search(text, pos)
+        else:
+            match = scanner.search(text, pos)
+
+        # the state machine peeks at up to 2 characters after the match,
+        # read the next chunk if they are not in the buffer yet
+        # (and BTEQ commands need the whole line)
+        if not all_read and (
+            match is None
+            or match.start() + 3 > len(text)
+            or (match.lastgroup == "dot" and text.find(NEW_LINE, match.end()) < 0)
+        ):
+            if match is None:
+                # the last character could start a pair of characters (/*),
+                # and the last line could start with a BTEQ command
+                line_start = text.rfind(NEW_LINE) + 1
+                if bteq and not text[line_start:].strip(" \t"):
+                    pos = max(pos, line_start)
+                else:
+                    pos = max(pos, len(text) - 1)
 
-    for i, char in enumerate(text):
-        # count new lines to enhance error messages
-        if char == NEW_LINE:
-            line_no = line_no + 1
+            # drop text of statements that were already yielded
+            cut = prev_stmt_idx
+            if line_pos < cut:
+                line_no += text.count(NEW_LINE, line_pos, cut)
+                line_pos = cut
+            text, offset = text[cut:], offset + cut
+            pos, line_pos, prev_stmt_idx = pos - cut, line_pos - cut, 0
 
-        # skip unterminated parts of the statement
-        if skip_next_n > 0:
-            skip_next_n = skip_next_n - 1
+            # read at least as much as is in the buffer, so that long statements
+            # are not copied over and over again
+            parts, size = [text], 0
+            while size <= len(text):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    all_read = True
+                    break
+                parts.append(chunk)
+                size += len(chunk)
+            text = "".join(parts)
             continue
 
-        # peek the next character
-        try:
-            next_char = text[i + 1]
-        except IndexError:
-            next_char = ""
+        if match is None:
+            break
 
-        # peek at the next 2 characters
-        try:
-            next_2chars = text[i + 1 : i + 3]  # noqa: E203
-        except IndexError:
-            next_2chars = ""
+        i = match.start()
+        char = text[i]
+        next_char = text[i + 1 : i + 2]  # noqa: E203
+        pos = i + 1
+
+        # BTEQ command: dot at start of a line, and no statement before it;
+        # start of the buffer is start of a line only at start of the input
+        if match.lastgroup == "dot":
+            pos = match.end()
+            if (
+                not (in_string or in_comment or in_identifier)
+                and bracket_count == 0
+                and (i > 0 or offset == 0)
+                and _BLANK.fullmatch(text, prev_stmt_idx, i)
+            ):
+                end_of_line = text.find(NEW_LINE, pos)
+                if end_of_line < 0:
+                    end_of_line = len(text)
+                statement = text[pos - 1 : end_of_line].strip()  # noqa: E203
+                if (error := _bteq_command_error(statement)) is not None:
+                    at_line = line_no + text.count(NEW_LINE, line_pos, i)
+                    _report(f"Error at line {at_line}: {error}")
+                yield Statement(type=StatementType.BTEQ, statement=statement)
+                stmt_count = stmt_count + 1
+                prev_stmt_idx = pos = end_of_line
+            continue
+
+        # line numbers are only needed in error messages, count them lazily
+        if i >= line_pos:
+            line_no += text.count(NEW_LINE, line_pos, i + 1)
+            line_pos = i + 1
 
         # start and end of string
         if char == APOSTROPHE and not (in_comment or in_single_line_comment):
@@ -98,11 +264,11 @@ def tokenize_statements(
             if not in_string:
                 in_string = True
                 continue
-            if next_2chars == APOSTROPHE + APOSTROPHE:
+            if text[i + 1 : i + 3] == APOSTROPHE + APOSTROPHE:  # noqa: E203
                 # inside a string, this char is APOSTROPHE and next as well
                 # this means "escaped" apostrophe, skip it,
                 # as well as the next apostrophe
-                skip_next_n = 2
+                pos = i + 3
                 continue
             else:
                 # ending apostrophe
@@ -111,33 +277,25 @@ def tokenize_statements(
         # start of comment
         if char == SLASH and next_char == STAR and not in_string:
             if in_comment:
-                message = (
+                _report(
                     f"Error at line {line_no}: unterminated comment "
                     "('/*' encountered)"
                 )
-                if raise_errors:
-                    raise exc.DParsingError(message)
-                else:
-                    logger.error(message)
-            in_comment, skip_next_n = True, 1
+            in_comment, pos = True, i + 2
             continue
 
         # end of comment
         if char == STAR and next_char == SLASH and not in_string:
             if not in_comment:
-                message = (
+                _report(
                     f"Error at line {line_no}: termination of comment with no start "
                     "('*/' encountered)"
                 )
-                if raise_errors:
-                    raise exc.DParsingError(message)
-                else:
-                    logger.error(message)
-            in_comment, skip_next_n = False, 1
+            in_comment, pos = False, i + 2
 
         # start of single line comment
         if char == MINUS and next_char == MINUS:
-            in_single_line_comment, skip_next_n = True, 1
+            in_single_line_comment, pos = True, i + 2
             continue
 
         # in single line comment
@@ -175,13 +333,10 @@ def tokenize_statements(
             #      hence it is "semi" validating
             statement = text[prev_stmt_idx : i + 1].strip()  # noqa: E203
             if len(statement) == 0 or statement == separator:
-                message = (
-                    f"Error at line {line_no}: empty statement ({stmt_count=}, {i=})"
+                _report(
+                    f"Error at line {line_no}: empty statement"
+                    f" (stmt_count={stmt_count}, i={offset + i})"
                 )
-                if raise_errors:
-                    raise exc.DParsingError(message)
-                else:
-                    logger.error(message)
 
             # yield the statement and prep for next iteration
             yield Statement(type=StatementType.SQL, statement=statement)
@@ -189,24 +344,162 @@ def tokenize_statements(
             prev_stmt_idx = i + 1
 
     # sanity check
+    line_no += text.count(NEW_LINE, line_pos)
     if in_comment:
-        message = f"Error at line {line_no}: unterminated comment (expected to see: */)"
-        if raise_errors:
-            raise exc.DParsingError(message)
-        else:
-            logger.error(message)
+        _report(f"Error at line {line_no}: unterminated comment (expected to see: */)")
 
     if in_string:
-        message = f"Error at line {line_no}: unterminated string (expected to see: ')"
-        if raise_errors:
-            raise exc.DParsingError(message)
-        else:
-            logger.error(message)
+        _report(f"Error at line {line_no}: unterminated string (expected to see: ')")
 
     # if - at the end - we got unprocessed characters, yield last statement
-    try:
-        statement = text[prev_stmt_idx:].strip()
-        if len(statement) > 0:
-            yield Statement(type=StatementType.SQL, statement=statement)
-    except IndexError:
-        pass
+    statement = text[prev_stmt_idx:].strip()
+    if len(statement) > 0:
+        yield Statement(type=StatementType.SQL, statement=statement)
+
+
+def tokenize_file(
+    file: Path,
+    *,
+    encoding: str = "utf-8",
+    separator=SEMICOLON,
+    raise_errors: bool = True,
+    bteq: bool = False,
+) -> Iterator[Statement]:
+    """
+    Tokenizes SQL statements of a file.
+
+    Args:
+        file (Path): The file.
+        encoding (str, optional): Encoding of the file. Defaults to "utf-8".
+        separator (str, optional): The character used to separate statements.
+            Defaults to `SEMICOLON`.
+        bteq (bool, optional): Recognize BTEQ commands. Defaults to False.
+
+    Raises:
+        exc.DParsingError: See `tokenize_chunks`.
+
+    Returns:
+        Iterator[Statement]: The statements.
+
+    Behavior:
+    - Files up to `STREAMING_THRESHOLD` bytes are tokenized at once, so that
+    parsing errors are raised before any statement is used.
+    - Larger files are read in chunks, statements are yielded as they are read,
+    and parsing errors are raised once they are encountered; memory is bounded
+    by the longest statement.
+    """
+    if file.stat().st_size <= STREAMING_THRESHOLD:
+        text = file.read_text(encoding=encoding, errors="strict")
+        statements = tokenize_statements(
+            text, separator=separator, raise_errors=raise_errors, bteq=bteq
+        )
+        return iter(list(statements))
+
+    logger.debug(f"streaming statements of {file.as_posix()}")
+    return tokenize_chunks(
+        read_chunks(file, encoding=encoding),
+        separator=separator,
+        raise_errors=raise_errors,
+        bteq=bteq,
+    )
+
+
+def sql_statements(statements: Iterable[Statement]) -> Generator[str, None, None]:
+    """
+    Returns SQL statements to be sent to the database; BTEQ commands are
+    handled locally.
+
+    Args:
+        statements (Iterable[Statement]): The statements (see `tokenize_chunks`).
+
+    Yields:
+        str: SQL statements.
+
+    Raises:
+        exc.DParsingError: on a BTEQ command that can not be skipped.
+
+    Behavior:
+    - `.QUIT` and `.EXIT` end the script, the statements after them are skipped.
+    - Commands of the BTEQ session (`.LOGON`, `.LOGOFF`, ...), and `.SET` of
+    output formatting (`.SET WIDTH`, ...) are logged and skipped.
+    - `.IF ERRORCODE <> 0 THEN .QUIT` is skipped, too: the deployment stops
+    on any error, so the condition never holds.
+    - Any other command (`.GOTO`, `.LABEL`, `.RUN`, `.SET ERRORLEVEL`, other
+    conditions, ...) changes what BTEQ would execute, and is an error.
+    - SQL statements are sent one by one, they are not batched into
+    multi-statement requests: Teradata accepts DDL only as the last statement
+    of such a request.
+    """
+    for statement in statements:
+        if statement.type != StatementType.BTEQ:
+            yield statement.statement
+            continue
+        if (error := _bteq_command_error(statement.statement)) is not None:
+            raise exc.DParsingError(error)
+        match = _BTEQ_COMMAND.match(statement.statement)
+        if match and match.group(1).upper() in _BTEQ_END_COMMANDS:
+            logger.info(f"end of script: {statement.statement}")
+            return
+        logger.info(f"skipping BTEQ command: {statement.statement}")
+
+
+def _bteq_command_error(command: str) -> str | None:
+    """Returns why the BTEQ command can not be skipped by the deployment,
+    None if it can (see `sql_statements`)."""
+    if match := _BTEQ_COMMAND.match(command):
+        name, option = match.group(1).upper(), match.group(2).upper()
+        if name in _BTEQ_END_COMMANDS or name in _BTEQ_SESSION_COMMANDS:
+            return None
+        if name == "SET" and option in _BTEQ_FORMAT_OPTIONS:
+            return None
+    if _BTEQ_QUIT_ON_ERROR.fullmatch(command):
+        return None
+    return f"unsupported BTEQ command: {command}"
+
+
+def read_chunks(
+    file: Path,
+    *,
+    encoding: str = "utf-8",
+    chunk_size: int = _CHUNK_SIZE,
+) -> Generator[str, None, None]:
+    """
+    Reads a text file in chunks, for `tokenize_chunks`.
+
+    Args:
+        file (Path): The file.
+        encoding (str, optional): Encoding of the file. Defaults to "utf-8".
+        chunk_size (int, optional): Number of characters in one chunk.
+
+    Yields:
+        str: Parts of the file, in order.
+    """
+    with file.open(encoding=encoding, errors="strict") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+@functools.lru_cache(maxsize=8)
+def _scanner(separator: str, bteq: bool = False) -> re.Pattern:
+    """Returns regex that finds the next character that can change state
+    of the tokenizer (outside of single line comments); in BTEQ mode,
+    also a dot at start of a line (group "dot")."""
+    tokens = [SLASH + STAR, STAR + SLASH, MINUS + MINUS]
+    tokens += [APOSTROPHE, QUOTE, LBRACKET, RBRACKET]
+    if len(separator) == 1:
+        tokens.append(separator)
+    pattern = "|".join(re.escape(t) for t in tokens)
+    if bteq:
+        pattern = r"(?P<dot>(?:(?<=\n)|\A)[ \t]*\.)|" + pattern
+    return re.compile(pattern)
+
+
+# text with no statement: whitespace and comments only; each alternative
+# matches one way only, so that the regex does not backtrack
+_BLANK = re.compile(r"(?:\s|/\*(?:[^*]|\*(?!/))*\*/|--[^\n]*(?:\n|\Z))*")
+
+
+# in a single line comment, only the end of line and block comments matter
+_SINGLE_LINE_COMMENT_SCANNER = re.compile(
+    "|".join(re.escape(t) for t in (SLASH + STAR, STAR + SLASH, NEW_LINE))
+)
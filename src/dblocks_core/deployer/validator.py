@@ -0,0 +1,178 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+from attrs import define, field, frozen
+
+from dblocks_core import exc, tagger
+from dblocks_core.config.config import logger
+from dblocks_core.deployer import tokenizer
+from dblocks_core.writer import fsystem
+
+# below this number of files, the validation runs in the calling process
+_MIN_FILES_FOR_POOL = 64
+
+
+@frozen
+class FileReport:
+    """
+    Result of validation of one file.
+
+    Attributes:
+        file (Path): the file
+        statements (int): number of statements in the file
+        errors (tuple[str, ...]): parsing errors (with line numbers)
+    """
+
+    file: Path
+    statements: int
+    errors: tuple[str, ...] = field(default=())
+
+
+@define
+class ValidationReport:
+    """
+    Result of validation of a set of files.
+
+    Attributes:
+        files (list[FileReport]): reports of the files, in order of the input
+    """
+
+    files: list[FileReport] = field(factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        return all(not f.errors for f in self.files)
+
+    @property
+    def statements(self) -> int:
+        """Total number of statements."""
+        return sum(f.statements for f in self.files)
+
+    @property
+    def errors(self) -> list[str]:
+        """All errors, each prefixed by name of the file."""
+        return [f"{f.file.as_posix()}: {err}" for f in self.files for err in f.errors]
+
+    def statement_counts(self) -> dict[Path, int]:
+        """Returns number of statements for each file."""
+        return {f.file: f.statements for f in self.files}
+
+
+def validate_files(
+    files: Iterable[tuple[Path, bool]],
+    *,
+    workers: int | None = None,
+    encoding: str = "utf-8",
+    separator: str = tokenizer.SEMICOLON,
+    allow_empty: bool = False,
+    variables: dict[str, str] | None = None,
+) -> ValidationReport:
+    """
+    Tokenizes files in a process pool, and collects all parsing errors.
+
+    Args:
+        files (Iterable[tuple[Path, bool]]): (file, tokenize) pairs; files that are
+            not to be tokenized (stored procedures) count as one statement.
+        workers (int | None, optional): Number of processes. Defaults to None
+            (number of processors).
+        encoding (str, optional): Encoding of the files. Defaults to "utf-8".
+        separator (str, optional): The separator of statements.
+        allow_empty (bool, optional): Do not report empty files (or files with
+            whitespace only) as errors. Defaults to False.
+        variables (dict[str, str] | None, optional): Tagging variables of the
+            environment; if given, placeholders of unknown variables are
+            reported (see `Tagger.expand_statement`). Defaults to None.
+
+    Returns:
+        ValidationReport: Statement counts and errors of all files.
+
+    Behavior:
+    - Files are read in chunks (see `tokenizer.read_chunks`), so that memory of
+      each process is bounded by the longest statement.
+    - Errors do not stop the validation, all errors of all files are reported;
+      files that can not be read (or decoded) are reported as errors, too.
+    - Small sets of files are validated in the calling process.
+    - Empty files are reported as errors (unless allowed), the same way
+      the deployment rejects them.
+    - BTEQ scripts (see `fsystem.GENERIC_BTEQ_SUFFIX`) are tokenized in BTEQ mode,
+      BTEQ commands count as statements.
+    - With `variables`, each statement is expanded in strict mode, the same way
+      it is expanded by the deployment.
+    """
+    files = list(files)
+    args = [
+        (file, tokenize, encoding, separator, allow_empty, variables)
+        for file, tokenize in files
+    ]
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"validating {len(files)} files")
+
+    if workers == 1 or len(files) < _MIN_FILES_FOR_POOL:
+        reports = [_validate_file(a) for a in args]
+    else:
+        chunksize = max(1, len(args) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reports = list(pool.map(_validate_file, args, chunksize=chunksize))
+
+    report = ValidationReport(files=reports)
+    for err in report.errors:
+        logger.error(err)
+    logger.info(
+        f"validated {len(files)} files, {report.statements} statements, "
+        f"{len(report.errors)} errors"
+    )
+    return report
+
+
+def _validate_file(
+    args: tuple[Path, bool, str, str, bool, dict[str, str] | None],
+) -> FileReport:
+    # runs in a worker process, hence one argument (see validate_files)
+    file, tokenize, encoding, separator, allow_empty, variables = args
+    errors: list[str] = []
+    statements = 0
+    is_empty = True
+    tgr = tagger.Tagger(variables, []) if variables is not None else None
+
+    def _expand(statement: str):
+        try:
+            tgr.expand_statement(statement, strict=True)  # type: ignore
+        except exc.DConfigError as err:
+            if err.message not in errors:
+                errors.append(err.message)
+
+    def _chunks():
+        nonlocal is_empty
+        for chunk in tokenizer.read_chunks(file, encoding=encoding):
+            is_empty = is_empty and not chunk.strip()
+            yield chunk
+
+    try:
+        if tokenize:
+            for statement in tokenizer.tokenize_chunks(
+                _chunks(),
+                separator=separator,
+                on_error=errors.append,
+                bteq=file.suffix.lower() == fsystem.GENERIC_BTEQ_SUFFIX,
+            ):
+                statements += 1
+                if tgr is not None and statement.type == tokenizer.StatementType.SQL:
+                    _expand(statement.statement)
+        elif tgr is not None:
+            # deployed as one statement, expanded as a whole
+            statements = 1
+            _expand("".join(_chunks()))
+        else:
+            # deployed as one statement, only check that it is not empty
+            statements = 1
+            for _ in _chunks():
+                if not is_empty:
+                    break
+    except (OSError, UnicodeDecodeError) as err:
+        errors.append(f"can not read the file: {err}")
+    else:
+        if is_empty and not allow_empty:
+            errors.append("empty file")
+    return FileReport(file=file, statements=statements, errors=tuple(errors))
@@ -1,11 +1,14 @@
 import os
 import shutil
 import subprocess
+import threading
+import weakref
 from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from tempfile import TemporaryFile
+from typing import Iterable, Iterator
 
 from attrs import frozen
 
@@ -16,6 +19,7 @@ GIT = "git"
 INIT = "init"
 CHECKOUT = "checkout"
 ADD = "add"
+LS_FILES = "ls-files"
 COMMIT = "commit"
 LOG = "log"
 STATUS = "status"
@@ -30,6 +34,27 @@ _DTTM_MASK = "%Y-%m-%d %H:%M:%S"
 _SW_NAME_STATUS = "--name-status"
 _FMT_BRANCH_NAME = '--format="%(refname:short)"'  # no asterisk before active branch
 
+# max number of paths passed to one git add command (length of the command line)
+_STAGE_CHUNK_SIZE = 500
+
+# size of chunks read from output of a streamed git command
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# commands that do not change refs of the repository; after any other command,
+# cached refs are forgotten
+_REF_SAFE_CMDS = {
+    ADD,
+    LOG,
+    STATUS,
+    DIFF_TREE,
+    DIFF,
+    "show",
+    "merge-base",
+    "rev-parse",
+    "cat-file",
+    LS_FILES,
+}
+
 
 # There are three different types of states that are shown using this format,
 # and each one uses the XY syntax differently:
@@ -218,11 +243,61 @@ def cwd(to_dir: Path):
         os.chdir(old_dir)
 
 
+class _CatFile:
+    """
+    Long-lived `git cat-file --batch-check` process, used to resolve revisions
+    (branches, tags, HEAD, ...) to object names without spawning a process
+    for each lookup.
+
+    The process reads refs on each lookup, so it sees commits and checkouts
+    made by other git commands. It is stopped by `close`, when the object is
+    garbage collected, or when the interpreter exits.
+    """
+
+    def __init__(self, git_exec: str, repo_dir: Path):
+        self._lock = threading.Lock()
+        self._process = subprocess.Popen(
+            [git_exec, "cat-file", "--batch-check"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=repo_dir,
+            text=True,
+            encoding="utf-8",
+            errors="surrogateescape",
+        )
+        self._finalizer = weakref.finalize(self, _stop_process, self._process)
+
+    def resolve(self, revision: str) -> str | None:
+        """Returns name of the object, None if the revision does not exist."""
+        with self._lock:
+            self._process.stdin.write(revision + "\n")  # type: ignore
+            self._process.stdin.flush()  # type: ignore
+            line = self._process.stdout.readline().strip()  # type: ignore
+        # <sha> <type> <size>, or <revision> missing / ambiguous
+        name, _, kind = line.partition(" ")
+        if not kind or kind.endswith(("missing", "ambiguous")):
+            return None
+        return name
+
+    def close(self):
+        with self._lock:
+            self._finalizer()
+
+
+def _stop_process(process: subprocess.Popen):
+    # must not refer to the _CatFile, see weakref.finalize
+    if process.poll() is None:
+        process.stdin.close()  # type: ignore
+        process.wait()
+
+
 class Repo:
     def __init__(
         self,
         repo_dir: Path | str,
         raise_on_error: bool = True,
+        *,
+        persistent: bool = False,
     ):
         """
         Represents a Git repository and provides methods for interacting with it.
@@ -231,6 +306,9 @@ class Repo:
             repo_dir (Path | str): The path to the root directory of the repository.
             raise_on_error (bool, optional): Whether to raise exceptions on errors.
                 Defaults to True.
+            persistent (bool, optional): Resolve revisions using a long-lived
+                `git cat-file --batch-check` process, instead of a new process
+                for each lookup. Defaults to False.
 
         Attributes:
             repo_dir (Path): The resolved Path object representing the repository's
@@ -247,6 +325,10 @@ class Repo:
         - Initializes the repository directory and the error-handling mode.
         - Locates the Git executable using `find_git_exec()`. Logs a warning if Git is
           not found.
+        - Results of ref lookups (current branch, revision -> commit) are cached,
+          the cache is cleared after each command that can change refs.
+        - With a persistent repo, changes on a commit are cached as well
+          (see `changes_on_commit`).
         """
 
         if isinstance(repo_dir, str):
@@ -261,6 +343,14 @@ class Repo:
         if self.git_exec is None:
             logger.warning("git not found")
 
+        self.persistent = persistent
+        self._cat_file: _CatFile | None = None
+        self._ref_cache: dict[str, str | None] = {}
+        self._current_branch: str | None = None
+        self._ref_cache_lock = threading.Lock()
+        # commit sha => changes on the commit (commits do not change)
+        self._commit_changes: dict[str, list[GitChangedPath]] = {}
+
     def init(self) -> GitResult:
         """
         Initializes a new Git repository in the directory associated with the Repo
@@ -290,12 +380,17 @@ class Repo:
             str: The name of the current branch.
         """
 
+        if self._current_branch is not None:
+            return self._current_branch
+
         cmd = [BRANCH, "--show-current"]
         result = self.run_git_cmd(*cmd)
-        branch = result.out.splitlines()[0].strip()
+        lines = result.out.splitlines()
+        branch = lines[0].strip() if lines else ""
         if len(branch) == 0:
             cmd_str = "git " + " ".join(cmd)
             raise exc.DGitCommandError(f"failed to get current branch: {cmd_str}")
+        self._current_branch = branch
         return branch
 
     def get_merge_base(
@@ -345,30 +440,14 @@ class Repo:
         rename_pct_simillarity: int = 100,
     ) -> list[GitChangedPath]:
         """
-        This method compares two commits and returns a list of changed files between them.
-        Behavior:
+        Compares two commits and returns a list of changed files between them.
 
-            - Runs git diff --name-status <base_commit> <second_commit> to get the file changes.
-            - Parses each output line, which consists of:
-                - A single-character status code (M, A, D, etc.).
-                - A tab (\t).
-                - The file path.
-            - Uses _status_on_index(status_) to map Git’s status code to FileStatus.
-            - Converts the file path into Path objects (relative and absolute).
-            - Returns a list of GitChangedPath objects with:
-                - change: The type of modification.
-                - rel_path: The file path relative to the repo.
-                - abs_path: The absolute file path.
-
-        Error Handling:
-            Raises exc.DGitError if a line does not match the expected format.
-            Raises exc.DGitError if an unknown status code is encountered.
-
-        This ensures that the method correctly reports file changes between two commits.
+        See `iter_changes_between_commits`, which yields the changes as they
+        are read from git; prefer it for large diffs.
 
         Args:
-            base_commit (str): the case commit - this is the commit we compare to (first commit)
-            second_commit (str): second commit, which is the end of the change tree
+            baseline_commit (str): the base commit - this is the commit we compare to
+            last_commit (str): second commit, which is the end of the change tree
 
         Raises:
             exc.DGitError: in case there was problem with parsing git output
@@ -376,80 +455,94 @@ class Repo:
         Returns:
             list[GitChangedPath]: list of changes
         """
-        result = self.run_git_cmd(
+        return list(
+            self.iter_changes_between_commits(
+                baseline_commit=baseline_commit,
+                last_commit=last_commit,
+                rename_pct_simillarity=rename_pct_simillarity,
+            )
+        )
+
+    def iter_changes_between_commits(
+        self,
+        *,
+        baseline_commit: str,
+        last_commit: str,
+        rename_pct_simillarity: int = 100,
+    ) -> Iterator[GitChangedPath]:
+        """
+        Compares two commits and yields changed files between them, as they
+        are read from the output of git.
+
+        Behavior:
+            - Runs git diff --name-status -z <baseline_commit> <last_commit>; the
+              output is read in chunks, so the memory footprint does not depend
+              on size of the diff.
+            - Fields of the output are delimited by NUL, so that paths containing
+              tabs, quotes or newlines are returned verbatim. Each record
+              consists of:
+                - the status (M, A, D, etc.; R and C are followed by simillarity
+                  in percent, for example R100),
+                - the file path; renames and copies have two paths (from, to).
+            - Uses _status_on_index(status_) to map Git's status code to FileStatus.
+
+        Args:
+            baseline_commit (str): the base commit - this is the commit we compare to
+            last_commit (str): second commit, which is the end of the change tree
+            rename_pct_simillarity (int): a delete/add pair is a rename, if more
+                than this percentage of the file has not changed (-M<n>%)
+
+        Raises:
+            exc.DGitError: in case there was problem with parsing git output
+
+        Yields:
+            GitChangedPath: the change
+        """
+        chunks = self.stream_git_cmd(
             DIFF,
             _SW_NAME_STATUS,
+            "-z",
             f"-M{rename_pct_simillarity}%",
             baseline_commit,
             last_commit,
         )
-        output_lines = result.out.splitlines()
-        changes = []
-        for line in output_lines:
-            # git diff --name-status uses tab as delimiter (second character)
-            # status is the first part, see the docs - --diff-filter=[(A|C|D|M|R|T|U|X|B)...[*]]
-            # https://git-scm.com/docs/diff-options
-            # for renames (R) we have a simillarity in percent after the status
-            # --find-renames[=<n>] / -M<n>
-            #       For example, -M90% means Git should consider a delete/add pair to be a rename
-            #       if more than 90% of the file hasn’t changed.
-            #       The default similarity index is 50%.
-            #       To limit detection to exact renames, use -M100%
-            # FIXME: we have very simillar code in changes_on_commit, this should be refactored
-            # FIXME: changes_on_commit contains bug (renames)
-
-            simillarity: int | None = None
-            rename_from_rel_path: Path | None = None
-            rename_from_abs_path: Path | None = None
-
-            parts = line.split("\t")
-            status_, file_, *rest = parts
-
-            # sanity check
-            if len(parts) != 2:
-                if len(parts) > 3:
-                    raise exc.DGitError(
-                        f"unexpected tab in line, please raise an issue: {repr(line)=}"
-                    )
-                if status_[0] != "R":
-                    raise exc.DGitError(
-                        f"expected rename, got something else, please raise an issue: {repr(line)=}"
-                    )
-
-                # we know that the action is labeled as rename
-                # status now contains string in form of Rxxx, where xxx is an int (simillarity)
-                try:
-                    simillarity = int(status_[1:])
-                    rename_from_rel_path = Path(file_)
-                    rename_from_abs_path = self.repo_dir / file_
-                    rel_path = Path(rest[0])
-                    abs_path = self.repo_dir / rest[0]
-                    status_ = status_[0]
-                except Exception as err:
-                    raise exc.DGitError(
-                        f"failed to get rename details, please raise an issue: {repr(line)=}\nerror: {err}"
-                    )
-            else:
-                rel_path = Path(file_)
-                abs_path = self.repo_dir / rel_path
-
-            action = _status_on_index(status_)
-
-            if action == FileStatus.UNKNOWN:
-                err = f"unknown modification: {repr(line)}"
-                raise exc.DGitError(err)
-
-            changes.append(
-                GitChangedPath(
-                    change=action,
-                    rel_path=rel_path,
-                    abs_path=abs_path,
-                    rename_simillarity=simillarity,
-                    rename_from_abs_path=rename_from_abs_path,
-                    rename_from_rel_path=rename_from_rel_path,
-                )
-            )
-        return changes
+        for fields in _parse_name_status_z(chunks):
+            yield self._change_from_fields(fields)
+
+    def _change_from_fields(self, fields: list[str]) -> GitChangedPath:
+        """Creates the change from fields of one record of git diff --name-status -z."""
+        status_, *paths = fields
+        simillarity: int | None = None
+        rename_from_rel_path: Path | None = None
+        rename_from_abs_path: Path | None = None
+
+        # renames (and copies) have the simillarity after the status, and two paths
+        # --find-renames[=<n>] / -M<n>
+        #       For example, -M90% means Git should consider a delete/add pair to be a rename
+        #       if more than 90% of the file hasn't changed.
+        if len(paths) == 2:
+            try:
+                simillarity = int(status_[1:])
+            except ValueError:
+                raise exc.DGitError(
+                    f"failed to get rename details, please raise an issue: {fields=}"
+                ) from None
+            rename_from_rel_path = Path(paths[0])
+            rename_from_abs_path = self.repo_dir / paths[0]
+            status_ = status_[0]
+
+        action = _status_on_index(status_)
+        if action == FileStatus.UNKNOWN:
+            raise exc.DGitError(f"unknown modification: {fields=}")
+
+        return GitChangedPath(
+            change=action,
+            rel_path=Path(paths[-1]),
+            abs_path=self.repo_dir / paths[-1],
+            rename_simillarity=simillarity,
+            rename_from_abs_path=rename_from_abs_path,
+            rename_from_rel_path=rename_from_rel_path,
+        )
 
     # FIXME: this needs refactoring, and it does not handle renames correctly!
     def changes_on_commit(self, *, commit: str | None = None) -> list[GitChangedPath]:
@@ -474,12 +567,23 @@ class Repo:
                 - rel_path: The relative path of the file in the repo.
                 - abs_path: The absolute file path.
 
+            - With a persistent repo, changes on a commit are cached by sha
+                of the commit, so that repeated calls do not run git again.
+                Changes in the working directory are never cached.
+
         Raises:
             exc.DGitError if an unknown modification status is encountered.
 
         Returns:
             list[GitChangedPath]: list of changes
         """
+        sha = None
+        if commit is not None and self.persistent:
+            sha = self.resolve_revision(commit)
+            with self._ref_cache_lock:
+                cached = self._commit_changes.get(sha)  # type: ignore
+            if cached is not None:
+                return list(cached)
 
         if commit is None:
             result = self.run_git_cmd(STATUS, _SW_PORCELAIN)
@@ -509,8 +613,14 @@ class Repo:
                     change=action,
                     rel_path=rel_path,
                     abs_path=abs_path,
+                    rename_from_rel_path=None,
+                    rename_from_abs_path=None,
+                    rename_simillarity=None,
                 )
             )
+        if sha is not None:
+            with self._ref_cache_lock:
+                self._commit_changes[sha] = list(changes)
         return changes
 
     def commit(self, message: str | None, *, amend=False) -> GitResult:
@@ -620,6 +730,57 @@ class Repo:
                 raise TypeError(f"expected str or Path, got: {type(f)}")
         return rslt
 
+    def stage(
+        self,
+        paths: Iterable[Path | str],
+        *,
+        chunk_size: int = _STAGE_CHUNK_SIZE,
+    ) -> list[GitResult]:
+        """
+        Stages the paths given, including deletions, without scanning the worktree.
+
+        Args:
+            paths (Iterable[Path | str]): Paths to stage; relative to the root
+                of the repository, or absolute.
+            chunk_size (int, optional): Max number of paths in one git command.
+
+        Returns:
+            list[GitResult]: Results of the `git add` commands.
+
+        Behavior:
+        - Runs `git add --all -- <paths>`, so that deleted files are staged as well.
+        - Paths that do not exist are replaced by the tracked files they match
+          (see `git ls-files`); paths that were deleted and never tracked are
+          skipped, otherwise `git add` would fail on them.
+        - Paths are passed in chunks, so that the command line does not grow
+          too long.
+        """
+        paths = {p.as_posix() if isinstance(p, Path) else p for p in paths}
+        missing = [p for p in paths if not os.path.lexists(self.repo_dir / p)]
+        paths.difference_update(missing)
+        for start in range(0, len(missing), chunk_size):
+            chunk = missing[start : start + chunk_size]
+            tracked = self.run_git_cmd(LS_FILES, "-z", "--", *chunk).out
+            paths.update(p for p in tracked.split("\0") if p)
+
+        paths_ = sorted(paths)
+        logger.debug(f"staging {len(paths_)} paths")
+        rslt = []
+        for start in range(0, len(paths_), chunk_size):
+            chunk = paths_[start : start + chunk_size]
+            rslt.append(self.run_git_cmd(ADD, _SW_ALL, "--", *chunk))
+        return rslt
+
+    def has_staged_changes(self) -> bool:
+        """
+        Checks if there are staged changes, without scanning the worktree.
+
+        Returns:
+            bool: True if the index differs from HEAD.
+        """
+        rslt = self.run_git_cmd(DIFF, "--cached", "--name-only")
+        return rslt.out != ""
+
     def checkout(
         self,
         branch: str,
@@ -718,23 +879,84 @@ class Repo:
             str: The SHA of the last commit.
         """
 
-        # git show --pretty=format:"%H" --no-patch develop
-        cmd = ["show", "--pretty=format:%H", "--no-patch"]
-        if branch:
-            cmd.append(branch)
-        result = self.run_git_cmd(*cmd)
-        commit = result.out.splitlines()[0].strip()
-        if len(commit) == 0:
-            raise exc.DGitCommandError(
-                "failed to get last commit: git " + " ".join(cmd)
-            )
+        revision = branch or "HEAD"
+        commit = self.resolve_revision(revision)
+        if commit is None:
+            raise exc.DGitCommandError(f"failed to get last commit: {revision}")
         return commit
 
+    def resolve_revision(self, revision: str) -> str | None:
+        """Get the SHA of the commit a revision (branch, tag, HEAD, ...) points to.
+
+        Args:
+            revision (str): The revision.
+
+        Returns:
+            str | None: The SHA of the commit, None if the revision does not exist.
+
+        Behavior:
+        - Results are cached until a command that can change refs is executed.
+        - With a persistent repo, the revision is resolved by the long-lived
+          `git cat-file --batch-check` process, otherwise by `git rev-parse`.
+        """
+        with self._ref_cache_lock:
+            try:
+                return self._ref_cache[revision]
+            except KeyError:
+                pass
+
+        commit_revision = f"{revision}^{{commit}}"
+        if self.persistent:
+            with self._ref_cache_lock:
+                if self._cat_file is None:
+                    if not self.git_exec:
+                        raise exc.DGitNotFound("git not found")
+                    self._cat_file = _CatFile(self.git_exec, self.repo_dir)
+                cat_file = self._cat_file
+            commit = cat_file.resolve(commit_revision)
+        else:
+            raises, self.raise_on_error = self.raise_on_error, False
+            try:
+                rslt = self.run_git_cmd("rev-parse", "--verify", "-q", commit_revision)
+            finally:
+                self.raise_on_error = raises
+            commit = rslt.out.strip() if rslt.code == 0 else None
+
+        with self._ref_cache_lock:
+            self._ref_cache[revision] = commit
+        return commit
+
+    def close(self):
+        """Stops the long-lived git process, if there is one."""
+        with self._ref_cache_lock:
+            cat_file, self._cat_file = self._cat_file, None
+        if cat_file is not None:
+            cat_file.close()
+
+    def _forget_refs(self):
+        """Clears cached refs (the long-lived process reads refs on each lookup,
+        so it can be kept)."""
+        with self._ref_cache_lock:
+            self._ref_cache.clear()
+            self._current_branch = None
+
     def is_commit_on_branch(self, branch: str, commit: str) -> bool:
         branches_with_commit = self.get_branches_with_commit(commit)
         logger.info(branches_with_commit)
         return branch in branches_with_commit
 
+    def git_dir(self) -> Path:
+        """Returns absolute path of the git directory of the repository (.git).
+
+        Raises:
+            DGitCommandError: If the path cannot be retrieved.
+        """
+        result = self.run_git_cmd("rev-parse", "--absolute-git-dir")
+        git_dir = result.out.strip()
+        if result.code != 0 or not git_dir:
+            raise exc.DGitCommandError(f"failed to get git directory: {result.err}")
+        return Path(git_dir)
+
     def last_commit_date(self) -> datetime | None:
         """Get the SHA of the last commit on a specified branch.
 
@@ -756,6 +978,58 @@ class Repo:
             logger.error(err)
             return None
 
+    def stream_git_cmd(self, *args) -> Iterator[bytes]:
+        """
+        Executes a Git command within the repository's directory, and yields
+        its output in chunks, as it is produced.
+
+        Args:
+            *args: Positional arguments representing the Git command and its parameters.
+
+        Raises:
+            exc.DGitNotFound: If the Git executable is not found.
+            exc.DGitCommandError: If the command fails (non-zero return code) and
+            `raise_on_error` is True; raised after the whole output was read.
+
+        Yields:
+            bytes: chunks of the standard output
+
+        Behavior:
+        - Standard error is redirected to a temporary file, so that the command
+          can not block on a full pipe.
+        - If the consumer stops early, the pipe is closed and the command ends.
+        """
+        if not self.git_exec:
+            raise exc.DGitNotFound("git not found")
+        if _may_change_refs(args):
+            self._forget_refs()
+
+        logger.debug(f"streaming git with args: {args}")
+        with TemporaryFile() as stderr_file:
+            state = subprocess.Popen(
+                [self.git_exec, *args],
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                cwd=self.repo_dir,
+            )
+            try:
+                while chunk := state.stdout.read1(_STREAM_CHUNK_SIZE):  # type: ignore
+                    yield chunk
+            finally:
+                state.stdout.close()  # type: ignore
+                return_code = state.wait()
+
+            logger.debug(f"return_code: {return_code}")
+            if return_code != 0 and self.raise_on_error:
+                stderr_file.seek(0)
+                err = stderr_file.read().decode("utf-8", errors="surrogateescape")
+                msg = (
+                    f"git command failed: {args}"
+                    f"\n -retcode: {return_code}"
+                    f"\n -stderr: {repr(err)}"
+                )
+                raise exc.DGitCommandError(msg)
+
     def run_git_cmd(self, *args) -> GitResult:
         """
         Executes a Git command within the repository's directory and returns the result.
@@ -774,8 +1048,8 @@ class Repo:
 
         Behavior:
         - Ensures the Git executable is available; raises an error if it is not.
-        - Changes the current working directory to the repository's root before
-          executing the command.
+        - Runs the command in the repository's root (the current working directory
+          of the process is not changed, so the method is thread safe).
         - Runs the Git command using `subprocess.Popen` and captures its standard output
           and error streams.
         - Decodes the output and error messages using UTF-8 with `surrogateescape` to
@@ -788,44 +1062,89 @@ class Repo:
         if not self.git_exec:
             raise exc.DGitNotFound("git not found")
 
-        with cwd(self.repo_dir):
-            # prep the run
-            args_ = [self.git_exec, *args]
-            logger.debug(f"running git with args: {args}")
-            state = subprocess.Popen(
-                args_, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        # the command can move refs (commit, checkout, ...)
+        if _may_change_refs(args):
+            self._forget_refs()
+
+        # prep the run; the command runs in the repository's directory, we do not
+        # change cwd of the process, so that the repo can be used from more threads
+        args_ = [self.git_exec, *args]
+        logger.debug(f"running git with args: {args}")
+        state = subprocess.Popen(
+            args_,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=self.repo_dir,
+        )
+
+        # execute and read the state
+        stdout, stderr = state.communicate()
+        out = stdout.decode("utf-8", errors="surrogateescape")
+        err = stderr.decode("utf-8", errors="surrogateescape")
+        return_code = state.returncode
+
+        # log the results
+        logger.debug(f"return_code: {return_code}")
+        logger.debug(f"{len(out)} characters on stdout: {repr(out[:40])}")
+        logger.debug(f"{len(err)} characters on stderr: {repr(err[:40])}")
+        if return_code != 0 and self.raise_on_error:
+            msg = (
+                f"git command failed: {args}"
+                f"\n -retcode: {return_code}"
+                f"\n -stdout: {repr(out)}"
+                f"\n -stderr: {repr(err)}"
             )
+            raise exc.DGitCommandError(msg)
+        return GitResult(
+            out=out,
+            err=err,
+            code=return_code,
+            args=args,  # type: ignore
+        )
 
-            # execute and read the state
-            stdout, stderr = state.communicate()
-            out = stdout.decode("utf-8", errors="surrogateescape")
-            err = stderr.decode("utf-8", errors="surrogateescape")
-            return_code = state.returncode
 
-            # log the results
-            logger.debug(f"return_code: {return_code}")
-            logger.debug(f"{len(out)} characters on stdout: {repr(out[:40])}")
-            logger.debug(f"{len(err)} characters on stderr: {repr(err[:40])}")
-            if return_code != 0 and self.raise_on_error:
-                msg = (
-                    f"git command failed: {args}"
-                    f"\n -retcode: {return_code}"
-                    f"\n -stdout: {repr(out)}"
-                    f"\n -stderr: {repr(err)}"
-                )
-                raise exc.DGitCommandError(msg)
-            return GitResult(
-                out=out,
-                err=err,
-                code=return_code,
-                args=args,  # type: ignore
-            )
+def _parse_name_status_z(chunks: Iterable[bytes]) -> Iterator[list[str]]:
+    """
+    Parses output of git diff --name-status -z, read in chunks.
+
+    Args:
+        chunks (Iterable[bytes]): the output; records can span more chunks
+
+    Raises:
+        exc.DGitError: if the output ends in the middle of a record
+
+    Yields:
+        list[str]: fields of one record - [status, path], or [status, from, to]
+            for renames and copies
+    """
+    pending = b""
+    fields: list[str] = []
+    for chunk in chunks:
+        *tokens, pending = (pending + chunk).split(b"\0")
+        for token in tokens:
+            fields.append(token.decode("utf-8", errors="surrogateescape"))
+            expected = 3 if fields[0][:1] in ("R", "C") else 2
+            if len(fields) == expected:
+                yield fields
+                fields = []
+    if pending or fields:
+        raise exc.DGitError(f"unexpected end of git output: {fields=}, {pending=}")
+
+
+def _may_change_refs(args) -> bool:
+    """Returns False if the git command surely does not change refs."""
+    if not args:
+        return True
+    if args[0] == BRANCH:
+        return not ("--show-current" in args or "--contains" in args)
+    return args[0] not in _REF_SAFE_CMDS
 
 
 def repo_factory(
     *,
     in_dir: str | Path | None = None,
     raise_on_error: bool = True,
+    persistent: bool = False,
 ) -> Repo | None:
     """
     Creates a Repo instance for the current working directory if it is within a Git
@@ -844,7 +1163,7 @@ def repo_factory(
     root = find_repo_root(in_dir=in_dir)
     if root is None:
         return None
-    return Repo(root, raise_on_error=raise_on_error)
+    return Repo(root, raise_on_error=raise_on_error, persistent=persistent)
 
 
 def _status_on_index(status_str: str) -> FileStatus:
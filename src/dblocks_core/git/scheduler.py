@@ -0,0 +1,124 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from time import monotonic
+from typing import Iterable
+
+from dblocks_core.config.config import logger
+from dblocks_core.git.git import Repo
+
+
+class CommitScheduler:
+    def __init__(
+        self,
+        repo: Repo,
+        *,
+        message_prefix: str,
+        max_databases: int = 1,
+        max_seconds: float | None = None,
+    ):
+        """
+        Groups changes of several databases into one commit, and commits them
+        in a background thread.
+
+        Args:
+            repo (Repo): The repository.
+            message_prefix (str): Prefix of commit messages.
+            max_databases (int, optional): Commit after this many databases.
+                Defaults to 1 (one commit per database).
+            max_seconds (float | None, optional): Commit if the oldest pending
+                change is older than this. Defaults to None (no time limit).
+
+        Behavior:
+        - Paths to commit are given explicitly (see `database_done`), so that
+          git does not have to scan the worktree.
+        - Commits are done one by one, in the order they were scheduled.
+        - Errors of the background thread are raised on the next call
+          of `database_done`, `flush`, or `close`.
+        """
+        self.repo = repo
+        self.message_prefix = message_prefix
+        self.max_databases = max_databases
+        self.max_seconds = max_seconds
+        self._databases: list[str] = []
+        self._paths: set[Path] = set()
+        self._pending_since: float | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dbe-git")
+        self._futures: list[Future] = []
+        self._commits = 0
+        self._lock = threading.Lock()
+
+    @property
+    def commits(self) -> int:
+        """Number of commits done so far."""
+        with self._lock:
+            return self._commits
+
+    def database_done(self, database_name: str, paths: Iterable[Path]):
+        """
+        Schedules changes of a database; commits them if a limit was reached.
+
+        Args:
+            database_name (str): Name of the database (used in the commit message).
+            paths (Iterable[Path]): Paths changed or deleted by the extraction.
+        """
+        self._raise_errors()
+        if self._pending_since is None:
+            self._pending_since = monotonic()
+        self._databases.append(database_name)
+        self._paths.update(paths)
+
+        elapsed = monotonic() - self._pending_since
+        if len(self._databases) >= self.max_databases or (
+            self.max_seconds is not None and elapsed >= self.max_seconds
+        ):
+            self.flush()
+
+    def flush(self, message: str | None = None):
+        """
+        Commits all pending changes, in the background.
+
+        Args:
+            message (str | None, optional): Commit message; by default, it is made
+                of the prefix and names of the databases.
+        """
+        self._raise_errors()
+        if message is None and self._databases:
+            message = f"{self.message_prefix}: {self._databases[0]}"
+            if len(self._databases) > 1:
+                message += f" .. {self._databases[-1]} ({len(self._databases)} dbs)"
+        paths, self._paths = self._paths, set()
+        self._databases, self._pending_since = [], None
+        if paths:
+            self._futures.append(
+                self._executor.submit(self._commit, paths, message or self.message_prefix)
+            )
+
+    def close(self, message: str | None = None):
+        """
+        Commits all pending changes, and waits until all commits are done.
+
+        Args:
+            message (str | None, optional): Message of the last commit.
+        """
+        try:
+            self.flush(message)
+            for future in self._futures:
+                future.result()
+            self._futures = []
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def _commit(self, paths: set[Path], message: str):
+        self.repo.stage(paths)
+        if not self.repo.has_staged_changes():
+            logger.debug(f"nothing to commit: {message}")
+            return
+        self.repo.commit(message)
+        with self._lock:
+            self._commits += 1
+
+    def _raise_errors(self):
+        for future in [f for f in self._futures if f.done()]:
+            self._futures.remove(future)
+            future.result()
@@ -49,6 +49,25 @@ def _assert_not_empty_string(self, attribute, value):
         raise (err)
 
 
+def _assert_at_least(minimum: int):
+    """
+    Returns a validator of integers that are at least `minimum`.
+
+    Args:
+        minimum (int): The smallest allowed value.
+    """
+
+    def _assert(self, attribute, value):
+        if not isinstance(value, int) or value < minimum:
+            err = ValueError(
+                f"{attribute.name}: expected int >= {minimum}, got: {value}"
+            )
+            logger.error(err)
+            raise err
+
+    return _assert
+
+
 def _assert_lcase_keys(self, attribute, value):
     """
     Validates that all keys in the dictionary are lowercase strings.
@@ -145,6 +164,26 @@ class WriterParameters:
     errors: str = field(default="strict")
 
 
+@define
+class PoolParameters:
+    """
+    Connection pool of the environment.
+
+    Attributes:
+        size (int): number of connections kept in the pool
+        max_overflow (int): number of connections that can be opened above the size
+        recycle (int): recycle connections older than this (seconds), -1 means never
+        pre_ping (bool): test each connection when it is checked out of the pool
+        warm_up (int): number of connections opened (concurrently) on startup
+    """
+
+    size: int = field(default=1, validator=_assert_at_least(1))
+    max_overflow: int = field(default=1, validator=_assert_at_least(0))
+    recycle: int = field(default=-1, validator=_assert_at_least(-1))
+    pre_ping: bool = field(default=False)
+    warm_up: int = field(default=0, validator=_assert_at_least(0))
+
+
 @define
 class EnvironParameters:
     writer: WriterParameters
@@ -167,6 +206,7 @@ class EnvironParameters:
     )
     tagging_strip_db_with_no_rules: bool = field(default=True)
     git_branch: str | None = field(default=None)
+    pool: PoolParameters = field(factory=PoolParameters)
 
 
 @define
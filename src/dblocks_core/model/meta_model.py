@@ -53,6 +53,9 @@ GENERIC_SQL = "SQL"
 GENERIC_BTEQ = "BTEQ"
 DEPLOYABLE_TYPES = [*MANAGED_TYPES, GENERIC_SQL, GENERIC_BTEQ]
 
+# objects deployed as one statement (their scripts are not split to statements)
+ONE_STATEMENT_TYPES = {PROCEDURE, MACRO, FUNCTION, TRIGGER}
+
 ENV_PLACEHOLDER = "{{env}}"
 
 
@@ -136,6 +139,24 @@ class DescribedObject:
     additional_details: ObjectDetails = field(factory=list)
 
 
+@define
+class ObjectFingerprint:
+    """
+    Represents state of an object at the time it was last written by the writer.
+
+    Attributes:
+        path (str): where the object was written, relative to the target directory
+        create_datetime (str | None): creation timestamp of the object (ISO format)
+        last_alter_datetime (str | None): last alter timestamp of the object (ISO format)
+        ddl_hash (str): sha256 of the written DDL script
+    """
+
+    path: str
+    create_datetime: str | None
+    last_alter_datetime: str | None
+    ddl_hash: str
+
+
 @define
 class DescribedTeradataDatabase:
     """
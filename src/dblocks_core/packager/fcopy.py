@@ -0,0 +1,123 @@
+import os
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable
+
+from attrs import define, field
+
+from dblocks_core.config.config import logger
+
+
+@define
+class CopyStats:
+    """
+    Statistics of a copy.
+
+    Attributes:
+        files (int): number of copied (or linked) files
+        linked (int): number of files that were hard-linked instead of copied
+        bytes (int): size of the files
+        seconds (float): elapsed time of the copy
+    """
+
+    files: int = field(default=0)
+    linked: int = field(default=0)
+    bytes: int = field(default=0)
+    seconds: float = field(default=0.0)
+    _lock: threading.Lock = field(factory=threading.Lock, repr=False)
+
+    def add(self, size: int, *, linked: bool):
+        with self._lock:
+            self.files += 1
+            self.bytes += size
+            self.linked += int(linked)
+
+    @property
+    def bytes_per_second(self) -> float:
+        if self.seconds == 0:
+            return 0.0
+        return self.bytes / self.seconds
+
+    def __str__(self) -> str:
+        return (
+            f"copied {self.files} files ({self.linked} linked),"
+            f" {self.bytes / 1024 / 1024:.1f} MiB in {self.seconds:.1f}s"
+            f" ({self.bytes_per_second / 1024 / 1024:.1f} MiB/s)"
+        )
+
+
+def copy_files(
+    pairs: Iterable[tuple[Path, Path]],
+    *,
+    workers: int = 8,
+    hard_link: bool = False,
+) -> CopyStats:
+    """
+    Copies files in a thread pool.
+
+    Args:
+        pairs (Iterable[tuple[Path, Path]]): (source, target) pairs; can be a generator,
+            files are copied as the pairs arrive.
+        workers (int, optional): Number of threads. Defaults to 8.
+        hard_link (bool, optional): Hard-link the files instead of copying them,
+            if the target is on the same filesystem as the source. Defaults to False.
+
+    Returns:
+        CopyStats: number of files, bytes, and throughput of the copy
+
+    Behavior:
+    - Target directories are created by the calling thread, each of them once,
+      so that the workers only copy.
+    - Existing target files are overwritten.
+    - Files are copied using `shutil.copyfile`, which uses the fast copy of
+      the platform, where available; file mode is copied as well (as does
+      `shutil.copy`).
+    """
+    stats = CopyStats()
+    started = perf_counter()
+    dirs: set[Path] = set()
+    window = 4 * workers
+
+    def _copy(source: Path, target: Path):
+        linked = hard_link and _link(source, target)
+        if not linked:
+            shutil.copyfile(source, target)
+            shutil.copymode(source, target)
+        stats.add(source.stat().st_size, linked=linked)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dbe-copy") as pool:
+        futures = deque()
+        try:
+            for source, target in pairs:
+                parent = target.parent
+                if parent not in dirs:
+                    parent.mkdir(exist_ok=True, parents=True)
+                    dirs.add(parent)
+                futures.append(pool.submit(_copy, source, target))
+                if len(futures) >= window:
+                    futures.popleft().result()
+            while futures:
+                futures.popleft().result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    stats.seconds = perf_counter() - started
+    logger.info(str(stats))
+    return stats
+
+
+def _link(source: Path, target: Path) -> bool:
+    """Hard-links the target to the source; returns False if it is not possible."""
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError as err:
+        # different filesystem (EXDEV), or links are not supported
+        logger.debug(f"can not link {source.as_posix()}: {err}")
+        return False
+    return True
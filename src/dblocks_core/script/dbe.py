@@ -129,6 +129,50 @@ def env_extract(
         bool,
         typer.Option(help="Allow deletion of objects from git."),
     ] = True,
+    workers: Annotated[
+        int,
+        typer.Option(
+            min=1,
+            help="Number of objects described in parallel. "
+            "Each worker uses its own database session.",
+        ),
+    ] = 1,
+    bulk_metadata: Annotated[
+        bool,
+        typer.Option(
+            help="Read table and column comments for the whole database "
+            "in one query, instead of one query per object."
+        ),
+    ] = False,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            help="Extract only objects that are new, or were altered since they "
+            "were extracted last time (uses the manifest in the .git directory)."
+        ),
+    ] = False,
+    async_dbi: Annotated[
+        bool,
+        typer.Option(
+            help="Describe objects using the async database interface, "
+            "--workers is then the number of requests in flight."
+        ),
+    ] = False,
+    stats: Annotated[
+        bool,
+        typer.Option(help="Extract statistics of tables (--no-stats to skip them)."),
+    ] = True,
+    commit_every: Annotated[
+        int,
+        typer.Option(min=1, help="Number of databases in one commit."),
+    ] = 1,
+    commit_interval: Annotated[
+        float | None,
+        typer.Option(
+            help="Commit at least this often (seconds), even if fewer databases "
+            "than --commit-every were extracted."
+        ),
+    ] = None,
 ):
     """
     Extraction of the database based on an environment name. The extraction can be
@@ -137,7 +181,7 @@ def env_extract(
     cfg = config.load_config()
 
     # repo, check if it is dirty
-    repo = git.repo_factory(raise_on_error=True)
+    repo = git.repo_factory(raise_on_error=True, persistent=True)
     if repo is not None and repo.is_dirty():
         logger.warning("Repo is not clean!")
 
@@ -179,8 +223,20 @@ def env_extract(
             sleep(1)
 
     env = config.get_environment_from_config(cfg, environment)
-    ext = dbi.dbi_factory(cfg, environment)
-    wrt = writer.create_writer(env.writer)
+    ext = dbi.dbi_factory(
+        cfg,
+        environment,
+        pool_size=max(workers, env.pool.size),
+        bulk_metadata=bulk_metadata,
+        extract_stats=stats,
+    )
+    # fingerprints of extracted objects are kept out of the working tree,
+    # otherwise the repo would be dirty after each extraction
+    manifest_file = None
+    if incremental:
+        state_dir = repo.git_dir() if repo is not None else cfg.ctx_dir
+        manifest_file = writer.fsystem.manifest_file(state_dir, environment)
+    wrt = writer.create_writer(env.writer, manifest_file=manifest_file)
 
     plugins_writer = config.plugin_instances(cfg, plugin_model.PluginFSWriter)
     plugins_extractor = config.plugin_instances(
@@ -189,26 +245,37 @@ def env_extract(
     )
     plugins = plugins_writer + plugins_extractor
 
-    with context.FSContext(
-        name="command-extract",
-        directory=cfg.ctx_dir,
-    ) as ctx:
-        cmd_extraction.run_extraction(
-            ctx=ctx,
-            env=env,
-            ext=ext,
-            wrt=wrt,
-            repo=repo,
-            env_name=environment,
-            filter_since_dt=since_dt,
-            commit=commit,
-            filter_databases=filter_databases,
-            filter_names=filter_names,
-            filter_creator=filter_creator,
-            plugins=plugins,
-            from_file=from_file,
-            allow_drop=allow_drop,
-        )
+    async_ext = dbi.AsyncDBIAdapter(ext, concurrency=workers) if async_dbi else None
+    try:
+        with context.FSContext(
+            name="command-extract",
+            directory=cfg.ctx_dir,
+        ) as ctx:
+            cmd_extraction.run_extraction(
+                ctx=ctx,
+                env=env,
+                ext=ext,
+                wrt=wrt,
+                repo=repo,
+                env_name=environment,
+                filter_since_dt=since_dt,
+                commit=commit,
+                filter_databases=filter_databases,
+                filter_names=filter_names,
+                filter_creator=filter_creator,
+                plugins=plugins,
+                from_file=from_file,
+                allow_drop=allow_drop,
+                workers=workers,
+                incremental=incremental,
+                async_ext=async_ext,
+                commit_every=commit_every,
+                commit_interval=commit_interval,
+            )
+    finally:
+        # stops threads of the adapter (and disposes of the engine)
+        if async_ext is not None:
+            async_ext.dispose()
     ctx.done()
 
 
@@ -250,6 +317,13 @@ def env_deploy(
     dry_run: Annotated[
         bool, typer.Option(help="Dry run only simulates deployment.")
     ] = False,
+    validate: Annotated[
+        bool,
+        typer.Option(
+            help="Tokenize all files before the deployment starts, "
+            "and report all parsing errors."
+        ),
+    ] = True,
 ):
     """
     Deploy all objects from a directory to the environment, regardless of dependencies.
@@ -286,6 +360,7 @@ def env_deploy(
             assume_yes=assume_yes,
             countdown_from=countdown_from,
             dry_run=dry_run,
+            validate=validate,
         )
 
         cmd_deployment.make_report(cfg.report_dir, environment, failures)
@@ -317,10 +392,22 @@ def pkg_from_diff(
             "If not provided, keep everything."
         ),
     ] = None,
+    workers: Annotated[
+        int,
+        typer.Option(min=1, help="Number of files copied in parallel."),
+    ] = 8,
+    hard_link: Annotated[
+        bool,
+        typer.Option(
+            help="Hard-link files into the package instead of copying them "
+            "(if the package is on the same filesystem as the repo). "
+            "Do not edit the linked files, that would change the repo."
+        ),
+    ] = False,
 ):
     """Prepare package based on git history."""
     cfg = config.load_config()
-    repo = git.repo_factory(raise_on_error=True)
+    repo = git.repo_factory(raise_on_error=True, persistent=True)
 
     cmd_git_copy_changed.copy(
         repo,
@@ -331,6 +418,8 @@ def pkg_from_diff(
         package_name=package_name,
         steps_subdir=cfg.packager.steps_subdir,
         include_only=include_only,
+        workers=workers,
+        hard_link=hard_link,
     )
 
 
@@ -363,6 +452,13 @@ def pkg_deploy(
             help="What to do if the object we try to deploy exists: raise/rename/drop"
         ),
     ] = "raise",
+    validate: Annotated[
+        bool,
+        typer.Option(
+            help="Tokenize all files before the deployment starts, "
+            "and report all parsing errors."
+        ),
+    ] = True,
 ):
     """
     Package deployment to the specified environment.
@@ -396,9 +492,46 @@ def pkg_deploy(
             ctx=ctx,
             if_exists=if_exists,
             dry_run=dry_run,
+            validate=validate,
         )
 
 
+@app.command()
+def pkg_validate(
+    path: Annotated[str, typer.Argument(help="Path to the package.")],
+    workers: Annotated[
+        int | None,
+        typer.Option(help="Number of processes (default: number of processors)."),
+    ] = None,
+    environment: Annotated[
+        str | None,
+        typer.Option(
+            help="Also report placeholders of tagging variables ({{name}}) "
+            "that are not defined in this environment."
+        ),
+    ] = None,
+):
+    """
+    Tokenize all files of the package and report all parsing errors,
+    without connecting to the database.
+    """
+    cfg = config.load_config()
+    pkg_path = Path(path)
+    if not pkg_path.is_dir():
+        message = f"not a dir: {pkg_path.as_posix()}"
+        raise exc.DOperationsError(message)
+
+    batch = cmd_pkg_deployment.cmd_pkg_validate(
+        pkg_path, cfg=cfg, workers=workers, environment=environment
+    )
+    files = [f for step in batch.steps for f in step.files]
+    statements = sum(f.statement_count or 0 for f in files)
+    console.print(
+        f"OK: {len(batch.steps)} steps, {len(files)} files, {statements} statements",
+        style="bold green",
+    )
+
+
 @app.command()
 def cfg_check():
     """Checks configuration files, without actually doing 'anything'."""
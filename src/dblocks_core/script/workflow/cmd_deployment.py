@@ -12,7 +12,7 @@ from dblocks_core import context, exc, tagger
 from dblocks_core.config.config import logger
 from dblocks_core.context import Context
 from dblocks_core.dbi import AbstractDBI
-from dblocks_core.deployer import tokenizer
+from dblocks_core.deployer import stmt_cache, tokenizer, validator
 from dblocks_core.model import config_model, meta_model
 from dblocks_core.writer import fsystem
 
@@ -31,6 +31,8 @@ _DEPLOYMENT_STRATEGIES = [
     IGNORE_STRATEGY,
     SKIP_STRATEGY,
 ]
+# strategies that change the existing object before the script is deployed
+_DESTRUCTIVE_STRATEGIES = {DROP_STRATEGY, RENAME_STRATEGY}
 _DTTM_FMT = "%Y%m%d%H%M%S"
 
 # Collection is used to derive deployment order of single files based on their extensions. Notice, every extension
@@ -92,6 +94,8 @@ def deploy_env(
     assume_yes: bool = False,
     countdown_from: int,
     dry_run: bool = False,
+    validate: bool = True,
+    workers: int | None = None,
 ) -> dict[str, meta_model.DeploymentFailure]:
 
     # sanity check
@@ -129,6 +133,12 @@ def deploy_env(
     # check all database names are known, everything was tagged correctly
     _assert_all_dbs_expanded(databases)
 
+    # tokenize all files before the deployment starts (in a process pool),
+    # so that parsing errors are reported at once, and not hours later
+    statement_counts: dict[Path, int] | None = None
+    if validate:
+        statement_counts = validate_queue(queue, tgr, workers=workers)
+
     # check the deployment
     if not assume_yes:
         _confirm_deployment(
@@ -185,25 +195,72 @@ def deploy_env(
 
     # deploy others
     # FIXME - predetermined number of waaves....
+    # tokenized scripts are cached, waves after the first one (and deployments
+    # of the same package to other environments) do not tokenize them again
+    cache_file = cfg.ctx_dir / stmt_cache.CACHE_FILE_NAME
     deployed_cnt = -1
     wave = 1
-    while deployed_cnt != 0:
-        logger.info(f"starting wave #{wave}")
-        deployed_cnt = deploy_queue(
-            queue,
-            ctx=ctx,
-            tgr=tgr,
-            ext=ext,
-            log_each=log_each,
-            total_queue_length=len(queue),
-            failures=failures,
-            if_exists=if_exists,
-            dry_run=dry_run,
-        )
-        wave += 1
+    with stmt_cache.StatementCache(cache_file) as statement_cache:
+        while deployed_cnt != 0:
+            logger.info(f"starting wave #{wave}")
+            deployed_cnt = deploy_queue(
+                queue,
+                ctx=ctx,
+                tgr=tgr,
+                ext=ext,
+                log_each=log_each,
+                total_queue_length=len(queue),
+                failures=failures,
+                if_exists=if_exists,
+                dry_run=dry_run,
+                statement_cache=statement_cache,
+                statement_counts=statement_counts,
+            )
+            wave += 1
     return failures
 
 
+def validate_queue(
+    files: list[Path],
+    tgr: tagger.Tagger | None = None,
+    *,
+    workers: int | None = None,
+) -> dict[Path, int]:
+    """
+    Tokenizes all files of the queue, in a process pool.
+
+    Args:
+        files (list[Path]): The files.
+        tgr (tagger.Tagger | None, optional): If given, statements with
+            placeholders of unknown tagging variables are reported.
+            Defaults to None.
+        workers (int | None, optional): Number of processes. Defaults to None
+            (number of processors).
+
+    Returns:
+        dict[Path, int]: Number of statements of each file.
+
+    Raises:
+        exc.DParsingError: with all parsing errors found in the files
+    """
+    report = validator.validate_files(
+        (
+            (
+                f,
+                fsystem.EXT_TO_TYPE.get(f.suffix.lower())
+                not in meta_model.ONE_STATEMENT_TYPES,
+            )
+            for f in files
+        ),
+        workers=workers,
+        variables=tgr.variables if tgr is not None else None,
+    )
+    if not report.is_valid:
+        msg = "Invalid statements:\n" + "\n".join(f"- {e}" for e in report.errors)
+        raise exc.DParsingError(msg)
+    return report.statement_counts()
+
+
 def deploy_queue(
     files: Iterable[Path],
     *,
@@ -215,6 +272,8 @@ def deploy_queue(
     failures: dict[str, meta_model.DeploymentFailure],
     if_exists: str | None,
     dry_run: bool = False,
+    statement_cache: stmt_cache.StatementCache | None = None,
+    statement_counts: dict[Path, int] | None = None,
 ) -> int:
     """
     Deploys a queue of files to the database.
@@ -228,6 +287,9 @@ def deploy_queue(
         total_queue_length (int): Total number of files in the queue.
         failures (dict[str, meta_model.DeploymentFailure]): Dictionary to track failed deployments.
         if_exists (str | None): Conflict resolution strategy.
+        statement_cache (StatementCache | None): Cache of tokenized scripts.
+        statement_counts (dict[Path, int] | None): Number of statements of each file,
+            used to estimate the end of the deployment (see validate_queue).
 
     Returns:
         int: Number of successfully deployed files.
@@ -236,14 +298,28 @@ def deploy_queue(
 
     default_db = None
 
+    # progress, based on number of statements (if known)
+    statement_counts = statement_counts or {}
+    files = list(files)
+    total_statements = sum(statement_counts.get(f, 0) for f in files)
+    done_statements, started_when = 0, datetime.now()
+
     for i, file in enumerate(files):
         chk = file.as_posix()
         if ctx.get_checkpoint(chk):
             logger.debug(f"skip: {chk}")
+            total_statements -= statement_counts.get(file, 0)
             continue
 
         if (i + 1) % log_each == 0:
-            logger.info(f" script #{i+1}/{total_queue_length + 1}: {file.as_posix()}")
+            eta = ""
+            if total_statements and done_statements:
+                eta_dt = ctx.eta(total_statements, done_statements, started_when)
+                eta = f" ({done_statements}/{total_statements} statements"
+                eta += f", ETA={eta_dt:%Y-%m-%d %H:%M:%S})"
+            logger.info(
+                f" script #{i+1}/{total_queue_length + 1}: {file.as_posix()}{eta}"
+            )
 
         object_name = tgr.expand_statement(file.stem)
         object_database = tgr.expand_statement(file.parent.stem)
@@ -268,6 +344,7 @@ def deploy_queue(
                 ext=ext,
                 if_exists=if_exists,
                 dry_run=dry_run,
+                statement_cache=statement_cache,
             )
             deployed_cnt += 1
 
@@ -303,6 +380,8 @@ def deploy_queue(
             )
             failures[fail.path] = fail  # type: ignore
 
+        done_statements += statement_counts.get(file, 0)
+
     return deployed_cnt
 
 
@@ -315,16 +394,11 @@ def deploy_file(
     tgr: tagger.Tagger,
     ext: AbstractDBI,
     dry_run: bool = False,
+    statement_cache: stmt_cache.StatementCache | None = None,
 ):
-    script = file.read_text(
-        encoding="utf-8", errors="strict"
-    )  # TODO - should NOT be hardcoded
-    if len(script.strip()) == 0:
-        raise exc.DOperationsError(f"empty file encountered: {file.as_posix()}")
-
     object_type = None
     try:
-        object_type = fsystem.EXT_TO_TYPE[file.suffix]
+        object_type = fsystem.EXT_TO_TYPE[file.suffix.lower()]
     except KeyError:
         # FIXME: support .sql and ,bteq files, at the moment
         #        we can not identify type of deployed object if the file is one of them
@@ -333,6 +407,30 @@ def deploy_file(
         logger.warning(f"unknown object type: {file}")
         pass
 
+    # large scripts are read in chunks, and tokenized while being deployed;
+    # if the existing object is dropped (or renamed) first, the whole script
+    # is tokenized beforehand, so that a parsing error does not leave it dropped
+    script: str | Iterable[str]
+    if (
+        object_type not in meta_model.ONE_STATEMENT_TYPES
+        and file.stat().st_size > tokenizer.STREAMING_THRESHOLD
+    ):
+        if if_exists in _DESTRUCTIVE_STRATEGIES:
+            logger.debug(f"tokenizing {file.as_posix()} before deployment")
+            for _ in tokenizer.tokenize_chunks(
+                tokenizer.read_chunks(file),
+                bteq=object_type == meta_model.GENERIC_BTEQ,
+            ):
+                pass
+        logger.debug(f"streaming statements of {file.as_posix()}")
+        script = tokenizer.read_chunks(file)
+    else:
+        script = file.read_text(
+            encoding="utf-8", errors="strict"
+        )  # TODO - should NOT be hardcoded
+        if len(script.strip()) == 0:
+            raise exc.DOperationsError(f"empty file encountered: {file.as_posix()}")
+
     # FIXME: if stored procedure, do not tokenize
     deploy_script_with_conflict_strategy(
         script,
@@ -343,11 +441,12 @@ def deploy_file(
         ext=ext,
         tgr=tgr,
         dry_run=dry_run,
+        statement_cache=statement_cache,
     )
 
 
 def deploy_script_with_conflict_strategy(
-    script: str,
+    script: str | Iterable[str],
     *,
     object_database: str | None,
     object_name: str | None,
@@ -356,6 +455,7 @@ def deploy_script_with_conflict_strategy(
     tgr: tagger.Tagger,
     ext: AbstractDBI,
     dry_run: bool = False,
+    statement_cache: stmt_cache.StatementCache | None = None,
 ):
     errs = []
     if if_exists is not None:
@@ -378,16 +478,24 @@ def deploy_script_with_conflict_strategy(
     #
     # FIXME: this needs to be checked with ANSI semantics and DML statements.
     # FIXME: maybe? for procedures, tokenize, but handle BEGIN/END statements in the script?
-    if object_type in (
-        meta_model.PROCEDURE,
-        meta_model.MACRO,
-        meta_model.FUNCTION,
-        meta_model.TRIGGER,
-    ):
-        statements = [script]
+    #
+    # The script is either the whole text, or its chunks (tokenized lazily).
+    # BTEQ commands of BTEQ scripts are handled here, see tokenizer.sql_statements.
+    bteq = object_type == meta_model.GENERIC_BTEQ
+    statements: Iterable[str]
+    if object_type in meta_model.ONE_STATEMENT_TYPES:
+        statements = [script if isinstance(script, str) else "".join(script)]
+    elif isinstance(script, str):
+        if statement_cache is not None:
+            tokens = statement_cache.tokenize_statements(script, bteq=bteq)
+        else:
+            tokens = list(tokenizer.tokenize_statements(script, bteq=bteq))
+        statements = list(tokenizer.sql_statements(tokens))
     else:
-        statements = [s.statement for s in tokenizer.tokenize_statements(script)]
-    statements = [tgr.expand_statement(s) for s in statements]
+        statements = tokenizer.sql_statements(
+            tokenizer.tokenize_chunks(script, bteq=bteq)
+        )
+    statements = (tgr.expand_statement(s) for s in statements)
 
     if dry_run:
         for s in statements:
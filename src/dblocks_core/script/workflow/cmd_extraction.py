@@ -1,17 +1,33 @@
+import asyncio
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
+from time import perf_counter
+from typing import Generator, Iterable, Iterator
 
 import cattrs
-from attrs import frozen
+from attrs import define, field, frozen
 
 from dblocks_core import exc, tagger
 from dblocks_core.config.config import logger
 from dblocks_core.context import Context
-from dblocks_core.dbi import AbstractDBI
+from dblocks_core.dbi import AbstractDBI, AsyncAbstractDBI
 from dblocks_core.git import git
+from dblocks_core.git.scheduler import CommitScheduler
 from dblocks_core.model import config_model, meta_model, plugin_model
 from dblocks_core.script.workflow import dbi
 from dblocks_core.writer import AbstractWriter
 
+# max number of tagged objects waiting to be written
+_TAG_QUEUE_SIZE = 32
+
+# number of objects described by one call of get_described_objects
+_DESCRIBE_BATCH_SIZE = 16
+
 
 def run_extraction(
     # parts of the pipeline
@@ -33,6 +49,11 @@ def run_extraction(
     log_each: int = 5,
     commit: bool = False,
     allow_drop: bool = True,
+    workers: int = 1,
+    incremental: bool = False,
+    async_ext: AsyncAbstractDBI | None = None,
+    commit_every: int = 1,
+    commit_interval: float | None = None,
 ):
     """
     Executes a full or incremental extraction of the database.
@@ -50,6 +71,16 @@ def run_extraction(
         filter_creator (str | None): Optional filter for creator names.
         log_each (int): Frequency of logging progress.
         commit (bool): Whether to commit changes to the repository.
+        workers (int): Number of threads used to describe objects in parallel.
+            Tagging and writing are still done in order, commits are done
+            in a background thread (see CommitScheduler).
+        incremental (bool): Skip objects that did not change since they were
+            written last time (based on the manifest maintained by the writer).
+        async_ext (AsyncAbstractDBI | None): If given, objects are described using
+            the async interface, with at most `workers` requests in flight.
+        commit_every (int): Number of databases in one commit.
+        commit_interval (float | None): Commit at least this often (seconds),
+            even if fewer than `commit_every` databases were extracted.
 
     Returns:
         None
@@ -185,63 +216,111 @@ def run_extraction(
         f"total lenght of the queue is: {len([ e for e in in_scope if e.in_scope])}"
     )
 
-    db = "n/a"
+    # objects that still have to be described, with their position in the queue
+    # (used to report progress); objects that were done before a restart are skipped
+    pending: list[tuple[int, meta_model.IdentifiedObject, str]] = []
     for i, obj in enumerate(in_scope, start=1):
-        db = obj.database_name
         if not obj.in_scope:
             continue
-
         obj_chk_name = f"get-described-object:{obj.database_name}.{obj.object_name}"
         if ctx.get_checkpoint(obj_chk_name):
             continue
-
-        # log progress from time to time
-        if i % log_each == 0:
-            eta = ctx.eta(
-                total_steps=len(in_scope),
-                finished_steps=i,
-                eta_since=started_when,
-            ).strftime("%Y-%m-%d %H:%M:%S")
-            logger.info(
-                f": {obj.database_name}.{obj.object_name}"
-                f" (#{i}/{len(in_scope)}, ETA={eta}))"
-            )
-
-        # get the definition - be tolerant to attempt to get def
-        # of object that was dropped since we started
-        described_object = ext.get_described_object(obj)
-        if described_object is None:
-            logger.warning(
-                f"object does not exist: {obj.database_name}.{obj.object_name}"
-            )
+        if incremental and wrt.is_unchanged(obj):
             continue
+        pending.append((i, obj, obj_chk_name))
+
+    if incremental:
+        logger.info(f"changed or new objects: {len(pending)}")
+
+    # the extraction is a pipeline of three stages: describe -> tag -> write
+    # - objects are described by a pool of workers (see describe_objects),
+    # - tagged in a background thread (see tag_objects),
+    # - and written in this thread, in the original order
+    # the stages are connected by bounded queues, so the slowest stage limits
+    # the others, and only a limited number of objects is kept in memory
+    describe_stats = StageStats("describe")
+    tag_stats = StageStats("tag")
+    write_stats = StageStats("write")
+    described_objects = describe_objects(
+        async_ext or ext,
+        (obj for _, obj, _ in pending),
+        workers=workers,
+        stats=describe_stats,
+    )
+    tagged_objects = tag_objects(
+        described_objects,
+        tgr,
+        queue_size=_TAG_QUEUE_SIZE,
+        stats=tag_stats,
+    )
 
-        # the function is NOT pure and modifies the object in question!
-        # namely, we try to tag the database, which modifies object definition (ddl+statements)
-        tgr.tag_object(described_object)
-
-        # write the object to the repo
-        wrt.write_object(
-            described_object,
-            database_tag=db_to_tag[obj.database_name.upper()],  # type: ignore
-            parent_tags_in_scope=db_to_parents[obj.database_name.upper()],
-            plugin_instances=plugins,
+    # changes are committed by a background thread, in batches of databases
+    scheduler: CommitScheduler | None = None
+    if repo is not None and commit:
+        scheduler = CommitScheduler(
+            repo,
+            message_prefix=f"dbe env-extract {env_name}",
+            max_databases=commit_every,
+            max_seconds=commit_interval,
         )
-        ctx.set_checkpoint(obj_chk_name)
 
-        # commit?
-        if repo is not None and prev_db is not None and db != prev_db:
-            if commit and not repo.is_clean():
-                repo.add()
-                repo.commit(f"dbe env-extract {env_name}: {db}")
+    db = "n/a"
+    # stop the tag and describe stages promptly, even if the write fails
+    try:
+        for described_object, (i, obj, obj_chk_name) in zip(tagged_objects, pending):
+            db = obj.database_name
+
+            # all objects of the previous database were written, commit?
+            if scheduler is not None and prev_db is not None and db != prev_db:
+                wrt.save_manifest()
+                scheduler.database_done(prev_db, wrt.pop_changed_paths())
+            prev_db = db
+
+            # log progress from time to time
+            if i % log_each == 0:
+                eta = ctx.eta(
+                    total_steps=len(in_scope),
+                    finished_steps=i,
+                    eta_since=started_when,
+                ).strftime("%Y-%m-%d %H:%M:%S")
+                logger.info(
+                    f": {obj.database_name}.{obj.object_name}"
+                    f" (#{i}/{len(in_scope)}, ETA={eta}))"
+                )
+                logger.debug(f"{describe_stats}; {tag_stats}; {write_stats}")
 
-        # next iteration
-        prev_db = obj.database_name
+            # get the definition - be tolerant to attempt to get def
+            # of object that was dropped since we started
+            if described_object is None:
+                logger.warning(
+                    f"object does not exist: {obj.database_name}.{obj.object_name}"
+                )
+                continue
 
-    if not repo.is_clean():
-        if commit:
-            repo.add()
-            repo.commit(f"dbe env-extract {env_name}: {db}")
+            # write the object to the repo
+            with write_stats.measure():
+                wrt.write_object(
+                    described_object,
+                    database_tag=db_to_tag[obj.database_name.upper()],  # type: ignore
+                    parent_tags_in_scope=db_to_parents[obj.database_name.upper()],
+                    plugin_instances=plugins,
+                )
+            ctx.set_checkpoint(obj_chk_name)
+    finally:
+        tagged_objects.close()
+
+    logger.info(f"{describe_stats}; {tag_stats}; {write_stats}")
+    if (connection_stats := getattr(ext, "connection_stats", None)) is not None:
+        logger.info(str(connection_stats))
+    if (writer_stats := getattr(wrt, "write_stats", None)) is not None:
+        logger.info(str(writer_stats))
+    wrt.save_manifest()
+    if scheduler is not None:
+        # files written by plugins are not known to the writer, stage
+        # the whole target directory with the last database
+        paths = [*wrt.pop_changed_paths(), env.writer.target_dir.resolve()]
+        scheduler.database_done(db, paths)
+        scheduler.flush()
 
     # delete droped objects
     if drop_nonex_objects:
@@ -251,19 +330,256 @@ def run_extraction(
             tagged_databases=env_data.all_databases,
             databases_in_scope=env_data.all_databases,
         )
-        if repo is not None:
-            if not repo.is_clean():
-                if commit:
-                    repo.add()
-                    repo.commit(f"dbe env-extract {env_name}: delete dropped objects")
-                else:
-                    logger.warning("Please, commit your changes.")
+        wrt.save_manifest()
+        if scheduler is not None:
+            scheduler.database_done("delete dropped objects", wrt.pop_changed_paths())
+        elif repo is not None:
+            logger.warning("Please, commit your changes.")
+
+    if scheduler is not None:
+        scheduler.close()
+        logger.info(f"commits: {scheduler.commits}")
 
     # final commit
     if repo is not None and not repo.is_clean():
         logger.warning("Repo si not clean, please, commit your changes.")
 
 
+def describe_objects(
+    ext: AbstractDBI | AsyncAbstractDBI,
+    objects: Iterable[meta_model.IdentifiedObject],
+    *,
+    workers: int = 1,
+    batch_size: int = _DESCRIBE_BATCH_SIZE,
+    stats: "StageStats | None" = None,
+) -> Iterator[meta_model.DescribedObject | None]:
+    """
+    Describes objects, and yields the results in the same order as the input.
+
+    Objects are described in batches of `batch_size` (see
+    `AbstractDBI.get_described_objects`). With more than one worker, the batches
+    are described in a thread pool. At most `2 * workers` batches are described
+    ahead of the consumer, so the memory footprint does not depend on size
+    of the environment.
+
+    If `ext` is an async interface, calls to `ext.get_described_objects` are
+    awaited in an event loop running in a background thread instead, and
+    `workers` is the number of batches in flight.
+
+    Args:
+        ext (AbstractDBI | AsyncAbstractDBI): Database interface for extraction.
+        objects (Iterable[meta_model.IdentifiedObject]): Objects to describe.
+        workers (int): Number of threads; 1 means no thread pool is used.
+        batch_size (int): Number of objects described by one call.
+        stats (StageStats | None): Throughput counter of the stage.
+
+    Yields:
+        meta_model.DescribedObject | None: The described object, or None if the
+            object does not exist.
+    """
+    stats = stats or StageStats("describe")
+    if isinstance(ext, AsyncAbstractDBI):
+        yield from _describe_objects_async(
+            ext, objects, workers=workers, batch_size=batch_size, stats=stats
+        )
+        return
+
+    def _describe(batch: list[meta_model.IdentifiedObject]):
+        with stats.measure(items=len(batch)):
+            return list(ext.get_described_objects(batch))
+
+    objects = iter(objects)
+    batches = iter(lambda: list(islice(objects, batch_size)), [])
+
+    if workers <= 1:
+        for batch in batches:
+            yield from _describe(batch)
+        return
+
+    logger.info(f"describing objects using {workers} workers")
+    window = 2 * workers
+    with ThreadPoolExecutor(
+        max_workers=workers,
+        thread_name_prefix="dbe-describe",
+    ) as pool:
+        futures = deque()
+        try:
+            for batch in batches:
+                futures.append(pool.submit(_describe, batch))
+                if len(futures) >= window:
+                    yield from futures.popleft().result()
+            while futures:
+                yield from futures.popleft().result()
+        finally:
+            # the consumer failed or stopped early, do not describe the rest
+            for future in futures:
+                future.cancel()
+
+
+def _describe_objects_async(
+    ext: AsyncAbstractDBI,
+    objects: Iterable[meta_model.IdentifiedObject],
+    *,
+    workers: int,
+    batch_size: int,
+    stats: "StageStats",
+) -> Iterator[meta_model.DescribedObject | None]:
+    """
+    Describes objects using the async interface, see describe_objects.
+    """
+
+    async def _describe(batch: list[meta_model.IdentifiedObject]):
+        with stats.measure(items=len(batch)):
+            return await ext.get_described_objects(batch)
+
+    objects = iter(objects)
+    batches = iter(lambda: list(islice(objects, batch_size)), [])
+
+    logger.info(f"describing objects using async interface, {workers} in flight")
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="dbe-async", daemon=True)
+    thread.start()
+    window = max(workers, 1)
+    futures = deque()
+    try:
+        for batch in batches:
+            futures.append(asyncio.run_coroutine_threadsafe(_describe(batch), loop))
+            if len(futures) >= window:
+                yield from futures.popleft().result()
+        while futures:
+            yield from futures.popleft().result()
+    finally:
+        for future in futures:
+            future.cancel()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def tag_objects(
+    described_objects: Iterable[meta_model.DescribedObject | None],
+    tgr: tagger.Tagger,
+    *,
+    queue_size: int = _TAG_QUEUE_SIZE,
+    stats: "StageStats | None" = None,
+) -> Generator[meta_model.DescribedObject | None, None, None]:
+    """
+    Tags described objects in a background thread, and yields them in the same order.
+
+    The thread consumes `described_objects` (and thus drives the describe stage),
+    and hands tagged objects over using a queue of `queue_size` items. If the
+    consumer is slower, the thread waits, and so does the describe stage.
+
+    Args:
+        described_objects (Iterable[meta_model.DescribedObject | None]): objects
+            to tag, None (object does not exist) is passed through as is.
+        tgr (tagger.Tagger): The tagger.
+        queue_size (int): Max number of tagged objects waiting for the consumer.
+        stats (StageStats | None): Throughput counter of the stage.
+
+    Yields:
+        meta_model.DescribedObject | None: the tagged object.
+
+    Raises:
+        Any exception raised by the describe or the tag stage.
+    """
+    stats = stats or StageStats("tag")
+    handover: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    end_of_stream = object()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                handover.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker():
+        try:
+            for described_object in described_objects:
+                if described_object is not None:
+                    # the function is NOT pure and modifies the object in question!
+                    # namely, we try to tag the database, which modifies object
+                    # definition (ddl+statements)
+                    with stats.measure():
+                        tgr.tag_object(described_object)
+                if not _put(described_object):
+                    return
+            _put(end_of_stream)
+        except BaseException as err:
+            _put(_StageFailure(err))
+        finally:
+            # stop the describe stage, if it is a generator
+            close = getattr(described_objects, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=_worker, name="dbe-tag", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = handover.get()
+            if item is end_of_stream:
+                return
+            if isinstance(item, _StageFailure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+@frozen
+class _StageFailure:
+    error: BaseException
+
+
+@define
+class StageStats:
+    """
+    Throughput counter of one stage of the extraction pipeline.
+
+    Attributes:
+        name (str): name of the stage
+        items (int): number of processed objects
+        busy_seconds (float): time spent processing the objects (summed over
+            all threads of the stage)
+    """
+
+    name: str
+    items: int = field(default=0)
+    busy_seconds: float = field(default=0.0)
+    _lock: threading.Lock = field(factory=threading.Lock, repr=False)
+
+    @contextmanager
+    def measure(self, items: int = 1):
+        """Measures processing of one object (or a batch of `items` objects)."""
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - started
+            with self._lock:
+                self.items += items
+                self.busy_seconds += elapsed
+
+    @property
+    def throughput(self) -> float:
+        """Objects per second of busy time."""
+        if self.busy_seconds == 0:
+            return 0.0
+        return self.items / self.busy_seconds
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.items} objects in {self.busy_seconds:.1f}s"
+            f" ({self.throughput:.1f}/s)"
+        )
+
+
 @frozen
 class _FilterFromFile:
     databases: list[str]
@@ -1,6 +1,6 @@
 import shutil
 from pathlib import Path
-from typing import Callable, Iterable, Tuple
+from typing import Callable, Iterable, Iterator, Tuple
 
 from rich.console import Console
 from rich.prompt import Prompt
@@ -9,6 +9,7 @@ from dblocks_core import exc
 from dblocks_core.config.config import logger
 from dblocks_core.git import git
 from dblocks_core.model import config_model
+from dblocks_core.packager import fcopy
 from dblocks_core.writer import fsystem
 
 console = Console()
@@ -31,9 +32,11 @@ def copy(
     metadata_dir: Path,
     steps_subdir: Path,
     include_only: Iterable[Path | str] | None = None,
+    workers: int = 8,
+    hard_link: bool = False,
 ):
     # repo, check if it is dirty
-    repo = git.repo_factory(raise_on_error=True)
+    repo = git.repo_factory(raise_on_error=True, persistent=True)
     if repo is not None and repo.is_dirty():
         logger.warning("Repo is not clean!")
         console.print(
@@ -68,9 +71,6 @@ def copy(
                 logger.error(f"action canceled by prompt: {really}")
                 return
 
-    # get list of changes
-    changes = changes_against(repo, diff_against, diff_ident, include_only=include_only)
-
     # prep copy from/to pairs
     # get path relative to subdir, if list of subdirs was given
 
@@ -83,13 +83,22 @@ def copy(
         git.FileStatus.UNMERGED,
     ]
 
-    if len(changes) == 0:
+    # changes are copied as they are read from git, the changeset is never held
+    # in memory as a whole; it is counted first (reading the whole output of git),
+    # so that the user knows its size before the confirmation
+    total = sum(
+        1
+        for _ in changes_against(
+            repo, diff_against, diff_ident, include_only=include_only
+        )
+    )
+    logger.info(f"full changespec: {total} items")
+    if total == 0:
         logger.warning("Empty list of changes files.")
         return
 
     # target directory, ask for confirmation
     pkg_root_dir = pkg_dir / package_name
-    logger.info(f"Changeset length is: {len(changes)}")
     logger.info(f"Target dir is: {pkg_root_dir.as_posix()}")
     really = Prompt.ask(
         "Are you sure you want to continue? (yes/no)",
@@ -99,28 +108,28 @@ def copy(
         logger.error(f"action canceled by prompt: {really}")
         return
 
-    dirs = set()
-    for c in changes:
-        # FIXME: deletions, what to do about them
-        if c.change not in can_copy:
-            continue
-        copy_from = repo.repo_dir / c.rel_path
-        if not copy_from.exists():
-            logger.warning(f"file does not exists: {copy_from}")
-            continue
-        copy_to = pkg_root_dir / _rel_path_in_package(
-            repo_dir_absp=repo.repo_dir,
-            src_file_absp=c.abs_path,
-            metadata_dir_absp=metadata_dir,
-            steps_subdir=steps_subdir,
+    def _pairs() -> Iterator[tuple[Path, Path]]:
+        changes = changes_against(
+            repo, diff_against, diff_ident, include_only=include_only
         )
+        for c in changes:
+            # FIXME: deletions, what to do about them
+            if c.change not in can_copy:
+                continue
+            copy_from = repo.repo_dir / c.rel_path
+            if not copy_from.exists():
+                logger.warning(f"file does not exists: {copy_from}")
+                continue
+            copy_to = pkg_root_dir / _rel_path_in_package(
+                repo_dir_absp=repo.repo_dir,
+                src_file_absp=c.abs_path,
+                metadata_dir_absp=metadata_dir,
+                steps_subdir=steps_subdir,
+            )
+            yield copy_from, copy_to
 
-        parent = copy_to.parent
-        if parent not in dirs:
-            parent.mkdir(exist_ok=True, parents=True)
-            dirs.add(parent)
-
-        shutil.copy(copy_from, copy_to)
+    stats = fcopy.copy_files(_pairs(), workers=workers, hard_link=hard_link)
+    logger.info(f"copied files: {stats.files}")
 
 
 def _rel_path_in_package(
@@ -159,7 +168,7 @@ def changes_against(
     diff_ident: str,
     *,
     include_only: list[Path, str] | None,
-) -> list[git.GitChangedPath]:
+) -> Iterator[git.GitChangedPath]:
     """Compares last committed state of the current branch to either
     a different branch, or to a commit on the same branch.
 
@@ -174,7 +183,7 @@ def changes_against(
         DOperationsError: If `diff_against` is not "commit" or "branch".
 
     Returns:
-        list[git.GitChangedPath]: List of changed files.
+        Iterator[git.GitChangedPath]: Changed files, as they are read from git.
     """
 
     # what do we diff against, what changes do we have?
@@ -193,9 +202,9 @@ def changes_against(
 
 
 def _filter_subdir(
-    changes: list[git.GitChangedPath],
+    changes: Iterable[git.GitChangedPath],
     subdir_list: list[Path],
-) -> list[git.GitChangedPath]:
+) -> Iterator[git.GitChangedPath]:
     subdir_list_ = [s.as_posix() + "/" for s in subdir_list]
 
     def _is_in_list(p: Path):
@@ -203,14 +212,14 @@ def _filter_subdir(
             if p.as_posix().startswith(subdir):
                 return True
 
-    return [c for c in changes if _is_in_list(c.abs_path)]
+    return (c for c in changes if _is_in_list(c.abs_path))
 
 
 def changes_against_commit(
     repo: git.Repo,
     *,
     baseline_commit: str,
-) -> list[git.GitChangedPath]:
+) -> Iterator[git.GitChangedPath]:
     """Compares last commit on current branch to a different commit
     on the same branch, and returns list of changed files.
 
@@ -221,7 +230,7 @@ def changes_against_commit(
         DGitCommandError: If the last commit SHA cannot be retrieved.
 
     Returns:
-        list[git.GitChangedPath]: list of changes
+        Iterator[git.GitChangedPath]: changes, as they are read from git
     """
 
     # check that the commit is on current branch
@@ -236,19 +245,17 @@ def changes_against_commit(
     logger.info(f"latest commit is {last_commit_on_branch}")
 
     # get full changespec
-    changes = repo.changes_between_commits(
+    return repo.iter_changes_between_commits(
         baseline_commit=baseline_commit,
         last_commit=last_commit_on_branch,
     )
-    logger.info(f"full changespec: {len(changes)} items")
-    return changes
 
 
 def changes_against_branch(
     repo: git.Repo,
     *,
     baseline_branch: str,
-) -> list[git.GitChangedPath]:
+) -> Iterator[git.GitChangedPath]:
     """Compares last commit on current branch to a last common
     commit with a different branch. Returns list of changed files.
 
@@ -261,7 +268,7 @@ def changes_against_branch(
         DGitCommandError: If the last commit SHA cannot be retrieved.
 
     Returns:
-        list[git.GitChangedPath]: list of changes
+        Iterator[git.GitChangedPath]: changes, as they are read from git
     """
 
     # what branch are we on
@@ -280,12 +287,10 @@ def changes_against_branch(
     logger.info(f"latest commit is {last_commit_on_branch}")
 
     # get full changespec
-    changes = repo.changes_between_commits(
+    return repo.iter_changes_between_commits(
         baseline_commit=baseline_commit,
         last_commit=last_commit_on_branch,
     )
-    logger.info(f"full changespec: {len(changes)} items")
-    return changes
 
 
 def copy_changed_files(
@@ -20,6 +20,8 @@ DROP_STRATEGY = "drop"
 RENAME_STRATEGY = "rename"
 _DO_NOT_DEPLOY = {fsystem.DATABASE_SUFFIX}  # TODO: skip databases for now
 _DEPLOYMENT_STRATEGIES = [DROP_STRATEGY, RENAME_STRATEGY, RAISE_STRATEGY]
+# strategies that change the existing object before the script is deployed
+_DESTRUCTIVE_STRATEGIES = {DROP_STRATEGY, RENAME_STRATEGY}
 _DTTM_FMT = "%Y%m%d%H%M%S"
 
 
@@ -31,8 +33,8 @@ def cmd_pkg_deploy(
     ctx: context.Context,
     if_exists: str | None,
     dry_run: bool = False,
+    validate: bool = True,
 ):
-    pkg_cfg = cfg.packager
     env_cfg = get_environment_from_config(cfg, environment)
     # sanity check
     if if_exists is not None:
@@ -43,20 +45,7 @@ def cmd_pkg_deploy(
             )
             raise exc.DOperationsError(msg)
 
-    # find subdirecory where steps are located
-    # use case insensitive search, if switched on in config
-    logger.info(f"look for {pkg_cfg.steps_subdir} under {pkg_path}")
-    if pkg_cfg.case_insensitive_dirs:
-        subdirs = case_insensitive_search(pkg_path, pkg_cfg.steps_subdir)
-        if subdirs is None:
-            raise exc.DOperationsError(f"subdir not found: {pkg_cfg.steps_subdir}")
-        root_dir = pkg_path / subdirs
-    else:
-        root_dir = pkg_path / pkg_cfg.steps_subdir
-
-    # sanity check
-    if not root_dir.is_dir():
-        raise exc.DOperationsError(f"directory not found: {root_dir}")
+    root_dir = find_steps_dir(pkg_path, cfg.packager)
 
     # tagger
     tgr = tagger.Tagger(
@@ -68,9 +57,13 @@ def cmd_pkg_deploy(
     # dbi
     ext = dbi.dbi_factory(cfg, environment)
 
-    # deployment batch
+    # deployment batch, validated before anything is deployed
     logger.info(f"scanning steps dir: {root_dir}")
-    batch = fsequencer.create_batch(root_dir, tgr)
+    batch = fsequencer.create_batch(root_dir, tgr, validate=validate)
+    total_statements = sum(
+        f.statement_count or 0 for step in batch.steps for f in step.files
+    )
+    done_statements, started_when = 0, datetime.now()
 
     if dry_run:
         logger.warning("DRY RUN: we will simulate the deployment.")
@@ -100,6 +93,7 @@ def cmd_pkg_deploy(
             if ctx.get_checkpoint(file_chk):
                 logger.warning(f"   +-- skip file: {file.file}")
                 logger.log("TERADATA", f"--+ skip file: {file.file}")
+                total_statements -= file.statement_count or 0
                 continue
 
             logger.info(f"   +-- deploy file: {file.file}")
@@ -121,6 +115,15 @@ def cmd_pkg_deploy(
             prev_db = file.default_db
             ctx.set_checkpoint(file_chk)
 
+            # progress, based on number of statements
+            done_statements += file.statement_count or 0
+            if total_statements and done_statements:
+                eta = ctx.eta(total_statements, done_statements, started_when)
+                logger.info(
+                    f"   +-- {done_statements}/{total_statements} statements"
+                    f" deployed, ETA={eta:%Y-%m-%d %H:%M:%S}"
+                )
+
         # force logoff
         ext.dispose()
         ctx.set_checkpoint(stp_chk)
@@ -132,6 +135,73 @@ def cmd_pkg_deploy(
     ctx.done()
 
 
+def cmd_pkg_validate(
+    pkg_path: Path,
+    *,
+    cfg: config_model.Config,
+    workers: int | None = None,
+    environment: str | None = None,
+) -> fsequencer.DeploymentBatch:
+    """
+    Tokenizes all files of the package (in a process pool), before it is deployed.
+
+    Args:
+        pkg_path (Path): Path to the package.
+        cfg (config_model.Config): The config.
+        workers (int | None, optional): Number of processes. Defaults to None
+            (number of processors).
+        environment (str | None, optional): If given, placeholders of tagging
+            variables unknown in the environment are reported. Defaults to None.
+
+    Returns:
+        fsequencer.DeploymentBatch: the batch, with statement counts of all files
+
+    Raises:
+        exc.DDeployerInvalidBatch: with all parsing errors found in the package
+    """
+    root_dir = find_steps_dir(pkg_path, cfg.packager)
+    tgr: tagger.Tagger | None = None
+    if environment is not None:
+        env_cfg = get_environment_from_config(cfg, environment)
+        tgr = tagger.Tagger(
+            variables=env_cfg.tagging_variables,
+            rules=env_cfg.tagging_rules,
+            tagging_strip_db_with_no_rules=env_cfg.tagging_strip_db_with_no_rules,
+        )
+    logger.info(f"scanning steps dir: {root_dir}")
+    return fsequencer.create_batch(root_dir, tgr, validate=True, workers=workers)
+
+
+def find_steps_dir(pkg_path: Path, pkg_cfg: config_model.PackagerConfig) -> Path:
+    """
+    Finds the subdirectory of the package, where steps of the deployment are.
+
+    Args:
+        pkg_path (Path): Path to the package.
+        pkg_cfg (config_model.PackagerConfig): Config of the packager.
+
+    Returns:
+        Path: the directory
+
+    Raises:
+        exc.DOperationsError: if the directory does not exist
+    """
+    # use case insensitive search, if switched on in config
+    logger.info(f"look for {pkg_cfg.steps_subdir} under {pkg_path}")
+    if pkg_cfg.case_insensitive_dirs:
+        subdirs = case_insensitive_search(pkg_path, pkg_cfg.steps_subdir)
+        if subdirs is None:
+            raise exc.DOperationsError(f"subdir not found: {pkg_cfg.steps_subdir}")
+        root_dir = pkg_path / subdirs
+    else:
+        root_dir = pkg_path / pkg_cfg.steps_subdir
+
+    # sanity check
+    if not root_dir.is_dir():
+        raise exc.DOperationsError(f"directory not found: {root_dir}")
+    return root_dir
+
+
 def _path_to_directories(path: Path) -> list[str]:
     """
     Breaks down a path into its individual directory components.
@@ -211,8 +281,6 @@ def deploy_script_with_conflict_strategy(
         if script_file.default_db is None:
             logger.warning(f"unknown default database for {script_file.file}")
 
-    # read deployment content
-    script = script_file.file.read_text(encoding=encoding)
     errs = []
     if if_exists is not None:
         if if_exists not in _DEPLOYMENT_STRATEGIES:
@@ -229,13 +297,29 @@ def deploy_script_with_conflict_strategy(
     #
     # FIXME: this needs to be checked with ANSI semantics and DML statements.
     # FIXME: maybe? for procedures, tokenize, but handle BEGIN/END statements in the script?
-    if object_type == meta_model.PROCEDURE:
-        statements = [script]
+    #
+    # Large scripts are tokenized while being deployed, see tokenizer.tokenize_file;
+    # if the existing object is dropped (or renamed) first, the whole script
+    # is tokenized beforehand, so that a parsing error does not leave it dropped.
+    if object_type in meta_model.ONE_STATEMENT_TYPES:
+        statements = [script_file.file.read_text(encoding=encoding)]
     else:
-        statements = [s.statement for s in tokenizer.tokenize_statements(script)]
+        bteq = object_type == meta_model.GENERIC_BTEQ
+        if (
+            if_exists in _DESTRUCTIVE_STRATEGIES
+            and script_file.file.stat().st_size > tokenizer.STREAMING_THRESHOLD
+        ):
+            logger.debug(f"tokenizing {script_file.file.as_posix()} before deployment")
+            for _ in tokenizer.tokenize_file(
+                script_file.file, encoding=encoding, bteq=bteq
+            ):
+                pass
+        statements = tokenizer.sql_statements(
+            tokenizer.tokenize_file(script_file.file, encoding=encoding, bteq=bteq)
+        )
 
     # FIXME: this only allows for checkpoint with granularity per file, do we want to prep checkpoints per statement ???
-    statements = [tgr.expand_statement(s) for s in statements]
+    statements = (tgr.expand_statement(s) for s in statements)
 
     # check the existence of the object based on the conflict strategy
     obj: meta_model.IdentifiedObject | None = None
@@ -85,18 +85,21 @@ def scan_env(
         logger.info(f"got: {len(dbs_in_scope)} databases")
 
     # extract
-    all_objects: list[meta_model.IdentifiedObject] = []
-
-    for i, database in enumerate(dbs_in_scope, start=1):
+    # we need to get list of objects here, because incremental extraction
+    # drops nonexisting objects - DO NOT SKIP THIS
+    databases_to_scan: list[str] = []
+    for database in dbs_in_scope:
         if only_databases is not None:
             if database.database_name.upper() not in only_databases:
                 logger.debug(f"skipping database: {database.database_name}")
                 continue
-        # we need to get list of objects here, because incremental extraction
-        # drops nonexisting objects - DO NOT SKIP THIS
-        logger.info(f"scan: {database.database_name} - (#{i}/{len(dbs_in_scope)})")
-        all_objects.extend(ext.get_object_list(database_name=database.database_name))
-        logger.trace(len(all_objects))
+        databases_to_scan.append(database.database_name)
+
+    logger.info(f"scan: {len(databases_to_scan)} databases")
+    all_objects: list[meta_model.IdentifiedObject] = list(
+        ext.get_object_list_many(databases_to_scan)
+    )
+    logger.info(f"scan: got {len(all_objects)} objects")
 
     # limit the scope whenever asked
     for obj in all_objects:
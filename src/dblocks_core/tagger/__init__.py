@@ -1,7 +1,6 @@
+import functools
 import re
 
-from attrs import frozen
-
 from dblocks_core import exc
 from dblocks_core.config.config import logger
 from dblocks_core.model import meta_model
@@ -11,12 +10,6 @@ RE_DOT = r"\."
 RE_QUOTE = '"'
 
 
-@frozen
-class _Pattern:
-    pattern: re.Pattern
-    replacement: str
-
-
 class Tagger:
     def __init__(
         self,
@@ -31,7 +24,12 @@ class Tagger:
         self.matching_rules = [_matching_rule(r, variables) for r in rules]
         self.replacement_rules = [_replacement_rule(r) for r in rules]
         self.database_replacements: dict[str, str] = {}
-        self.replacement_regexps: list[_Pattern] = []
+        # all tagged databases in one pattern, see build
+        self._replacement_regexp: re.Pattern | None = None
+        self._replacement_lookup: dict[str, str] = {}
+        # database name => regex that strips the database, see _strip_database
+        self._strip_regexps: dict[str, re.Pattern] = {}
+        self._variable_regexp = _variable_regexp(variables)
         logger.debug(f"{self.matching_rules=}")
         logger.debug(f"{self.replacement_rules=}")
         self._check()
@@ -52,13 +50,58 @@ class Tagger:
             )
             raise exc.DConfigError(message)
 
-    def expand_statement(self, statement: str | None) -> str:
+    def expand_statement(self, statement: str | None, *, strict: bool = False) -> str:
+        """Replaces {{variable}} placeholders by values of tagging variables.
+
+        Args:
+            statement (str | None): the statement (or any text)
+            strict (bool, optional): raise an error on placeholders of unknown
+                variables, and of variables whose value contains a placeholder.
+                Defaults to False (such placeholders are kept).
+
+        Returns:
+            str: the expanded statement
+
+        Raises:
+            exc.DConfigError: in strict mode, if the statement contains unknown
+                placeholders, or placeholders are left after the expansion
+
+        Behavior:
+        - The statement is scanned once, regardless of number of variables.
+        - Values of variables are not expanded again, a value that contains
+          a placeholder (`{"a": "{{b}}"}`) is written as is.
+        """
         if not statement:
             return ""
-        new_statement = statement  # type: ignore
-        for name, value in self.variables.items():
-            search_for = "{{" + name + "}}"
-            new_statement = new_statement.replace(search_for, value)
+        if "{{" not in statement:
+            return statement
+
+        unknown: set[str] = set()
+        chained: set[str] = set()
+
+        def _expand(match: re.Match) -> str:
+            try:
+                value = self.variables[match.group(1)]
+            except KeyError:
+                unknown.add(match.group(1))
+                return match.group(0)
+            if strict and "{{" in value and self._variable_regexp.search(value):
+                chained.add(match.group(1))
+            return value
+
+        new_statement = self._variable_regexp.sub(_expand, statement)
+        if strict and (unknown or chained):
+            errors = []
+            if unknown:
+                errors.append(
+                    "unknown tagging variables: " + ", ".join(sorted(unknown))
+                )
+            if chained:
+                errors.append(
+                    "values of tagging variables contain placeholders "
+                    "(they are not expanded): " + ", ".join(sorted(chained))
+                )
+            raise exc.DConfigError("; ".join(errors))
         return new_statement
 
     def tag_object(
@@ -108,21 +151,48 @@ class Tagger:
 
         # case 1: the tagger is set to have replacement rules
         if len(self.replacement_rules) > 0:
-            for rule in self.replacement_regexps:
-                pattern, replacement = rule.pattern, rule.replacement
-                statement = pattern.sub(replacement, statement)
+            if self._replacement_regexp is not None:
+                statement = self._replacement_regexp.sub(self._replace, statement)
             return statement
 
         # case 2: the tagger is NOT set to have replacement rule
         #         but is set to have both database and object name
         if self.tagging_strip_db_with_no_rules and database_name and object_name:
-            tr = re.compile(f'"?{database_name}"?\\s*[.]\\s*("?{object_name}"?)', re.I)
-            statement = tr.sub(r"\1", statement)
-            return statement
+            return self._strip_database(statement, database_name, object_name)
 
         # giving up
         return statement
 
+    def _strip_database(
+        self,
+        statement: str,
+        database_name: str,
+        object_name: str,
+    ) -> str:
+        """Removes the database name from references to the object,
+        "db"."object" => "object" (case insensitive).
+
+        The regex is compiled once per database, the name of the object is checked
+        on each match (without a regex).
+        """
+        try:
+            pattern = self._strip_regexps[database_name]
+        except KeyError:
+            pattern = re.compile(f'"?{re.escape(database_name)}"?\\s*[.]\\s*', re.I)
+            self._strip_regexps[database_name] = pattern
+
+        object_name = object_name.lower()
+        quoted_name = RE_QUOTE + object_name
+
+        def _strip(match: re.Match) -> str:
+            end = match.end()
+            follows = match.string[end : end + len(quoted_name)].lower()
+            if follows.startswith(object_name) or follows == quoted_name:
+                return ""
+            return match.group(0)
+
+        return pattern.sub(_strip, statement)
+
     def build(self, databases: list[str], *, flags=re.I):
         """Create list of tagged databases.
 
@@ -130,37 +200,36 @@ class Tagger:
             databases (list[str]): list of databases
             flags (_type_, optional): re.flags. Defaults to re.I.
         """
-        self.database_replacements = {db: "" for db in databases}
-
-        for db in databases:
-            for i, mrule in enumerate(self.matching_rules):
-                if re.fullmatch(mrule, db, flags=flags):
-                    self.database_replacements[db] = re.sub(
-                        mrule,
-                        self.replacement_rules[i],
-                        db,
-                        flags=flags,
-                    )
-                    break
-
-        # keep only those databases that can effectively be replaced
-        self.database_replacements = {
-            db: tagged_db
+        self.database_replacements = dict(
+            _tag_databases(
+                tuple(self.matching_rules),
+                tuple(self.replacement_rules),
+                tuple(databases),
+                flags,
+            )
+        )
+
+        # prepare one regex for all databases, in form of db. => tagged_db
+        # - DB. => env. - simple replacement, no quoting of names
+        # - "DB". => "env".
+        # the tagged database is looked up by the (case insensitive) name
+        self._replacement_lookup = {
+            db.lower(): tagged_db
             for db, tagged_db in self.database_replacements.items()
-            if tagged_db
         }
+        if self._replacement_lookup:
+            self._replacement_regexp = _replacement_regexp(
+                tuple(self._replacement_lookup)
+            )
+        else:
+            self._replacement_regexp = None
 
-        # prepare regex in form of db. => tagged_db
-        for db, tagged_db in self.database_replacements.items():
-            # DB. => env. - simple replacement, no quoting of names
-            pattern = re.compile(f"(^|\\s+){db}{RE_DOT}", re.I)
-            replacement = f"\\1{tagged_db}."
-            self.replacement_regexps.append(_Pattern(pattern, replacement))
-
-            # "DB". => "env".
-            pattern = re.compile(f"(^|\\s+){RE_QUOTE}{db}{RE_QUOTE}{RE_DOT}", re.I)
-            replacement = f"\\1{RE_QUOTE}{tagged_db}{RE_QUOTE}."
-            self.replacement_regexps.append(_Pattern(pattern, replacement))
+    def _replace(self, match: re.Match) -> str:
+        if (db := match.group("db")) is not None:
+            return f"{match.group(1)}{self._replacement_lookup[db.lower()]}."
+        db = match.group("quoted_db")
+        tagged_db = self._replacement_lookup[db.lower()]
+        return f"{match.group(1)}{RE_QUOTE}{tagged_db}{RE_QUOTE}."
 
     def tag_database(self, database: str) -> str:
         try:
@@ -170,6 +239,101 @@ class Tagger:
             return database
 
 
+@functools.lru_cache(maxsize=16)
+def _tag_databases(
+    matching_rules: tuple[str, ...],
+    replacement_rules: tuple[str, ...],
+    databases: tuple[str, ...],
+    flags: int,
+) -> tuple[tuple[str, str], ...]:
+    """Returns (database, tagged database) pairs, for databases matched by a rule.
+
+    Results are cached, so that taggers of the same environment, created
+    repeatedly in one process, do not have to match the databases again.
+
+    Behavior:
+    - All rules are combined in one regex, each rule in a named group, so that
+      each database is matched once; the first matching rule wins.
+    - The tagged database is produced by the (precompiled) matching rule.
+    - Databases tagged to an empty string are left out.
+    """
+    if not matching_rules:
+        return ()
+    rules = [re.compile(rule, flags) for rule in matching_rules]
+    combined = re.compile(
+        "|".join(f"(?P<_rule{i}>{rule})" for i, rule in enumerate(matching_rules)),
+        flags,
+    )
+
+    tagged = {}
+    for db in databases:
+        if (match := combined.fullmatch(db)) is None:
+            continue
+        i = int(match.lastgroup.removeprefix("_rule"))  # type: ignore
+        tagged_db = rules[i].fullmatch(db).expand(replacement_rules[i])  # type: ignore
+        if tagged_db:
+            tagged[db] = tagged_db
+    return tuple(tagged.items())
+
+
+@functools.lru_cache(maxsize=16)
+def _replacement_regexp(databases: tuple[str, ...]) -> re.Pattern:
+    """Returns regex that matches db. or "db". for any of the databases
+    (the names are expected in lower case, the regex is case insensitive)."""
+    names = _trie_pattern(list(databases))
+    return re.compile(
+        f"(^|\\s+)(?:(?P<db>{names}){RE_DOT}"
+        f"|{RE_QUOTE}(?P<quoted_db>{names}){RE_QUOTE}{RE_DOT})",
+        re.I,
+    )
+
+
+def _trie_pattern(names: list[str]) -> str:
+    """Returns regex that matches any of the names, with common prefixes factored
+    out (a trie), so that the regex engine does not try each name one by one.
+
+    Args:
+        names (list[str]): the names, must not be empty
+
+    Returns:
+        str: the pattern (without groups), for example "a(?:b|c)" for ["ab", "ac"]
+    """
+    trie: dict = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of the name
+
+    def _pattern(node: dict) -> str:
+        ends = "" in node
+        branches = [
+            re.escape(char) + _pattern(child)
+            for char, child in sorted(node.items())
+            if char != ""
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not ends:
+            return branches[0]
+        alternation = "(?:" + "|".join(branches) + ")"
+        return alternation + "?" if ends else alternation
+
+    return _pattern(trie)
+
+
+def _variable_regexp(variables: dict[str, str]) -> re.Pattern:
+    """Returns regex that matches {{name}}, the name is in group 1."""
+    # names of variables are usually words, but other names are supported, too
+    others = sorted(
+        (re.escape(name) for name in variables if not re.fullmatch(r"\w+", name)),
+        key=len,
+        reverse=True,
+    )
+    names = "|".join(others + [r"\w+"])
+    return re.compile(r"\{\{(" + names + r")\}\}")
+
+
 def _matching_rule(rule: str, variables: dict[str, str]):
     rule = rule.replace("%", "(.*)")
     for k, v in variables.items():
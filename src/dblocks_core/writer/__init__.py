@@ -1,7 +1,13 @@
+from pathlib import Path
+
 from dblocks_core.model import config_model
 from dblocks_core.writer import fsystem
 from dblocks_core.writer.contract import AbstractWriter
 
 
-def create_writer(cfg: config_model.WriterParameters) -> AbstractWriter:
-    return fsystem.FSWriter(cfg)
+def create_writer(
+    cfg: config_model.WriterParameters,
+    *,
+    manifest_file: Path | None = None,
+) -> AbstractWriter:
+    return fsystem.FSWriter(cfg, manifest_file=manifest_file)
@@ -52,6 +52,29 @@ class AbstractWriter(ABC):
         """
         ...
 
+    @abstractmethod
+    def is_unchanged(self, obj: meta_model.IdentifiedObject) -> bool:
+        """Returns True if the object was written before, and it has not changed
+        in the database since then (based on its create/last alter timestamps).
+
+        Args:
+            obj (meta_model.IdentifiedObject): the object in question
+        """
+        ...
+
+    @abstractmethod
+    def save_manifest(self):
+        """Persists fingerprints of all written objects."""
+        ...
+
+    @abstractmethod
+    def pop_changed_paths(self) -> list[Path]:
+        """Returns paths written or deleted since the last call, and forgets them.
+
+        Used to stage changes in git, without scanning the whole repository.
+        """
+        ...
+
     @abstractmethod
     def path_to_object(
         self,
@@ -1,9 +1,11 @@
+import hashlib
 import json
 import os
 from pathlib import Path
 from typing import Iterable
 
 import cattrs
+from attrs import define, field
 
 from dblocks_core.config import config
 from dblocks_core.config.config import logger
@@ -81,15 +83,141 @@ EXT_TO_STEP = {
 
 UTF8 = "utf-8"
 
+# fingerprints of written objects, stored out of the working tree of the repo
+# (see manifest_file), so that they are never part of the metadata
+MANIFEST_SUFFIX = ".dbe-manifest.json"
+
+# manifest written by previous versions, inside the target directory
+_LEGACY_MANIFEST_FILE = "dbe-manifest.json"
+
+
+def manifest_file(state_dir: Path, environment: str) -> Path:
+    """Returns path of the manifest of the environment.
+
+    Args:
+        state_dir (Path): directory for files of the tool that are not versioned,
+            the .git directory of the repository, or the context directory
+        environment (str): name of the environment
+    """
+    return state_dir / "dbe" / (environment + MANIFEST_SUFFIX)
+
+
+def _fingerprint_key(obj: meta_model.IdentifiedObject) -> str:
+    return f"{obj.database_name}.{obj.object_name}".upper()
+
+
+def _ddl_hash(ddl_script: str) -> str:
+    return hashlib.sha256(ddl_script.encode(UTF8)).hexdigest()
+
+
+def _isoformat(dt) -> str | None:
+    return dt.isoformat() if dt is not None else None
+
+
+@define
+class WriteStats:
+    """
+    Counts of objects handled by the writer.
+
+    Attributes:
+        new (int): objects written to a new file
+        written (int): objects whose file was rewritten, because the DDL changed
+        unchanged (int): objects whose file already had the same content (not written)
+    """
+
+    new: int = field(default=0)
+    written: int = field(default=0)
+    unchanged: int = field(default=0)
+
+    def __str__(self) -> str:
+        return (
+            f"writer: {self.new} new, {self.written} written,"
+            f" {self.unchanged} unchanged files"
+        )
+
 
 class FSWriter(AbstractWriter):
-    def __init__(self, cfg: config_model.WriterParameters):
+    def __init__(
+        self,
+        cfg: config_model.WriterParameters,
+        *,
+        manifest_file: Path | None = None,
+    ):
         self.target_dir: Path = cfg.target_dir
         logger.debug(f"{self.target_dir=}")
         self.encoding: str = cfg.encoding
         logger.debug(f"{self.encoding=}")
         self.errors: str = cfg.errors
         logger.debug(f"{self.errors=}")
+        # the manifest is not persisted if no file is given (full extraction)
+        self.manifest_file: Path | None = manifest_file
+        logger.debug(f"{self.manifest_file=}")
+        self._manifest: dict[str, meta_model.ObjectFingerprint] | None = None
+        self.write_stats = WriteStats()
+        self._changed_paths: set[Path] = set()
+
+    @property
+    def manifest(self) -> dict[str, meta_model.ObjectFingerprint]:
+        """Fingerprints of written objects, loaded from the manifest file on first use."""
+        if self._manifest is None:
+            self._manifest = self._load_manifest()
+        return self._manifest
+
+    def _load_manifest(self) -> dict[str, meta_model.ObjectFingerprint]:
+        if self.manifest_file is None:
+            return {}
+        manifest_file = self.manifest_file
+        if not manifest_file.is_file():
+            manifest_file = self.target_dir / _LEGACY_MANIFEST_FILE
+        try:
+            data = json.loads(manifest_file.read_text(encoding=UTF8))
+        except FileNotFoundError:
+            logger.debug(f"manifest not found: {self.manifest_file.as_posix()}")
+            return {}
+        except json.JSONDecodeError:
+            logger.warning(f"invalid manifest, ignored: {manifest_file.as_posix()}")
+            return {}
+        return cattrs.structure(data, dict[str, meta_model.ObjectFingerprint])
+
+    def save_manifest(self):
+        """Writes fingerprints of all written objects to the manifest file;
+        removes the manifest written inside the target directory by previous
+        versions. Does nothing if the writer has no manifest file."""
+        if self._manifest is None or self.manifest_file is None:
+            return
+        data = cattrs.unstructure(dict(sorted(self._manifest.items())))
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        self.manifest_file.write_text(json.dumps(data, indent=4), encoding=UTF8)
+
+        legacy_file = self.target_dir / _LEGACY_MANIFEST_FILE
+        if legacy_file.is_file():
+            legacy_file.unlink()
+            self._changed_paths.add(legacy_file)
+
+    def pop_changed_paths(self) -> list[Path]:
+        """Returns absolute paths written or deleted since the last call."""
+        paths, self._changed_paths = self._changed_paths, set()
+        return sorted(p.resolve() for p in paths)
+
+    def is_unchanged(self, obj: meta_model.IdentifiedObject) -> bool:
+        """Returns True if the object was written before, its timestamps did not
+        change since then, and the file still has the content that was written
+        (it was not changed or deleted by hand).
+
+        Args:
+            obj (meta_model.IdentifiedObject): the object in question
+        """
+        try:
+            fingerprint = self.manifest[_fingerprint_key(obj)]
+        except KeyError:
+            return False
+        if (
+            fingerprint.create_datetime != _isoformat(obj.create_datetime)
+            or fingerprint.last_alter_datetime != _isoformat(obj.last_alter_datetime)
+        ):
+            return False
+        ddl_script = self._read_existing(self.target_dir / fingerprint.path)
+        return ddl_script is not None and _ddl_hash(ddl_script) == fingerprint.ddl_hash
 
     def drop_nonex_objects(
         self,
@@ -104,15 +232,20 @@ class FSWriter(AbstractWriter):
             existing_objects (Iterable[meta_model.IdentifiedObject]): list of
                 all objects that exist
         """
+        existing_objects = list(existing_objects)
         tags = {d.database_name.lower(): d for d in tagged_databases}
         tags_in_scope = {d.database_tag.lower() for d in databases_in_scope}
 
-        tagged_objects = set()
+        # where each existing object is expected to be, keyed the same way
+        # as the index of managed files
+        expected_paths: dict[tuple[str, str, str], str] = {}
         for obj in existing_objects:
             try:
-                database_tag = tags[obj.database_name.lower()].database_tag
+                database = tags[obj.database_name.lower()]
+                database_tag = database.database_tag
+                parent_tags_in_scope = database.parent_tags_in_scope
             except KeyError:
-                database_tag = obj.database_name
+                database_tag, parent_tags_in_scope = obj.database_name, []
 
             try:
                 ext = TYPE_TO_EXT[obj.object_type]
@@ -120,34 +253,68 @@ class FSWriter(AbstractWriter):
                 raise NotImplementedError(
                     f"can not get expected extension for: {obj.object_type}"
                 ) from None
-            expected_path = f"{database_tag.lower()}/{obj.object_name.lower()}{ext}"  # type: ignore
-            tagged_objects.add(expected_path)
+            subpath = self.standardize_subpath(database_tag, parent_tags_in_scope)
+            expected_path = (subpath / f"{obj.object_name.lower()}{ext}").relative_to(
+                self.target_dir
+            )
+            key = (database_tag.lower(), obj.object_name.lower(), obj.object_type)
+            expected_paths[key] = expected_path.as_posix().lower()
             logger.trace(expected_path)
 
-        for file in self.target_dir.rglob("*.*"):
-            # rglob returns also dirs, skip them
-            if not file.is_file():
-                continue
-            # skip files that are not managed by this tool
-            if file.suffix.lower() not in EXT_TO_TYPE:
-                continue
+        # forget fingerprints of objects that no longer exist
+        existing_keys = {_fingerprint_key(obj) for obj in existing_objects}
+        for key in [k for k in self.manifest if k not in existing_keys]:
+            logger.trace(f"drop fingerprint: {key}")
+            del self.manifest[key]
 
+        for key, paths in self._index_managed_files().items():
             # skip the object if the db was skipped
-            db_tag = file.parent.name.lower()
-            is_object = db_tag + "/" + file.name.lower()
-
-            if db_tag not in tags_in_scope:
-                logger.trace(is_object)
+            if key[0] not in tags_in_scope:
                 continue
 
-            # skip the file if the object in question exists
-            if is_object in tagged_objects:
-                logger.trace(is_object)
-                continue
+            # drop the file if the object does not exist, or if it is not where
+            # it should be (the database was moved to another parent)
+            expected_path = expected_paths.get(key)
+            for path in paths:
+                if path.lower() == expected_path:
+                    continue
+                logger.debug(f"drop file: {path}")
+                (self.target_dir / path).unlink(missing_ok=True)
+                self._changed_paths.add(self.target_dir / path)
 
-            # drop the file
-            logger.debug(f"drop file: {file.as_posix()}")
-            file.unlink(missing_ok=True)
+    def _index_managed_files(self) -> dict[tuple[str, str, str], list[str]]:
+        """Returns all files managed by this tool, in a single pass of the target dir.
+
+        Returns:
+            dict[tuple[str, str, str], list[str]]: relative paths of the files, keyed
+                by (database tag, object name, object type); the tag is the name
+                of the parent directory, and the same object can be stored
+                in more than one directory (nested layout of databases)
+        """
+        index: dict[tuple[str, str, str], list[str]] = {}
+        directories = [self.target_dir]
+        while directories:
+            directory = directories.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(Path(entry.path))
+                    continue
+                stem, suffix = os.path.splitext(entry.name)
+                try:
+                    object_type = EXT_TO_TYPE[suffix.lower()]
+                except KeyError:
+                    # skip files that are not managed by this tool
+                    continue
+                if not entry.is_file():
+                    continue
+                key = (Path(directory).name.lower(), stem.lower(), object_type)
+                path = Path(entry.path).relative_to(self.target_dir).as_posix()
+                index.setdefault(key, []).append(path)
+        return index
 
     def write_databases(
         self,
@@ -165,6 +332,7 @@ class FSWriter(AbstractWriter):
         text = json.dumps(data, indent=4)
         tf = self.target_dir / f"{env_name}-databases.json"
         tf.write_text(text, encoding=UTF8)
+        self._changed_paths.add(tf)
 
     def path_to_object(
         self,
@@ -227,11 +395,32 @@ class FSWriter(AbstractWriter):
             if new_ddl_script is not None:
                 ddl_script = new_ddl_script
 
-        # ddl skript
-        target_file.write_text(
-            ddl_script,
-            encoding=self.encoding,
-            errors=self.errors,
+        # ddl skript - skip the write if the file already has the same content,
+        # so that mtime of the file does not change (and git does not rescan it)
+        existing_script = self._read_existing(target_file)
+        if existing_script is None:
+            self.write_stats.new += 1
+        elif existing_script == ddl_script:
+            self.write_stats.unchanged += 1
+            logger.trace(f"unchanged: {target_file.as_posix()}")
+        else:
+            self.write_stats.written += 1
+        if existing_script != ddl_script:
+            target_file.write_text(
+                ddl_script,
+                encoding=self.encoding,
+                errors=self.errors,
+            )
+            self._changed_paths.add(target_file)
+        self.manifest[_fingerprint_key(obj.identified_object)] = (
+            meta_model.ObjectFingerprint(
+                path=target_file.relative_to(self.target_dir).as_posix(),
+                create_datetime=_isoformat(obj.identified_object.create_datetime),
+                last_alter_datetime=_isoformat(
+                    obj.identified_object.last_alter_datetime
+                ),
+                ddl_hash=_ddl_hash(ddl_script),
+            )
         )
 
         # call plugins after
@@ -244,6 +433,13 @@ class FSWriter(AbstractWriter):
             )
             plugin_instance.after(target_file, obj)
 
+    def _read_existing(self, target_file: Path) -> str | None:
+        """Returns content of the file, None if it does not exist or can not be read."""
+        try:
+            return target_file.read_text(encoding=self.encoding, errors=self.errors)
+        except (FileNotFoundError, UnicodeDecodeError):
+            return None
+
     def _get_statements(
         self,
         object: meta_model.DescribedObject,
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+
+from dblocks_core.dbi import AsyncDBIAdapter
+from dblocks_core.model import meta_model
+from dblocks_core.script.workflow import cmd_extraction
+
+
+class _BlockingDBI:
+    """Blocking fake driver; each request waits until `parallel` requests are
+    in flight, so the calls can only finish if they run concurrently."""
+
+    def __init__(self, parallel: int):
+        self.disposed = False
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._barrier = threading.Barrier(parallel, timeout=10)
+        self._lock = threading.Lock()
+
+    def _request(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            self._barrier.wait()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def get_described_object(self, obj):
+        self._request()
+        return meta_model.DescribedObject(identified_object=obj)
+
+    def get_described_objects(self, objects):
+        self._request()
+        return [meta_model.DescribedObject(identified_object=o) for o in objects]
+
+    def dispose(self):
+        self.disposed = True
+
+
+def _objects(count):
+    return [
+        meta_model.IdentifiedObject(
+            database_name="db",
+            object_name=f"t{i}",
+            object_type=meta_model.TABLE,
+            platform_object_type="T",
+            create_datetime=None,
+            last_alter_datetime=None,
+            creator_name=None,
+            last_alter_name=None,
+        )
+        for i in range(count)
+    ]
+
+
+def test_async_adapter_concurrency():
+    fake = _BlockingDBI(parallel=50)
+    adbi = AsyncDBIAdapter(fake, concurrency=50)
+    objects = _objects(100)
+
+    async def _describe_all():
+        return await asyncio.gather(*(adbi.get_described_object(o) for o in objects))
+
+    got = asyncio.run(_describe_all())
+
+    assert [d.identified_object for d in got] == objects
+    assert fake.max_in_flight == 50
+
+    adbi.dispose()
+    assert fake.disposed
+
+
+def test_describe_objects_async():
+    fake = _BlockingDBI(parallel=5)
+    adbi = AsyncDBIAdapter(fake, concurrency=5)
+    objects = _objects(100)
+
+    # 25 batches, 5 of them in flight
+    got = list(cmd_extraction.describe_objects(adbi, objects, workers=5, batch_size=4))
+
+    assert [d.identified_object for d in got] == objects
+    assert fake.max_in_flight == 5
+    adbi.dispose()
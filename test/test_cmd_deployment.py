@@ -0,0 +1,37 @@
+import pytest
+
+from dblocks_core import exc, tagger
+from dblocks_core.deployer import tokenizer
+from dblocks_core.script.workflow import cmd_deployment
+
+
+class _RecordingDBI:
+    def __init__(self):
+        self.calls = []
+
+    def get_identified_object(self, database_name, object_name, object_type):
+        return object_name
+
+    def drop_identified_object(self, obj, ignore_errors=False):
+        self.calls.append(("drop", obj))
+
+    def rename_identified_object(self, obj, new_name, ignore_errors=False):
+        self.calls.append(("rename", obj))
+
+    def deploy_statements(self, statements):
+        self.calls.append(("deploy", list(statements)))
+
+
+@pytest.mark.parametrize("if_exists", ["drop", "rename"])
+def test_streamed_script_is_tokenized_before_drop(tmp_path, monkeypatch, if_exists):
+    monkeypatch.setattr(tokenizer, "STREAMING_THRESHOLD", 0)
+    file = tmp_path / "tab.tab"
+    file.write_text("create table db.tab (a int);\nselect 'unterminated;\n")
+    ext = _RecordingDBI()
+    tgr = tagger.Tagger(variables={}, rules=[], tagging_strip_db_with_no_rules=False)
+
+    with pytest.raises(exc.DParsingError):
+        cmd_deployment.deploy_file(
+            file, "db", "tab", if_exists=if_exists, tgr=tgr, ext=ext
+        )
+    assert ext.calls == []
@@ -0,0 +1,146 @@
+import os
+import random
+import threading
+import time
+
+import cattrs
+import pytest
+from loguru import logger
+
+from dblocks_core import context, writer
+from dblocks_core.git import git
+from dblocks_core.model import config_model, meta_model
+from dblocks_core.script.workflow import cmd_extraction
+
+
+class _SlowDBI:
+    def get_described_object(self, obj):
+        time.sleep(random.random() / 100)
+        if obj.object_name == "dropped":
+            return None
+        return meta_model.DescribedObject(identified_object=obj)
+
+    def get_described_objects(self, objects):
+        for obj in objects:
+            yield self.get_described_object(obj)
+
+
+def _objects(names):
+    return [
+        meta_model.IdentifiedObject(
+            database_name="db",
+            object_name=name,
+            object_type=meta_model.TABLE,
+            platform_object_type="T",
+            create_datetime=None,
+            last_alter_datetime=None,
+            creator_name=None,
+            last_alter_name=None,
+        )
+        for name in names
+    ]
+
+
+def test_describe_objects_keeps_order():
+    names = [f"t{i}" for i in range(50)] + ["dropped"]
+    for workers in (1, 4):
+        got = list(
+            cmd_extraction.describe_objects(
+                _SlowDBI(), _objects(names), workers=workers
+            )
+        )
+        assert got[-1] is None
+        assert [o.identified_object.object_name for o in got[:-1]] == names[:-1]
+
+
+class _FakeTagger:
+    def tag_object(self, obj):
+        if obj.identified_object.object_name == "broken":
+            raise ValueError("broken")
+        obj.basic_definition = "tagged"
+
+
+def test_tag_objects_pipeline():
+    names = [f"t{i}" for i in range(100)] + ["dropped"]
+    stats = cmd_extraction.StageStats("tag")
+    described = cmd_extraction.describe_objects(_SlowDBI(), _objects(names), workers=4)
+    got = list(
+        cmd_extraction.tag_objects(described, _FakeTagger(), queue_size=3, stats=stats)
+    )
+    assert got[-1] is None
+    assert [o.identified_object.object_name for o in got[:-1]] == names[:-1]
+    assert {o.basic_definition for o in got[:-1]} == {"tagged"}
+    assert stats.items == len(names) - 1
+
+    # errors of the stage are raised in the consumer
+    described = cmd_extraction.describe_objects(
+        _SlowDBI(), _objects(["t1", "broken", "t2"])
+    )
+    with pytest.raises(ValueError):
+        list(cmd_extraction.tag_objects(described, _FakeTagger()))
+
+
+def test_tag_objects_close_stops_the_stage():
+    names = [f"t{i}" for i in range(100)]
+    described = cmd_extraction.describe_objects(_SlowDBI(), _objects(names), workers=4)
+    tagged = cmd_extraction.tag_objects(described, _FakeTagger(), queue_size=3)
+    next(tagged)
+
+    # what run_extraction does when writing of an object fails
+    tagged.close()
+    assert not [t for t in threading.enumerate() if t.name == "dbe-tag"]
+
+
+class _DDLDBI(_SlowDBI):
+    def get_described_object(self, obj):
+        return meta_model.DescribedObject(
+            identified_object=obj,
+            basic_definition=f"create table db.{obj.object_name} (a int);",
+        )
+
+
+def test_extraction_leaves_the_repo_clean(tmp_path):
+    if os.environ.get("TEST_GIT") is None:
+        logger.warning("skip the test, set TEST_GIT=1")
+        return
+
+    repo = git.Repo(tmp_path)
+    repo.init()
+    repo.run_git_cmd("config", "user.email", "dbe@example.com")
+    repo.run_git_cmd("config", "user.name", "dbe")
+    (tmp_path / "dblocks.toml").write_text("")
+    repo.stage(["dblocks.toml"])
+    repo.commit("init")
+
+    env = config_model.EnvironParameters(
+        writer=config_model.WriterParameters(target_dir=tmp_path / "meta"),
+        host="host",
+        username="user",
+        password="password",
+        extraction=config_model.ExtractionParameters(databases=["db"]),
+        git_branch=repo.get_current_branch(),
+    )
+    database = meta_model.DescribedDatabase("db", database_tag="db")
+    env_data = meta_model.ListedEnv(
+        all_databases=[database],
+        dbs_in_scope=[database],
+        all_objects=_objects(["t1", "t2"]),
+    )
+    manifest_file = writer.fsystem.manifest_file(repo.git_dir(), "test")
+
+    # the second extraction fails if the first one left the repo dirty
+    for _ in range(2):
+        ctx = context.Context("test")
+        ctx["ENV_DATA"] = cattrs.unstructure(env_data)
+        cmd_extraction.run_extraction(
+            ctx=ctx,
+            env=env,
+            env_name="test",
+            ext=_DDLDBI(),
+            wrt=writer.create_writer(env.writer, manifest_file=manifest_file),
+            repo=repo,
+            commit=True,
+            incremental=True,
+        )
+        assert repo.run_git_cmd("status", "--porcelain").out == ""
+    assert manifest_file.is_file()
@@ -4,8 +4,9 @@ from pathlib import Path
 import pytest
 from loguru import logger
 
-from dblocks_core import exc
+from dblocks_core import dbi, exc
 from dblocks_core.config import config
+from dblocks_core.model import config_model
 
 # from dblocks_core.extractor.contract import AbstractExtractor
 # from dblocks_core.writer.contract import AbstractWriter
@@ -53,3 +54,46 @@ def test_config():
     data_str = config.cfg_to_censored_json(cfg)
     assert PASSWORD not in data_str, data_str
     assert config.REDACTED in data_str
+
+
+def _load_pool_config():
+    env_vars = {
+        f"{PFX}ENVIRONMENTS__{DBC_ENV}__PASSWORD": f"{PASSWORD}",
+    }
+    pool_config = DEFAULT_CONFIG + "pool.size = 4\npool.warm_up = 2\n"
+    with tempfile.TemporaryDirectory(suffix="dblc_test") as d:
+        config_file = Path(d) / "dblocks.toml"
+        config_file.write_text(pool_config, encoding="utf-8")
+        return config.load_config(
+            environ=env_vars,
+            setup_logger=False,
+            from_directories=[Path(d)],
+        )
+
+
+def test_pool_config():
+    cfg = _load_pool_config()
+    pool = cfg.environments[DBC_ENV].pool
+    assert pool.size == 4
+    assert pool.warm_up == 2
+    assert pool.max_overflow == 1
+    assert pool.recycle == -1
+
+    for invalid in ({"size": 0}, {"max_overflow": -1}, {"warm_up": -2}):
+        with pytest.raises(ValueError):
+            config_model.PoolParameters(**invalid)
+
+
+def test_init_warms_up_one_pool(monkeypatch):
+    cfg = _load_pool_config()
+    warmed_up = []
+    monkeypatch.setattr(dbi, "__load_config", lambda: cfg)
+    monkeypatch.setattr(dbi, "create_connect_string", lambda *args: "sqlite://")
+    monkeypatch.setattr(dbi.atexit, "register", lambda fn: None)
+    monkeypatch.setattr(dbi, "warm_up_pool", lambda e, n: warmed_up.append((e, n)))
+
+    state = dbi.init(DBC_ENV)
+
+    assert warmed_up == [(state.engine, 2)]
+    assert state.dbi.engine is state.engine
+    state.engine.dispose()
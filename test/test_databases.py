@@ -1,10 +1,16 @@
+import time
 from pathlib import Path
 
 import cattrs
 from loguru import logger
 
-from dblocks_core.model.config_model import WriterParameters
-from dblocks_core.model.meta_model import DescribedDatabase
+from dblocks_core.dbi.contract import AbstractDBI
+from dblocks_core.model.config_model import (
+    EnvironParameters,
+    ExtractionParameters,
+    WriterParameters,
+)
+from dblocks_core.model.meta_model import TABLE, DescribedDatabase, IdentifiedObject
 from dblocks_core.script.workflow import dbi
 from dblocks_core.writer import fsystem
 
@@ -83,3 +89,75 @@ def test_set_database_parents():
         Path(".") / A_PRODUCTION.lower() / A_STG_PRODUCTION.lower() / A_STO.lower()
     )
     assert subpath == expected_path
+
+
+class _LatencyDBI:
+    """Fake DBI, each round trip to the database costs some time."""
+
+    latency = 0.002
+
+    def __init__(self, databases: list[str], *, bulk: bool):
+        self.databases = databases
+        self.round_trips = 0
+        if not bulk:
+            # only the default (per-database) implementation from the contract
+            self.get_object_list_many = lambda names: AbstractDBI.get_object_list_many(
+                self, names
+            )
+
+    def get_databases(self):
+        self.round_trips += 1
+        return [
+            DescribedDatabase(database_name=db, parent_name="DBC")
+            for db in self.databases
+        ]
+
+    def _objects(self, database_name):
+        return [
+            IdentifiedObject(
+                database_name=database_name,
+                object_name=f"tab{i}",
+                object_type=TABLE,
+                platform_object_type="T",
+                create_datetime=None,
+                last_alter_datetime=None,
+                creator_name=None,
+                last_alter_name=None,
+            )
+            for i in range(3)
+        ]
+
+    def get_object_list(self, database_name, *, limit_to_type=None):
+        self.round_trips += 1
+        time.sleep(self.latency)
+        return self._objects(database_name)
+
+    def get_object_list_many(self, database_names, *, limit_to_type=None):
+        self.round_trips += 1
+        time.sleep(self.latency)
+        for database_name in database_names:
+            yield from self._objects(database_name)
+
+
+def test_scan_env_round_trips():
+    databases = [f"DB{i:03}" for i in range(100)]
+    env = EnvironParameters(
+        writer=WriterParameters(),
+        host="localhost",
+        username="dbc",
+        password="dbc",
+        extraction=ExtractionParameters(databases=databases),
+    )
+
+    results = {}
+    for bulk in (False, True):
+        ext = _LatencyDBI(databases, bulk=bulk)
+        started = time.perf_counter()
+        _, env_data = dbi.scan_env(env, ext)
+        elapsed = time.perf_counter() - started
+        logger.info(f"scan_env: {bulk=}, {ext.round_trips=}, {elapsed=:.3f}s")
+        results[bulk] = (ext.round_trips, env_data.all_objects)
+
+    assert results[False][0] == len(databases) + 1
+    assert results[True][0] == 2
+    assert results[False][1] == results[True][1]
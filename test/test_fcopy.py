@@ -0,0 +1,22 @@
+from dblocks_core.packager import fcopy
+
+
+def test_copy_files(tmp_path):
+    source_dir = tmp_path / "repo"
+    source_dir.mkdir()
+    pairs = []
+    for i in range(50):
+        source = source_dir / f"f{i}.tab"
+        source.write_text("x" * i)
+        pairs.append((source, tmp_path / "pkg" / f"step{i % 3}" / source.name))
+
+    stats = fcopy.copy_files(iter(pairs), workers=4)
+    assert stats.files == 50
+    assert stats.linked == 0
+    assert stats.bytes == sum(range(50))
+    assert all(tgt.read_text() == src.read_text() for src, tgt in pairs)
+
+    # existing files are replaced by links
+    stats = fcopy.copy_files(pairs, workers=4, hard_link=True)
+    assert stats.linked == 50
+    assert all(tgt.samefile(src) for src, tgt in pairs)
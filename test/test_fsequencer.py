@@ -1,5 +1,8 @@
 from pathlib import Path
 
+import pytest
+
+from dblocks_core import exc, tagger
 from dblocks_core.deployer import fsequencer
 from dblocks_core.model import meta_model
 
@@ -74,3 +77,41 @@ def test_sequencer1():
         fsequencer.DeploymentStatement(sql="select 3"),
     ]
     assert stmts == es
+
+
+def test_create_batch_validates_files(tmp_path: Path):
+    step = tmp_path / "10-step1"
+    (step / "db1").mkdir(parents=True)
+    (step / "1.tab").write_text("create table a (x int);\ncreate table b (y int);")
+    (step / "db1" / "v.viw").write_text("replace view v as\nselect 'x from a;")
+    (step / "db1" / "p.pro").write_text("replace procedure p() begin end;")
+
+    with pytest.raises(exc.DDeployerInvalidBatch) as err:
+        fsequencer.create_batch(tmp_path, validate=True)
+    assert "v.viw: Error at line 2: unterminated string" in str(err.value)
+
+    (step / "db1" / "v.viw").write_text("replace view v as\nselect 'x' from a;")
+    batch = fsequencer.create_batch(tmp_path, validate=True)
+    counts = {f.file.name: f.statement_count for f in batch.steps[0].files}
+    assert counts == {"1.tab": 2, "v.viw": 1, "p.pro": 1}
+
+
+def test_create_batch_reports_unknown_variables(tmp_path: Path):
+    step = tmp_path / "10-step1"
+    (step / "{{env}}_db").mkdir(parents=True)
+    (step / "1.tab").write_text("create table {{env}}_db.a (x int);")
+    db_dir = step / "{{env}}_db"
+    (db_dir / "v.viw").write_text("replace view v as select {{nope}};")
+    (db_dir / "p.pro").write_text("replace procedure {{typo}}.p() begin end;")
+    tgr = tagger.Tagger(variables={"env": "P01"}, rules=[])
+
+    # without a tagger, placeholders are not checked
+    fsequencer.create_batch(tmp_path, validate=True)
+
+    with pytest.raises(exc.DDeployerInvalidBatch) as err:
+        fsequencer.create_batch(tmp_path, tgr, validate=True)
+    errors = str(err.value).splitlines()[1:]
+    assert [e.split("/")[-1] for e in errors] == [
+        "p.pro: unknown tagging variables: typo",
+        "v.viw: unknown tagging variables: nope",
+    ]
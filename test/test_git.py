@@ -55,3 +55,80 @@ def test_git():
         assert rslt.code == 0
         assert rslt.out == "A  data.txt\n"
         assert rslt.err == ""
+
+
+def test_resolve_revision():
+    if get_environ("TEST_GIT") is None:
+        logger.warning("skip the test, set TEST_GIT=1")
+        return
+
+    with TemporaryDirectory(suffix="gittst") as tmpdir:
+        repo = git.Repo(tmpdir, persistent=True)
+        repo.init()
+        repo.run_git_cmd("config", "user.email", "dbe@example.com")
+        repo.run_git_cmd("config", "user.name", "dbe")
+        repo.checkout("main", missing_ok=True)
+        assert repo.resolve_revision("main") is None
+
+        for i in range(2):
+            (Path(tmpdir) / "file.txt").write_text(str(i))
+            repo.stage(["file.txt"])
+            repo.commit(f"commit {i}")
+            # the cache is cleared by the commit
+            sha = repo.resolve_revision("main")
+            assert sha == repo.run_git_cmd("rev-parse", "HEAD").out.strip()
+            assert repo.get_last_commit_sha() == sha
+        assert repo.get_current_branch() == "main"
+        assert repo.resolve_revision("no-such-branch") is None
+        repo.close()
+
+
+def test_parse_name_status_z():
+    output = b"M\0a\tb.tab\0R087\0old.viw\0new\nline.viw\0D\0gone.pro\0"
+    # records span chunk boundaries
+    chunks = [output[i : i + 5] for i in range(0, len(output), 5)]
+    got = list(git._parse_name_status_z(chunks))
+    assert got == [
+        ["M", "a\tb.tab"],
+        ["R087", "old.viw", "new\nline.viw"],
+        ["D", "gone.pro"],
+    ]
+
+    repo = git.Repo(Path.cwd())
+    change = repo._change_from_fields(got[1])
+    assert change.change == git.FileStatus.RENAMED
+    assert change.rename_simillarity == 87
+    assert change.rel_path == Path("new\nline.viw")
+
+    with pytest.raises(exc.DGitError):
+        list(git._parse_name_status_z([b"M\0a.tab\0D\0"]))
+
+
+def test_persistent_process_survives_commits():
+    if get_environ("TEST_GIT") is None:
+        logger.warning("skip the test, set TEST_GIT=1")
+        return
+
+    with TemporaryDirectory(suffix="gittst") as tmpdir:
+        repo = git.Repo(tmpdir, persistent=True)
+        repo.init()
+        repo.run_git_cmd("config", "user.email", "dbe@example.com")
+        repo.run_git_cmd("config", "user.name", "dbe")
+
+        shas = []
+        for i in range(3):
+            (Path(tmpdir) / f"file{i}.txt").write_text(str(i))
+            repo.stage([f"file{i}.txt"])
+            repo.commit(f"commit {i}")
+            shas.append(repo.resolve_revision("HEAD"))
+            if i == 0:
+                cat_file = repo._cat_file
+        # one process for all lookups, and it sees the new commits
+        assert repo._cat_file is cat_file
+        assert len(set(shas)) == 3
+        assert shas[-1] == repo.run_git_cmd("rev-parse", "HEAD").out.strip()
+
+        changes = repo.changes_on_commit(commit=shas[1])
+        assert [c.rel_path for c in changes] == [Path("file1.txt")]
+        assert repo.changes_on_commit(commit=shas[1]) == changes
+        repo.close()
@@ -0,0 +1,55 @@
+import os
+from pathlib import Path
+
+from loguru import logger
+
+from dblocks_core.git import git
+from dblocks_core.git.scheduler import CommitScheduler
+
+
+def test_commit_scheduler(tmp_path: Path):
+    if os.environ.get("TEST_GIT") is None:
+        logger.warning("skip the test, set TEST_GIT=1")
+        return
+
+    repo = git.Repo(tmp_path)
+    repo.init()
+    repo.run_git_cmd("config", "user.email", "dbe@example.com")
+    repo.run_git_cmd("config", "user.name", "dbe")
+
+    scheduler = CommitScheduler(repo, message_prefix="extract", max_databases=2)
+    for db in ("db1", "db2", "db3"):
+        (tmp_path / db).mkdir()
+        (tmp_path / db / "tab.tab").write_text(db)
+        scheduler.database_done(db, [tmp_path / db / "tab.tab"])
+    # not scheduled, must not be committed
+    (tmp_path / "other.txt").write_text("")
+    scheduler.close()
+
+    log = repo.run_git_cmd("log", "--format=%s").out.splitlines()
+    assert log == ["extract: db3", "extract: db1 .. db2 (2 dbs)"]
+    assert scheduler.commits == 2
+    assert repo.run_git_cmd("status", "--porcelain").out == "?? other.txt\n"
+
+
+def test_stage_missing_paths(tmp_path: Path):
+    if os.environ.get("TEST_GIT") is None:
+        logger.warning("skip the test, set TEST_GIT=1")
+        return
+
+    repo = git.Repo(tmp_path)
+    repo.init()
+    repo.run_git_cmd("config", "user.email", "dbe@example.com")
+    repo.run_git_cmd("config", "user.name", "dbe")
+    (tmp_path / "db1").mkdir()
+    (tmp_path / "db1" / "tab.tab").write_text("db1")
+    repo.stage(["db1/tab.tab"])
+    repo.commit("db1")
+
+    # deleted tracked directory, and a path that was never tracked
+    (tmp_path / "db1" / "tab.tab").unlink()
+    (tmp_path / "db1").rmdir()
+    (tmp_path / "db2.tab").write_text("db2")
+    repo.stage([tmp_path / "db1", "never-tracked.tab", tmp_path / "db2.tab"])
+    status = repo.run_git_cmd("status", "--porcelain").out
+    assert status == "D  db1/tab.tab\nA  db2.tab\n"
@@ -0,0 +1,72 @@
+import pytest
+
+from dblocks_core import exc
+from dblocks_core.deployer import stmt_cache, tokenizer
+
+
+def _statements(cache: stmt_cache.StatementCache, text: str) -> list[str]:
+    return [s.statement for s in cache.tokenize_statements(text)]
+
+
+def test_statement_cache(tmp_path):
+    file = tmp_path / "ctx" / stmt_cache.CACHE_FILE_NAME
+    script = "create table a (x int);\ncomment on a as 'a;b';"
+    expected = [s.statement for s in tokenizer.tokenize_statements(script)]
+
+    with stmt_cache.StatementCache(file) as cache:
+        assert _statements(cache, script) == expected
+        assert _statements(cache, script) == expected
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # errors are raised, and not cached
+        for _ in range(2):
+            with pytest.raises(exc.DParsingError):
+                cache.tokenize_statements("select 'a;")
+        assert cache.misses == 3
+
+    # the cache survives between runs
+    with stmt_cache.StatementCache(file) as cache:
+        assert _statements(cache, script) == expected
+        assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_statement_cache_evicts_least_recently_used(tmp_path):
+    file = tmp_path / stmt_cache.CACHE_FILE_NAME
+    scripts = [f"select {i} from t;" for i in range(3)]
+    with stmt_cache.StatementCache(file, max_bytes=150) as cache:
+        cache.tokenize_statements(scripts[0])
+        cache.tokenize_statements(scripts[1])
+        cache.tokenize_statements(scripts[0])  # most recently used
+        cache.tokenize_statements(scripts[2])  # evicts scripts[1]
+        assert cache._size <= 150
+
+        misses = cache.misses
+        cache.tokenize_statements(scripts[0])
+        cache.tokenize_statements(scripts[2])
+        assert cache.misses == misses
+        cache.tokenize_statements(scripts[1])
+        assert cache.misses == misses + 1
+
+
+def test_statement_cache_invalid_entry(tmp_path):
+    file = tmp_path / stmt_cache.CACHE_FILE_NAME
+    with stmt_cache.StatementCache(file) as cache:
+        cache.tokenize_statements("select 1;")
+        for corrupted in ('[["x", "y", "SQL"]]', '[["x", "y"]]', "not json"):
+            cache._con.execute("update statements set statements = ?", (corrupted,))
+            assert _statements(cache, "select 1;") == ["select 1;"]
+        assert cache.hits == 0
+
+
+def test_statement_cache_bteq(tmp_path):
+    text = ".SET WIDTH 200\nselect 1;\n"
+    with stmt_cache.StatementCache(tmp_path / "cache.sqlite") as cache:
+        for _ in range(2):
+            sql = cache.tokenize_statements(text)
+            bteq = cache.tokenize_statements(text, bteq=True)
+        assert (cache.hits, cache.misses) == (2, 2)
+    assert [s.type for s in sql] == [tokenizer.StatementType.SQL]
+    assert [s.type for s in bteq] == [
+        tokenizer.StatementType.BTEQ,
+        tokenizer.StatementType.SQL,
+    ]
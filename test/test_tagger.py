@@ -1,6 +1,11 @@
+import random
+import re
+from time import perf_counter
+
+import pytest
 from loguru import logger
 
-from dblocks_core import tagger
+from dblocks_core import exc, tagger
 from dblocks_core.model import meta_model
 
 
@@ -97,8 +102,7 @@ def test_tagger():
 
     logger.error(f"{tgr.database_replacements=}")
     logger.error(f"{tgr.replacement_rules=}")
-    for repl in tgr.replacement_regexps:
-        logger.error(f"replacement_regexp = {repl}")
+    logger.error(f"replacement_regexp = {tgr._replacement_regexp}")
 
     # tagging of databases does not use regexes and is case sensitive
     assert tgr.tag_database("eP_OPr") == "{{env_dbe}}_OPr"
@@ -124,3 +128,137 @@ def test_tagger():
     got = "create table {{env_dbe}}_stg.whartever {{env_dba}}"
     wanted = "create table Ep_stg.whartever aP"
     assert tgr.expand_statement(got) == wanted
+
+
+def _tag_sequentially(tgr: tagger.Tagger, statement: str) -> str:
+    # reference implementation: one pair of regexes per database
+    for db, tagged_db in tgr.database_replacements.items():
+        # DB. => env.
+        pattern = re.compile(f"(^|\\s+){re.escape(db)}\\.", re.I)
+        statement = pattern.sub(f"\\1{tagged_db}.", statement)
+        # "DB". => "env".
+        pattern = re.compile(f'(^|\\s+)"{re.escape(db)}"\\.', re.I)
+        statement = pattern.sub(f'\\1"{tagged_db}".', statement)
+    return statement
+
+
+def test_single_pass_tagging_equals_sequential():
+    rng = random.Random(42)
+    databases = [f"P01_{'ABCD'[i % 4]}_TGT_{i:04d}" for i in range(200)] + [
+        "P01_X",
+        "P01_X_TGT",
+        "P01_XY",
+    ]
+    tgr = tagger.Tagger(
+        variables={"env": "P01"},
+        rules=["{{env}}%"],
+        tagging_strip_db_with_no_rules=True,
+    )
+    tgr.build(databases=databases)
+
+    refs = databases + ["P01_UNKNOWN", "OTHER_DB", "p01_x_tgt_0001"]
+    statements = []
+    for _ in range(20):
+        parts = []
+        for _ in range(50):
+            db = rng.choice(refs)
+            db = db.lower() if rng.random() < 0.3 else db
+            parts.append(
+                rng.choice(
+                    [f"{db}.tab", f'"{db}"."tab"', f"x{db}.tab", f"{db} .tab", db]
+                )
+            )
+        statements.append("select * from " + "\n  join ".join(parts) + ";")
+
+    started = perf_counter()
+    expected = [_tag_sequentially(tgr, s) for s in statements]
+    sequential = perf_counter() - started
+
+    started = perf_counter()
+    got = [tgr.tag_statement(s, database_name="", object_name="") for s in statements]
+    single_pass = perf_counter() - started
+
+    logger.info(f"{sequential=:.3f}s, {single_pass=:.3f}s")
+    assert got == expected
+
+
+def test_strip_database_equals_per_object_regex():
+    tgr = tagger.Tagger(variables={}, rules=[], tagging_strip_db_with_no_rules=True)
+    tgr.build(databases=["adb"])
+    statements = [
+        'create table "adb"."table1" ()',
+        "CREATE TABLE ADB . TABLE1 ()",
+        "comment on adb.table1.col1 as 'adb.table1';",
+        "replace view adb.table10 as select * from xadb.table1, adb.other;",
+        'collect stats on "adb"."table1" column (adb."col");',
+        'select * from adb . "Table1" join adb.tab join bdb.table1',
+    ]
+    for statement in statements:
+        # the previous implementation, compiled for each statement
+        tr = re.compile('"?adb"?\\s*[.]\\s*("?table1"?)', re.I)
+        expected = tr.sub(r"\1", statement)
+        got = tgr.tag_statement(statement, database_name="adb", object_name="table1")
+        assert got == expected
+    assert list(tgr._strip_regexps) == ["adb"]
+
+
+def test_expand_statement():
+    tgr = tagger.Tagger(
+        variables={"env": "P01", "env-name": "prod", "x": "{{env}}"},
+        rules=[],
+    )
+    assert tgr.expand_statement(None) == ""
+    assert tgr.expand_statement("select 1") == "select 1"
+    assert (
+        tgr.expand_statement("{{env}}_TGT.t, {{env-name}}, {{unknown}}, {env}")
+        == "P01_TGT.t, prod, {{unknown}}, {env}"
+    )
+    with pytest.raises(exc.DConfigError, match="unknown, unknown2"):
+        tgr.expand_statement("{{env}}.{{unknown2}}.{{unknown}}", strict=True)
+    assert tgr.expand_statement("{{env}}.t", strict=True) == "P01.t"
+
+
+def test_expand_statement_does_not_expand_values():
+    tgr = tagger.Tagger(
+        variables={"env": "P01", "tgt": "{{env}}_TGT", "loop": "{{loop}}"},
+        rules=[],
+    )
+    # chained placeholders are kept as written in the value
+    assert tgr.expand_statement("{{tgt}}.t") == "{{env}}_TGT.t"
+    assert tgr.expand_statement("{{loop}}, {{env}}") == "{{loop}}, P01"
+
+    # strict mode reports them
+    with pytest.raises(exc.DConfigError, match="contain placeholders.*: loop, tgt"):
+        tgr.expand_statement("{{tgt}}.t, {{loop}}", strict=True)
+
+
+def test_build_matches_first_rule():
+    variables = {"env": "P01", "other": "T01"}
+    rules = ["{{env}}_%_TGT", "{{env}}%", "{{other}}_%_{{env}}%", "%_EMPTY"]
+    databases = [
+        "P01_A_TGT",
+        "p01_b_tgt",
+        "P01_STG",
+        "P01",
+        "T01_X_P01_Y",
+        "X_EMPTY",
+        "D01_A_TGT",
+    ]
+    tgr = tagger.Tagger(variables=variables, rules=rules)
+    tgr.build(databases=databases)
+
+    # the previous implementation: rule by rule, for each database
+    expected = {}
+    for db in databases:
+        for mrule, rrule in zip(tgr.matching_rules, tgr.replacement_rules):
+            if re.fullmatch(mrule, db, flags=re.I):
+                expected[db] = re.sub(mrule, rrule, db, flags=re.I)
+                break
+    expected = {db: tagged for db, tagged in expected.items() if tagged}
+    assert tgr.database_replacements == expected
+    assert tgr.database_replacements["p01_b_tgt"] == "{{env}}_b_TGT"
+
+    # the second tagger of the same environment reuses the result
+    hits = tagger._tag_databases.cache_info().hits
+    tagger.Tagger(variables=variables, rules=rules).build(databases=databases)
+    assert tagger._tag_databases.cache_info().hits == hits + 1
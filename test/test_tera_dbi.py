@@ -0,0 +1,261 @@
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+import pytest
+import teradatasql
+from sqlalchemy import exc as sa_exc
+
+from dblocks_core import exc
+from dblocks_core.dbi import tera_dbi
+
+_TableRow = namedtuple("_TableRow", ["table_name", "comment_string"])
+_ObjectRow = namedtuple(
+    "_ObjectRow",
+    [
+        "database_name",
+        "object_name",
+        "object_type",
+        "create_datetime",
+        "last_alter_datetime",
+        "creator_name",
+        "last_alter_name",
+    ],
+)
+_ColumnRow = namedtuple("_ColumnRow", ["table_name", "column_name", "comment_string"])
+_StatsRow = namedtuple("_StatsRow", ["table_name"])
+
+
+class _Result(list):
+    def fetchall(self):
+        return list(self)
+
+
+def _show_result(sql):
+    if '"dropped"' in sql:
+        cause = teradatasql.OperationalError("[Error 3807] Object does not exist.")
+        raise sa_exc.StatementError("", sql, None, cause)
+    if '"lost"' in sql:
+        cause = teradatasql.OperationalError("[Error 1000] Socket closed.")
+        raise sa_exc.StatementError("", sql, None, cause)
+    return _Result([("CREATE TABLE db.tab1 (a int);",)])
+
+
+class _FakeCursor:
+    """Driver cursor, returns one result set per statement of the request."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.result_sets = []
+
+    def execute(self, sql):
+        self.engine.queries.append(sql)
+        self.result_sets = [_show_result(stmt) for stmt in sql.splitlines()]
+
+    def fetchall(self):
+        return self.result_sets[0]
+
+    def nextset(self):
+        self.result_sets.pop(0)
+        return bool(self.result_sets)
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+        self.connection = self
+        self.dbapi_connection = self
+
+    def cursor(self):
+        return _FakeCursor(self.engine)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def rollback(self):
+        pass
+
+    def execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.engine.queries.append(sql)
+        if "databaseName in" in sql:
+            return _Result(
+                _ObjectRow(db, "tab1", "T ", datetime.now(), None, "me", None)
+                for db in params["database_names"]
+            )
+        if "dbc.statsV" in sql:
+            return _Result(_StatsRow(table_name) for table_name in self.engine.stats)
+        if "dbc.columnsV" in sql:
+            return _Result(self.engine.columns)
+        if "dbc.tablesV" in sql:
+            return _Result(self.engine.tables)
+        if sql.startswith("show stats"):
+            return _Result([("COLLECT STATISTICS COLUMN ( a ) ON db.tab1;\r",)])
+        if sql.startswith("show"):
+            return _show_result(sql)
+        raise NotImplementedError(sql)
+
+
+class _FakeEngine:
+    def __init__(self, tables=None, columns=None, stats=None):
+        self.tables = tables or []
+        self.columns = columns or []
+        self.stats = stats or []
+        self.queries = []
+        self.checkouts = 0
+
+    def connect(self):
+        self.checkouts += 1
+        return _FakeConnection(self)
+
+
+def test_bulk_metadata_comments():
+    engine = _FakeEngine(
+        tables=[_TableRow("tab1  ", "it's a table")],
+        columns=[
+            _ColumnRow("tab1", "col1", "first"),
+            _ColumnRow("tab1", "col2", "second"),
+            _ColumnRow("tab2", "col1", "other"),
+        ],
+    )
+    ext = tera_dbi.TeraDBI(engine, cfg=None, bulk_metadata=True)
+
+    assert (
+        ext.get_object_comment("db", "TAB1", object_type="TABLE")
+        == """comment on TABLE "db"."TAB1" is 'it''s a table';"""
+    )
+    assert ext.get_object_comment("db", "tab2", object_type="TABLE") is None
+
+    for table_name in ("tab1", "tab2", "tab3"):
+        ext.get_object_details("db", table_name, object_type="VIEW")
+    got = ext.get_object_details("db", "tab1", object_type="VIEW")
+    assert [c.column_name for c in got] == ["col1", "col2"]
+    assert got[0].ddl_statement == "COMMENT ON COLUMN db.tab1.col1 IS 'first';"
+
+    # one query for table comments, one for column comments,
+    # on the connection of the caller
+    assert len(engine.queries) == 2
+    assert engine.checkouts == 6
+
+
+def test_get_object_list_many():
+    engine = _FakeEngine()
+    ext = tera_dbi.TeraDBI(engine, cfg=None)
+    databases = [f"db{i}" for i in range(450)]
+
+    objects = list(ext.get_object_list_many(databases))
+
+    assert [o.database_name for o in objects] == databases
+    assert objects[0].object_type == "TABLE"
+    assert len(engine.queries) == 3
+
+
+def _identified(names):
+    return [
+        tera_dbi.meta_model.IdentifiedObject(
+            database_name="db",
+            object_name=name,
+            object_type="TABLE",
+            platform_object_type="T",
+            create_datetime=None,
+            last_alter_datetime=None,
+            creator_name=None,
+            last_alter_name=None,
+        )
+        for name in names
+    ]
+
+
+def test_describe_uses_one_connection():
+    engine = _FakeEngine(
+        tables=[_TableRow("tab1", "a table")],
+        columns=[(" a ", "a column")],
+        stats=["TAB0 ", "tab1", "tab2"],
+    )
+    ext = tera_dbi.TeraDBI(engine, cfg=None)
+    objects = _identified([f"tab{i}" for i in range(3)])
+
+    described = ext.get_described_object(objects[0])
+    assert described.basic_definition == "CREATE TABLE db.tab1 (a int);\n"
+    assert len(described.additional_details) == 2
+    assert engine.checkouts == 1
+    assert len(engine.queries) == 5
+
+    # the whole batch on one connection, one request for DDL of all objects
+    described = list(ext.get_described_objects(objects))
+    assert len(described) == 3
+    assert engine.checkouts == 2
+    assert ext.connection_stats.checkouts == 2
+    assert ext.connection_stats.statements == 15
+    assert ext.connection_stats.reuse_rate == 7.5
+
+
+def test_show_stats_only_where_defined():
+    engine = _FakeEngine(stats=["tab1"])
+    ext = tera_dbi.TeraDBI(engine, cfg=None)
+    for table_name in ("tab1", "tab2", "tab3"):
+        ext.get_object_details("db", table_name, object_type="TABLE")
+    show_stats = [q for q in engine.queries if q.startswith("show stats")]
+    assert show_stats == ['show stats on "db"."tab1";']
+
+    engine = _FakeEngine(stats=["tab1"])
+    ext = tera_dbi.TeraDBI(engine, cfg=None, extract_stats=False)
+    assert ext.get_object_details("db", "tab1", object_type="TABLE") == []
+    assert not [q for q in engine.queries if "stats" in q.lower()]
+
+
+def test_get_object_ddl_many_falls_back():
+    engine = _FakeEngine()
+    ext = tera_dbi.TeraDBI(engine, cfg=None)
+    objects = _identified([f"tab{i}" for i in range(5)] + ["dropped", "tab5"])
+
+    ddls = ext.get_object_ddl_many(objects, batch_size=4)
+
+    assert ddls[5] is None
+    assert ddls[:5] + ddls[6:] == ["CREATE TABLE db.tab1 (a int);\n"] * 6
+    # first batch in one request, second failed and was sent one by one
+    assert len(engine.queries) == 1 + 1 + 3
+
+
+def test_get_object_ddl_many_raises_other_errors():
+    engine = _FakeEngine()
+    ext = tera_dbi.TeraDBI(engine, cfg=None)
+    objects = _identified(["tab1", "lost", "tab2"])
+
+    with pytest.raises(exc.DBStatementError):
+        ext.get_object_ddl_many(objects, batch_size=4)
+    # no fallback to one SHOW per object
+    assert len(engine.queries) == 1
+
+
+def test_database_index_reads_each_database_once():
+    index = tera_dbi._DatabaseIndex(size=4)
+    reading_a, release_a = threading.Event(), threading.Event()
+    reads = []
+
+    def _read_a():
+        reads.append("a")
+        reading_a.set()
+        release_a.wait(timeout=10)
+        return "value of a"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(index.get("a", _read_a)))
+    first.start()
+    reading_a.wait(timeout=10)
+
+    # other databases are not blocked by the read of "a"
+    assert index.get("b", lambda: "value of b") == "value of b"
+    second = threading.Thread(target=lambda: results.append(index.get("A", _read_a)))
+    second.start()
+    release_a.set()
+    first.join()
+    second.join()
+    assert results == ["value of a"] * 2
+    assert reads == ["a"]
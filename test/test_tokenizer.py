@@ -1,4 +1,7 @@
+import random
 from pathlib import Path
+from time import perf_counter
+from typing import Generator
 
 import pytest
 from loguru import logger
@@ -111,3 +114,346 @@ def test_in_comment():
     inp = "s1 -- comment's\ns2"
     statements = [s.statement for s in tokenizer.tokenize_statements(inp)]
     assert len(statements) == 1
+
+
+# the previous (character by character) implementation, used as a reference
+def _tokenize_by_char(
+    text: str,
+    *,
+    separator=tokenizer.SEMICOLON,
+    raise_errors: bool = True,
+) -> Generator[tokenizer.Statement, None, None]:
+
+    # initial state
+    in_string, in_comment, skip_next_n = False, False, 0
+    in_identifier, in_single_line_comment = False, False
+    bracket_count = 0
+    next_char = ""
+    line_no = 1
+    prev_stmt_idx, stmt_count = 0, 1
+
+    for i, char in enumerate(text):
+        # count new lines to enhance error messages
+        if char == tokenizer.NEW_LINE:
+            line_no = line_no + 1
+
+        # skip unterminated parts of the statement
+        if skip_next_n > 0:
+            skip_next_n = skip_next_n - 1
+            continue
+
+        # peek the next character
+        try:
+            next_char = text[i + 1]
+        except IndexError:
+            next_char = ""
+
+        # peek at the next 2 characters
+        try:
+            next_2chars = text[i + 1 : i + 3]  # noqa: E203
+        except IndexError:
+            next_2chars = ""
+
+        # start and end of string
+        if char == tokenizer.APOSTROPHE and not (in_comment or in_single_line_comment):
+            # start of a string literal
+            if not in_string:
+                in_string = True
+                continue
+            if next_2chars == tokenizer.APOSTROPHE + tokenizer.APOSTROPHE:
+                # inside a string, this char is tokenizer.APOSTROPHE and next as well
+                # this means "escaped" apostrophe, skip it,
+                # as well as the next apostrophe
+                skip_next_n = 2
+                continue
+            else:
+                # ending apostrophe
+                in_string = False
+
+        # start of comment
+        if char == tokenizer.SLASH and next_char == tokenizer.STAR and not in_string:
+            if in_comment:
+                message = (
+                    f"Error at line {line_no}: unterminated comment "
+                    "('/*' encountered)"
+                )
+                if raise_errors:
+                    raise exc.DParsingError(message)
+                else:
+                    logger.error(message)
+            in_comment, skip_next_n = True, 1
+            continue
+
+        # end of comment
+        if char == tokenizer.STAR and next_char == tokenizer.SLASH and not in_string:
+            if not in_comment:
+                message = (
+                    f"Error at line {line_no}: termination of comment with no start "
+                    "('*/' encountered)"
+                )
+                if raise_errors:
+                    raise exc.DParsingError(message)
+                else:
+                    logger.error(message)
+            in_comment, skip_next_n = False, 1
+
+        # start of single line comment
+        if char == tokenizer.MINUS and next_char == tokenizer.MINUS:
+            in_single_line_comment, skip_next_n = True, 1
+            continue
+
+        # in single line comment
+        if in_single_line_comment:
+            if char == tokenizer.NEW_LINE:
+                in_single_line_comment = False
+            continue
+
+        # in an identifier
+        if char == tokenizer.QUOTE:
+            in_identifier = not in_identifier
+            continue
+        if in_identifier:
+            continue
+
+        # in a bracket ... could be in an identifier, do not count them
+        # example: COLLECT STATS COLUMN ( CAST((start_dt ) AS TIMESTAMP(6)))  AS "CAST((start_dt ) _41900072" , )
+        # this is a valid SQL, however number of brackets is not "symmetrical"
+        if char == tokenizer.LBRACKET:
+            bracket_count += 1
+            continue
+        if char == tokenizer.RBRACKET:
+            bracket_count -= 1
+            continue
+
+        # end of statement
+        if (
+            char == separator
+            and not in_comment
+            and not in_string
+            and bracket_count == 0
+        ):
+            # get the statement, throw on empty statement
+            # TODO this does not take into account comments,
+            #      hence it is "semi" validating
+            statement = text[prev_stmt_idx : i + 1].strip()  # noqa: E203
+            if len(statement) == 0 or statement == separator:
+                message = (
+                    f"Error at line {line_no}: empty statement ({stmt_count=}, {i=})"
+                )
+                if raise_errors:
+                    raise exc.DParsingError(message)
+                else:
+                    logger.error(message)
+
+            # yield the statement and prep for next iteration
+            yield tokenizer.Statement(tokenizer.StatementType.SQL, statement)
+            stmt_count = stmt_count + 1
+            prev_stmt_idx = i + 1
+
+    # sanity check
+    if in_comment:
+        message = f"Error at line {line_no}: unterminated comment (expected to see: */)"
+        if raise_errors:
+            raise exc.DParsingError(message)
+        else:
+            logger.error(message)
+
+    if in_string:
+        message = f"Error at line {line_no}: unterminated string (expected to see: ')"
+        if raise_errors:
+            raise exc.DParsingError(message)
+        else:
+            logger.error(message)
+
+    # if - at the end - we got unprocessed characters, yield last statement
+    try:
+        statement = text[prev_stmt_idx:].strip()
+        if len(statement) > 0:
+            yield tokenizer.Statement(tokenizer.StatementType.SQL, statement)
+    except IndexError:
+        pass
+
+
+def _tokenize_both(text: str, separator: str = tokenizer.SEMICOLON):
+    results = []
+    for tokenize in (_tokenize_by_char, tokenizer.tokenize_statements):
+        try:
+            results.append([s.statement for s in tokenize(text, separator=separator)])
+        except exc.DParsingError as err:
+            results.append(str(err))
+    return results
+
+
+def test_tokenizer_equals_reference():
+    rng = random.Random(42)
+    fragments = [
+        "select", " ", "\n", "a", ";", "'", "''", "\"", "(", ")", "/*", "*/",
+        "--", "-", "*", "/", "\t", "x.y", "'';",
+    ]  # fmt: skip
+    for _ in range(5000):
+        text = "".join(rng.choices(fragments, k=rng.randint(0, 30)))
+        for separator in (tokenizer.SEMICOLON, "/"):
+            expected, got = _tokenize_both(text, separator)
+            assert got == expected, f"{text=}, {separator=}"
+
+    expected = [s.statement for s in _tokenize_by_char(" ; /* ", raise_errors=False)]
+    got = [
+        s.statement
+        for s in tokenizer.tokenize_statements(" ; /* ", raise_errors=False)
+    ]
+    assert got == expected
+
+
+def test_tokenizer_throughput():
+    stats = (fixtures_dir / "stats.tab").read_text(encoding="utf-8")
+    text = (TRG + stats + "select 'it''s' from \"a;b\" -- c'\n;\n") * 200
+    megabytes = len(text.encode("utf-8")) / 1024 / 1024
+
+    started = perf_counter()
+    expected = [s.statement for s in _tokenize_by_char(text)]
+    by_char = perf_counter() - started
+
+    started = perf_counter()
+    got = [s.statement for s in tokenizer.tokenize_statements(text)]
+    scanner = perf_counter() - started
+
+    logger.info(
+        f"by char: {megabytes / by_char:.1f} MB/s,"
+        f" scanner: {megabytes / scanner:.1f} MB/s"
+    )
+    assert got == expected
+
+
+def _tokenize_chunks(chunks: list[str], separator: str = tokenizer.SEMICOLON):
+    try:
+        statements = tokenizer.tokenize_chunks(chunks, separator=separator)
+        return [s.statement for s in statements]
+    except exc.DParsingError as err:
+        return str(err)
+
+
+def test_tokenize_chunks():
+    rng = random.Random(42)
+    fragments = [
+        "select", " ", "\n", "a", ";", "'", "''", "\"", "(", ")", "/*", "*/",
+        "--", "-", "*", "/", "\t", "x.y", "'';",
+    ]  # fmt: skip
+    for _ in range(5000):
+        text = "".join(rng.choices(fragments, k=rng.randint(0, 30)))
+        cuts = sorted(rng.choices(range(len(text) + 1), k=rng.randint(0, 5)))
+        chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+        for separator in (tokenizer.SEMICOLON, "/"):
+            expected = _tokenize_both(text, separator)[1]
+            got = _tokenize_chunks(chunks, separator)
+            assert got == expected, f"{chunks=}, {separator=}"
+
+    # line numbers are counted across chunks
+    chunks = ["a;\nb;\n", "\nc ", "/* d;\n", "\n"]
+    assert _tokenize_chunks(chunks) == (
+        "Error at line 6: unterminated comment (expected to see: */)"
+    )
+    assert _tokenize_chunks(chunks) == _tokenize_chunks(["".join(chunks)])
+
+
+def test_tokenize_chunks_is_lazy(tmp_path: Path):
+    def _chunks():
+        yield "select 1; select"
+        yield " 2;"
+        raise AssertionError("read too far")
+
+    statements = tokenizer.tokenize_chunks(_chunks())
+    assert next(statements).statement == "select 1;"
+
+    file = tmp_path / "script.sql"
+    file.write_text(TRG * 3, encoding="utf-8")
+    statements = tokenizer.tokenize_chunks(tokenizer.read_chunks(file, chunk_size=7))
+    assert [s.statement for s in statements] == [TRG.strip()] * 3
+
+
+BTEQ = """.LOGON tdpid/user,password
+.SET WIDTH 254
+-- the table
+select '
+.not a command' from t
+    .not a command either;
+  .IF ERRORCODE <> 0 THEN .QUIT 8
+/* comment */ .still not a command;
+create table t (
+.c int);
+.QUIT 0
+select 2;
+"""
+
+
+def _bteq_tokens(chunks: list[str]) -> list[tuple[str, str]]:
+    statements = tokenizer.tokenize_chunks(chunks, bteq=True)
+    return [(s.type.value, s.statement) for s in statements]
+
+
+def test_tokenize_bteq():
+    expected = [
+        ("BTEQ", ".LOGON tdpid/user,password"),
+        ("BTEQ", ".SET WIDTH 254"),
+        ("SQL", "-- the table\nselect '\n.not a command' from t\n"
+         "    .not a command either;"),
+        ("BTEQ", ".IF ERRORCODE <> 0 THEN .QUIT 8"),
+        ("SQL", "/* comment */ .still not a command;"),
+        ("SQL", "create table t (\n.c int);"),
+        ("BTEQ", ".QUIT 0"),
+        ("SQL", "select 2;"),
+    ]  # fmt: skip
+    assert _bteq_tokens([BTEQ]) == expected
+    for size in range(1, 9):
+        chunks = [BTEQ[i : i + size] for i in range(0, len(BTEQ), size)]
+        assert _bteq_tokens(chunks) == expected, f"{size=}"
+
+    # without BTEQ mode, dots are just text
+    assert all(
+        s.type == tokenizer.StatementType.SQL
+        for s in tokenizer.tokenize_statements(BTEQ)
+    )
+
+    # BTEQ commands are skipped, the script ends on .QUIT
+    statements = tokenizer.tokenize_statements(BTEQ, bteq=True)
+    assert list(tokenizer.sql_statements(statements)) == [
+        s for t, s in expected[:6] if t == "SQL"
+    ]
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        ".IF ACTIVITYCOUNT = 0 THEN .QUIT",
+        ".IF ERRORCODE = 3807 THEN .GOTO NEXT",
+        ".LABEL NEXT",
+        ".RUN FILE other.bteq",
+        ".SET ERRORLEVEL 3807 SEVERITY 0",
+        ".OS rm -rf /tmp/x",
+    ],
+)
+def test_tokenize_bteq_unsupported_commands(command):
+    text = f"select 1;\n{command}\nselect 2;\n"
+    with pytest.raises(exc.DParsingError, match="line 2: unsupported BTEQ command"):
+        list(tokenizer.tokenize_statements(text, bteq=True))
+
+    # reported (for example by the validator), and not skipped by the deployment
+    errors = []
+    statements = list(
+        tokenizer.tokenize_chunks([text], bteq=True, on_error=errors.append)
+    )
+    assert len(errors) == 1
+    with pytest.raises(exc.DParsingError):
+        list(tokenizer.sql_statements(statements))
+
+
+def test_tokenize_bteq_does_not_backtrack():
+    # dot at start of a line, after a long statement (or comments)
+    text = "SELECT a" + " " * 10_000 + "\n    .5 + b FROM t;\n.QUIT\n"
+    started = perf_counter()
+    assert _bteq_tokens([text]) == [
+        ("SQL", text[: text.index(";") + 1].strip()),
+        ("BTEQ", ".QUIT"),
+    ]
+    text = "/* a */ " * 1000 + "-- b\n" * 1000 + "x\n.5;"
+    assert _bteq_tokens([text]) == [("SQL", text.strip())]
+    logger.info(f"tokenized in {perf_counter() - started:.3f}s")
@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from dblocks_core.deployer import validator
+
+
+def test_validate_files_in_pool(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(validator, "_MIN_FILES_FOR_POOL", 0)
+    files = []
+    for i in range(20):
+        file = tmp_path / f"{i}.sql"
+        file.write_text(f"select {i};\n" * i)
+        files.append((file, True))
+    broken = tmp_path / "broken.sql"
+    broken.write_text("select 1;\n;\n/* not closed")
+    files.append((broken, True))
+    invalid_utf8 = tmp_path / "invalid.sql"
+    invalid_utf8.write_bytes(b"select '\xff';")
+    files.append((invalid_utf8, True))
+    files.append((tmp_path / "0.sql", False))  # not tokenized
+
+    report = validator.validate_files(files, workers=2)
+
+    assert not report.is_valid
+    assert [f.file for f in report.files] == [f for f, _ in files]
+    assert [f.statements for f in report.files[:20]] == list(range(20))
+    assert report.files[-1].statements == 1
+    empty = f"{(tmp_path / '0.sql').as_posix()}: empty file"
+    assert report.errors[:3] == [
+        empty,
+        f"{broken.as_posix()}: Error at line 2: empty statement (stmt_count=2, i=10)",
+        f"{broken.as_posix()}: Error at line 3: unterminated comment "
+        "(expected to see: */)",
+    ]
+    assert report.errors[3].startswith(f"{invalid_utf8.as_posix()}: can not read")
+    assert report.errors[4:] == [empty]
+
+    # empty files can be allowed (packages)
+    report = validator.validate_files(files[:20], allow_empty=True)
+    assert report.is_valid
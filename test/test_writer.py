@@ -0,0 +1,103 @@
+from datetime import datetime
+
+from dblocks_core.model import meta_model
+from dblocks_core.model.config_model import WriterParameters
+from dblocks_core.writer import fsystem
+
+
+def _described_object(last_alter: datetime) -> meta_model.DescribedObject:
+    return meta_model.DescribedObject(
+        identified_object=meta_model.IdentifiedObject(
+            database_name="DB",
+            object_name="TAB1",
+            object_type=meta_model.TABLE,
+            platform_object_type="T",
+            create_datetime=datetime(2024, 1, 1),
+            last_alter_datetime=last_alter,
+            creator_name=None,
+            last_alter_name=None,
+        ),
+        basic_definition="create table db.tab1 (a int);",
+    )
+
+
+def test_manifest(tmp_path):
+    obj = _described_object(datetime(2024, 2, 1))
+    manifest_file = fsystem.manifest_file(tmp_path / ".git", "dev")
+    params = WriterParameters(target_dir=tmp_path / "meta")
+    wrt = fsystem.FSWriter(params, manifest_file=manifest_file)
+    assert not wrt.is_unchanged(obj.identified_object)
+
+    wrt.write_object(obj, database_tag="db", plugin_instances=[])
+    wrt.save_manifest()
+    assert manifest_file.is_file()
+
+    # a new writer reads the manifest from disk
+    wrt = fsystem.FSWriter(params, manifest_file=manifest_file)
+    assert wrt.is_unchanged(obj.identified_object)
+    assert not wrt.is_unchanged(
+        _described_object(datetime(2024, 3, 1)).identified_object
+    )
+
+    # the file was changed by hand, or is gone: the object is extracted again
+    (tmp_path / "meta" / "db" / "tab1.tab").write_text("create table db.tab1 (b int);")
+    assert not wrt.is_unchanged(obj.identified_object)
+    (tmp_path / "meta" / "db" / "tab1.tab").unlink()
+    assert not wrt.is_unchanged(obj.identified_object)
+
+    # dropped objects are removed from the manifest
+    wrt.drop_nonex_objects([], [], databases_in_scope=[])
+    assert wrt.manifest == {}
+
+    # without a manifest file (full extraction), nothing is written
+    wrt = fsystem.FSWriter(WriterParameters(target_dir=tmp_path / "full"))
+    wrt.write_object(obj, database_tag="db", plugin_instances=[])
+    wrt.save_manifest()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".git", "full", "meta"]
+
+
+def test_unchanged_files_are_not_written(tmp_path):
+    obj = _described_object(datetime(2024, 2, 1))
+    wrt = fsystem.FSWriter(WriterParameters(target_dir=tmp_path))
+    target_file = tmp_path / "db" / "tab1.tab"
+
+    wrt.write_object(obj, database_tag="db", plugin_instances=[])
+    mtime = target_file.stat().st_mtime_ns
+    wrt.write_object(obj, database_tag="db", plugin_instances=[])
+    assert target_file.stat().st_mtime_ns == mtime
+
+    obj.basic_definition = "create table db.tab1 (a int, b int);"
+    wrt.write_object(obj, database_tag="db", plugin_instances=[])
+    assert target_file.read_text() == obj.basic_definition
+    stats = wrt.write_stats
+    assert (stats.new, stats.written, stats.unchanged) == (1, 1, 1)
+
+
+def test_drop_nonex_objects_nested_layout(tmp_path):
+    obj = _described_object(datetime(2024, 2, 1))
+    wrt = fsystem.FSWriter(WriterParameters(target_dir=tmp_path))
+    database = meta_model.DescribedDatabase(
+        database_name="DB",
+        database_tag="db",
+        parent_tags_in_scope=["parent"],
+    )
+    for parent in ("parent", "old_parent"):
+        wrt.write_object(
+            obj,
+            database_tag="db",
+            parent_tags_in_scope=[parent],
+            plugin_instances=[],
+        )
+    (tmp_path / "parent" / "db" / "dropped.viw").write_text("")
+    (tmp_path / "parent" / "db" / "notes.txt").write_text("")
+
+    wrt.drop_nonex_objects(
+        [obj.identified_object],
+        [database],
+        databases_in_scope=[database],
+    )
+
+    remaining = sorted(
+        p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*.*")
+    )
+    assert remaining == ["parent/db/notes.txt", "parent/db/tab1.tab"]